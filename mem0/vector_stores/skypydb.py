@@ -93,6 +93,9 @@ class SkypyDB(VectorStoreBase):
         collection = self.client.get_or_create_collection(
             name=name
         )
+        # memories are always filtered by their session identifiers
+        for key in ("user_id", "agent_id", "run_id"):
+            collection.create_metadata_index(key)
         return collection
 
     def insert(
@@ -5,6 +5,8 @@ Skypydb - Open Source Reactive and Vector Embedding Database for Python.
 from skypydb.api.reactive_client import ReactiveClient
 from skypydb.api.vector_client import VectorClient
 from skypydb.api.collection import Collection
+from skypydb.api.async_vector_client import AsyncVectorClient
+from skypydb.api.async_collection import AsyncCollection
 from skypydb.errors import (
     DatabaseError,
     InvalidSearchError,
@@ -18,6 +20,7 @@ from skypydb.security import (
     create_encryption_manager
 )
 from skypydb.embeddings import (
+    HashEmbedding,
     OllamaEmbedding,
     OpenAIEmbedding,
     SentenceTransformerEmbedding,
@@ -30,6 +33,8 @@ __all__ = [
     "ReactiveClient",
     "VectorClient",
     "Collection",
+    "AsyncVectorClient",
+    "AsyncCollection",
     "SkypydbError",
     "DatabaseError",
     "TableNotFoundError",
@@ -38,6 +43,7 @@ __all__ = [
     "EncryptionManager",
     "EncryptionError",
     "create_encryption_manager",
+    "HashEmbedding",
     "OllamaEmbedding",
     "OpenAIEmbedding",
     "SentenceTransformerEmbedding",
@@ -5,9 +5,13 @@ API module.
 from .reactive_client import ReactiveClient
 from .vector_client import VectorClient
 from .collection import Collection
+from .async_vector_client import AsyncVectorClient
+from .async_collection import AsyncCollection
 
 __all__ = [
     "ReactiveClient",
     "VectorClient",
-    "Collection"
+    "Collection",
+    "AsyncVectorClient",
+    "AsyncCollection"
 ]
@@ -0,0 +1,231 @@
+"""
+AsyncCollection class for managing vector collections from asyncio code.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    List,
+    Union,
+    TYPE_CHECKING
+)
+import numpy as np
+
+if TYPE_CHECKING:
+    from skypydb.api.async_vector_client import AsyncVectorClient
+    from skypydb.api.collection import Collection
+
+class AsyncCollection:
+    """
+    Represents a vector collection in the database, with awaitable operations.
+
+    Texts are embedded with the async API of the embedding function, and
+    database work runs on the client's database thread, so the event loop
+    is never blocked and concurrent requests overlap the provider latency.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncVectorClient",
+        collection: "Collection"
+    ):
+        """
+        Initialize async collection.
+
+        Args:
+            client: AsyncVectorClient owning the collection
+            collection: Synchronous collection the operations are run on
+        """
+
+        self._client = client
+        self._collection = collection
+
+    @property
+    def name(self) -> str:
+        """
+        Get collection name.
+        """
+
+        return self._collection.name
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Get collection metadata.
+        """
+
+        return self._collection.metadata
+
+    async def add(
+        self,
+        ids: List[str],
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        defer_commit: bool = False
+    ) -> None:
+        """
+        Add items to the collection.
+
+        Args:
+            ids: Unique IDs for each item (required)
+            embeddings: Optional pre-computed embedding vectors, as a list or a
+                (n, d) float32 NumPy array
+            documents: Optional text documents to embed and store
+            metadatas: Optional metadata dictionaries for each item
+            defer_commit: If True, leave the write uncommitted so that several
+                adds are grouped into one commit made by client.commit()
+
+        Example:
+            await collection.add(
+                documents=["Hello world", "Goodbye world"],
+                ids=["doc1", "doc2"]
+            )
+        """
+
+        if embeddings is None and documents is not None:
+            embeddings = await self._client._embed(documents)
+        await self._client._run(
+            self._collection.add,
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas,
+            defer_commit=defer_commit
+        )
+
+    async def update(
+        self,
+        ids: List[str],
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Update existing items in the collection.
+
+        Args:
+            ids: IDs of items to update
+            embeddings: Optional new embeddings
+            documents: Optional new documents (will be re-embedded)
+            metadatas: Optional new metadata
+        """
+
+        if embeddings is None and documents is not None:
+            embeddings = await self._client._embed(documents)
+        await self._client._run(
+            self._collection.update,
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas
+        )
+
+    async def query(
+        self,
+        query_embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, str]] = None,
+        include: Optional[List[str]] = None,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        rerank: Optional[bool] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        Query the collection for similar items.
+
+        Takes the same arguments and returns the same results as Collection.query.
+
+        Example:
+            results = await collection.query(
+                query_texts=["What is machine learning?"],
+                n_results=5
+            )
+        """
+
+        if query_embeddings is None and query_texts is not None:
+            query_embeddings = await self._client._embed(query_texts)
+        return await self._client._run(
+            self._collection.query,
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where,
+            where_document=where_document,
+            include=include,
+            ef_search=ef_search,
+            nprobe=nprobe,
+            rerank=rerank
+        )
+
+    async def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, str]] = None,
+        include: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Get items from the collection by ID or filter.
+
+        Takes the same arguments and returns the same results as Collection.get.
+
+        Example:
+            results = await collection.get(ids=["doc1", "doc2"])
+        """
+
+        return await self._client._run(
+            self._collection.get,
+            ids=ids,
+            where=where,
+            where_document=where_document,
+            include=include,
+            limit=limit,
+            offset=offset
+        )
+
+    async def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Delete items from the collection.
+
+        Args:
+            ids: Optional list of IDs to delete
+            where: Optional metadata filter
+            where_document: Optional document content filter
+        """
+
+        await self._client._run(
+            self._collection.delete,
+            ids=ids,
+            where=where,
+            where_document=where_document
+        )
+
+    async def count(self) -> int:
+        """
+        Count the number of items in the collection.
+        """
+
+        return await self._client._run(self._collection.count)
+
+    async def peek(
+        self,
+        limit: int = 10
+    ) -> Dict[str, List[Any]]:
+        """
+        Get a sample of items from the collection.
+
+        Args:
+            limit: Maximum number of items to return (default: 10)
+        """
+
+        return await self._client._run(self._collection.peek, limit)
@@ -0,0 +1,273 @@
+"""
+Async Vector Client API for Skypydb.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional
+)
+from skypydb.database.mixins.vector.syscache import DEFAULT_CACHE_MAX_BYTES
+from skypydb.database.mixins.vector.sysquery import DEFAULT_SEARCH_TILE_BYTES
+from skypydb.api.vector_client import VectorClient
+from skypydb.api.collection import Collection
+from skypydb.api.async_collection import AsyncCollection
+
+class AsyncVectorClient:
+    """
+    Vector client for interacting with Skypydb from asyncio code.
+
+    Embeddings are awaited with the async API of the embedding provider,
+    and database work runs on one dedicated thread, which owns the SQLite
+    connection, so that many concurrent requests overlap the provider
+    latency without blocking the event loop. The database and the
+    embedding function are opened on that thread too, by create(), by
+    async with, or else by the first call.
+    """
+
+    def __init__(
+        self,
+        path: str = "./db/_generated/vector.db",
+        embedding_provider: str = "ollama",
+        embedding_model_config: Optional[Dict[str, Any]] = None,
+        cache_max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+        search_tile_bytes: int = DEFAULT_SEARCH_TILE_BYTES
+    ):
+        """
+        Initialize Async Vector Client.
+
+        Takes the same arguments as VectorClient. Nothing is opened here, so
+        the client can be built inside a running event loop.
+
+        Example:
+            client = await skypydb.AsyncVectorClient.create(embedding_provider="ollama")
+            collection = await client.get_or_create_collection("articles")
+            results = await collection.query(query_texts=["hello"], n_results=5)
+            await client.close()
+        """
+
+        self._client_kwargs: Dict[str, Any] = {
+            "path": path,
+            "embedding_provider": embedding_provider,
+            "embedding_model_config": embedding_model_config,
+            "cache_max_bytes": cache_max_bytes,
+            "search_tile_bytes": search_tile_bytes
+        }
+        # opened on the database thread by _connect
+        self._client: Optional[VectorClient] = None
+        self._embedding_function: Any = None
+        self.path: Optional[str] = None
+        # a single thread serializes every use of the SQLite connection
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="skypydb-db")
+        self._collections: Dict[str, AsyncCollection] = {}
+
+    @classmethod
+    async def create(
+        cls,
+        **kwargs: Any
+    ) -> "AsyncVectorClient":
+        """
+        Create an Async Vector Client and open its database on the database thread.
+
+        Takes the same arguments as VectorClient.
+
+        Example:
+            client = await skypydb.AsyncVectorClient.create(path="./db/vector.db")
+        """
+
+        client = cls(**kwargs)
+        await client._run(client._connect)
+        return client
+
+    def _connect(self) -> VectorClient:
+        """
+        Open the database and the embedding function, once.
+
+        Only called on the database thread, which serializes concurrent first calls.
+        """
+
+        if self._client is None:
+            client = VectorClient(**self._client_kwargs)
+            self.path = client.path
+            self._embedding_function = client._embedding_function
+            self._client = client
+        return self._client
+
+    async def _run_client(
+        self,
+        method: str,
+        *args: Any
+    ) -> Any:
+        """
+        Run a method of the underlying VectorClient on the database thread,
+        opening it on first use.
+        """
+
+        return await self._run(lambda: getattr(self._connect(), method)(*args))
+
+    async def _run(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run a database call on the database thread.
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(function, *args, **kwargs)
+        )
+
+    async def _embed(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Embed texts without blocking the event loop.
+
+        Embedding functions without an async API run on the default executor,
+        so that they don't hold up the database thread.
+        """
+
+        if self._embedding_function is None:
+            await self._run(self._connect)
+        acall = getattr(self._embedding_function, "acall", None)
+        if acall is not None:
+            return await acall(texts)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._embedding_function, texts)
+
+    def _wrap(
+        self,
+        collection: Collection
+    ) -> AsyncCollection:
+        """
+        Get the cached async collection of a collection, creating it if needed.
+        """
+
+        async_collection = self._collections.get(collection.name)
+        if async_collection is None or async_collection._collection is not collection:
+            async_collection = AsyncCollection(client=self, collection=collection)
+            self._collections[collection.name] = async_collection
+        return async_collection
+
+    async def create_collection(
+        self,
+        name: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        get_or_create: bool = False
+    ) -> AsyncCollection:
+        """
+        Create a new collection.
+
+        Args:
+            name: Unique name for the collection
+            metadata: Optional metadata to attach to the collection
+            get_or_create: If True, return existing collection if it exists
+
+        Raises:
+            ValueError: If collection already exists and get_or_create is False
+        """
+
+        collection = await self._run_client(
+            "create_collection",
+            name,
+            metadata,
+            get_or_create
+        )
+        return self._wrap(collection)
+
+    async def get_collection(
+        self,
+        name: str
+    ) -> AsyncCollection:
+        """
+        Get an existing collection by name.
+
+        Raises:
+            ValueError: If collection doesn't exist
+        """
+
+        return self._wrap(await self._run_client("get_collection", name))
+
+    async def get_or_create_collection(
+        self,
+        name: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncCollection:
+        """
+        Get an existing collection or create a new one.
+        """
+
+        return self._wrap(await self._run_client("get_or_create_collection", name, metadata))
+
+    async def list_collections(
+        self
+    ) -> List[AsyncCollection]:
+        """
+        List all collections in the database.
+        """
+
+        collections = await self._run_client("list_collections")
+        return [self._wrap(collection) for collection in collections]
+
+    async def delete_collection(
+        self,
+        name: str
+    ) -> None:
+        """
+        Delete a collection and all its data.
+
+        Raises:
+            ValueError: If collection doesn't exist
+        """
+
+        await self._run_client("delete_collection", name)
+        self._collections.pop(name, None)
+
+    async def reset(
+        self
+    ) -> bool:
+        """
+        Reset the database by deleting all collections.
+        """
+
+        result = await self._run_client("reset")
+        self._collections.clear()
+        return result
+
+    async def commit(
+        self
+    ) -> None:
+        """
+        Commit the writes of adds made with defer_commit=True.
+        """
+
+        await self._run_client("commit")
+
+    async def close(
+        self
+    ) -> None:
+        """
+        Close the database connection and stop the database thread.
+        """
+
+        if self._client is not None:
+            await self._run(self._client.close)
+        self._collections.clear()
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncVectorClient":
+        await self._run(self._connect)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
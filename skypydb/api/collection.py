@@ -14,6 +14,7 @@ from skypydb.api.mixins.vector.collection import (
     SysQuery,
     SysUpdate,
     SysDelete,
+    SysMetadataIndex,
     Utils
 )
 
@@ -26,6 +27,7 @@ class Collection(
     SysQuery,
     SysUpdate,
     SysDelete,
+    SysMetadataIndex,
     Utils
 ):
     """
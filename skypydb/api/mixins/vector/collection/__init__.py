@@ -7,6 +7,7 @@ from skypydb.api.mixins.vector.collection.sysget import SysGet
 from skypydb.api.mixins.vector.collection.sysquery import SysQuery
 from skypydb.api.mixins.vector.collection.sysupdate import SysUpdate
 from skypydb.api.mixins.vector.collection.sysdelete import SysDelete
+from skypydb.api.mixins.vector.collection.sysmetadataindex import SysMetadataIndex
 from skypydb.api.mixins.vector.collection.utils import Utils
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     "SysQuery",
     "SysUpdate",
     "SysDelete",
+    "SysMetadataIndex",
     "Utils"
 ]
\ No newline at end of file
@@ -4,27 +4,39 @@ Module containing the SysAdd class, which is used to add items to a collection.
 
 from typing import (
     Any,
+    Callable,
     Dict,
+    Iterable,
     Optional,
-    List
+    List,
+    Union
+)
+import numpy as np
+from skypydb.database.mixins.vector.sysadd import (
+    DEFAULT_STREAM_BATCH_SIZE,
+    DEFAULT_STREAM_MAX_INFLIGHT
 )
 
 class SysAdd:
     def add(
         self,
         ids: List[str],
-        embeddings: Optional[List[List[float]]] = None,
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
         documents: Optional[List[str]] = None,
-        metadatas: Optional[List[Dict[str, Any]]] = None
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        defer_commit: bool = False
     ) -> None:
         """
         Add items to the collection.
 
         Args:
             ids: Unique IDs for each item (required)
-            embeddings: Optional pre-computed embedding vectors
+            embeddings: Optional pre-computed embedding vectors, as a list or a
+                (n, d) float32 NumPy array
             documents: Optional text documents to embed and store
             metadatas: Optional metadata dictionaries for each item
+            defer_commit: If True, leave the write uncommitted so that several
+                adds are grouped into one commit made by client.commit()
 
         Raises:
             ValueError: If neither embeddings nor documents provided,
@@ -44,6 +56,11 @@ class SysAdd:
                 documents=["Hello", "Goodbye"],
                 ids=["doc1", "doc2"]
             )
+
+            # Group bulk loads into one commit
+            for batch in batches:
+                collection.add(**batch, defer_commit=True)
+            client.commit()
         """
 
         self._db.add(
@@ -51,5 +68,54 @@ class SysAdd:
             ids=ids,
             embeddings=embeddings,
             documents=documents,
-            metadatas=metadatas
+            metadatas=metadatas,
+            defer_commit=defer_commit
+        )
+
+    def add_stream(
+        self,
+        records: Iterable[Dict[str, Any]],
+        batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+        max_inflight: int = DEFAULT_STREAM_MAX_INFLIGHT,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Add a stream of records, embedding batches concurrently with the writes.
+
+        Up to max_inflight batches are embedded on a thread pool while the
+        embedded ones are written, so ingestion takes about as long as the
+        slower of the two stages. Records are read lazily, only as fast as
+        batches get written.
+
+        Args:
+            records: Iterable of dictionaries with an "id" and a "document"
+                (embedded) or an "embedding", plus an optional "metadata"
+            batch_size: Number of records per batch
+            max_inflight: Maximum number of batches being embedded at once
+            progress: Optional callback receiving the statistics after each written batch
+
+        Returns:
+            Statistics with the number of items and batches written, the
+            elapsed time, the throughput in items per second and the time
+            spent embedding and writing
+
+        Example:
+            records = (
+                {"id": f"doc{i}", "document": text, "metadata": {"source": "web"}}
+                for i, text in enumerate(texts)
+            )
+            stats = collection.add_stream(
+                records,
+                batch_size=128,
+                max_inflight=4,
+                progress=lambda stats: print(f"{stats['items']} items, {stats['items_per_second']:.0f}/s")
+            )
+        """
+
+        return self._db.add_stream(
+            collection_name=self._name,
+            records=records,
+            batch_size=batch_size,
+            max_inflight=max_inflight,
+            progress=progress
         )
\ No newline at end of file
@@ -5,9 +5,11 @@ Module containing the SysGet class, which is used to get items from a collection
 from typing import (
     Any,
     Dict,
+    Iterator,
     Optional,
     List
 )
+from skypydb.database.mixins.vector.vsysget import DEFAULT_ITER_BATCH_SIZE
 
 class SysGet:
     def get(
@@ -50,23 +52,56 @@ class SysGet:
                 print(f"Document: {results['documents'][i]}")
         """
 
-        results = self._db.get(
+        return self._db.get(
             collection_name=self._name,
             ids=ids,
             where=where,
             where_document=where_document,
-            include=include
+            include=include,
+            limit=limit,
+            offset=offset
         )
-        # apply limit and offset
-        if offset is not None or limit is not None:
-            start = offset or 0
-            end = (start + limit) if limit else None
 
-            results["ids"] = results["ids"][start:end]
-            if results.get("embeddings") is not None:
-                results["embeddings"] = results["embeddings"][start:end]
-            if results.get("documents") is not None:
-                results["documents"] = results["documents"][start:end]
-            if results.get("metadatas") is not None:
-                results["metadatas"] = results["metadatas"][start:end]
-        return results
\ No newline at end of file
+    def iter(
+        self,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, str]] = None,
+        include: Optional[List[str]] = None,
+        as_numpy: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Walk the collection in fixed-size batches with bounded memory.
+
+        Items are read in ID order, one page at a time, and the walk stays
+        consistent while items are added or updated concurrently.
+
+        Args:
+            batch_size: Number of items per batch, the last batch may be smaller
+            where: Optional metadata filter
+            where_document: Optional document content filter
+            include: Optional list of fields to include
+                    (embeddings, documents, metadatas)
+            as_numpy: Whether to return the embeddings of each batch
+                    as a (n, d) float32 NumPy array
+
+        Returns:
+            Iterator over dictionaries with lists of ids, embeddings, documents, metadatas
+
+        Example:
+            # Re-embed a whole collection
+            for batch in collection.iter(batch_size=500, include=["documents"]):
+                collection.update(
+                    ids=batch["ids"],
+                    documents=batch["documents"]
+                )
+        """
+
+        return self._db.iter(
+            collection_name=self._name,
+            batch_size=batch_size,
+            where=where,
+            where_document=where_document,
+            include=include,
+            as_numpy=as_numpy
+        )
\ No newline at end of file
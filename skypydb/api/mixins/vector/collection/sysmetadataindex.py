@@ -0,0 +1,59 @@
+"""
+Module containing the SysMetadataIndex class, which is used to index metadata keys of a collection.
+"""
+
+from typing import List
+from skypydb.database.mixins.vector.collections.sysmetadataindex import METADATA_INDEXES_KEY
+
+class SysMetadataIndex:
+    def create_metadata_index(
+        self,
+        key: str
+    ) -> None:
+        """
+        Index a top-level metadata key so that filters on it are B-tree lookups.
+
+        The collection table isn't rewritten, only the index is built.
+
+        Args:
+            key: Metadata key to index
+
+        Example:
+            collection.create_metadata_index("user_id")
+
+            # resolved through the index
+            collection.get(where={"user_id": "u42"})
+        """
+
+        self._db.create_metadata_index(self._name, key)
+        self._metadata[METADATA_INDEXES_KEY] = self._db.list_metadata_indexes(self._name)
+
+    def drop_metadata_index(
+        self,
+        key: str
+    ) -> None:
+        """
+        Remove the index on a metadata key.
+
+        Args:
+            key: Indexed metadata key
+
+        Example:
+            collection.drop_metadata_index("user_id")
+        """
+
+        self._db.drop_metadata_index(self._name, key)
+        self._metadata[METADATA_INDEXES_KEY] = self._db.list_metadata_indexes(self._name)
+
+    def list_metadata_indexes(self) -> List[str]:
+        """
+        Get the indexed metadata keys.
+
+        Returns:
+            Indexed metadata keys, in declaration order
+
+        Example:
+            print(collection.list_metadata_indexes())
+        """
+
+        return self._db.list_metadata_indexes(self._name)
@@ -6,30 +6,45 @@ from typing import (
     Any,
     Dict,
     Optional,
-    List
+    List,
+    Union
 )
+import numpy as np
 
 class SysQuery:
     def query(
         self,
-        query_embeddings: Optional[List[List[float]]] = None,
+        query_embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
         query_texts: Optional[List[str]] = None,
         n_results: int = 10,
         where: Optional[Dict[str, Any]] = None,
         where_document: Optional[Dict[str, str]] = None,
-        include: Optional[List[str]] = None
+        include: Optional[List[str]] = None,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        rerank: Optional[bool] = None
     ) -> Dict[str, List[List[Any]]]:
         """
         Query the collection for similar items.
 
         Args:
-            query_embeddings: Optional query embedding vectors
+            query_embeddings: Optional query embedding vectors, as a list or a
+                (q, d) float32 NumPy array
             query_texts: Optional query texts (will be embedded)
             n_results: Number of results to return per query (default: 10)
             where: Optional metadata filter to apply before search
             where_document: Optional document content filter
             include: Optional list of fields to include in results
                     (embeddings, documents, metadatas, distances)
+            ef_search: Optional recall/latency trade-off for collections with an
+                HNSW index; higher values return better neighbours but take longer
+                (defaults to the collection's hnsw:ef_search)
+            nprobe: Optional number of lists scanned for collections with an IVF
+                index; higher values return better neighbours but take longer
+                (defaults to the collection's ivf:nprobe)
+            rerank: Optional switch for collections created with quantization:rerank;
+                the best candidates found on the compressed embeddings are re-scored
+                with their full-precision copies (defaults to quantization:rerank)
 
         Returns:
             Dictionary with nested lists of results for each query
@@ -48,6 +63,13 @@ class SysQuery:
                 where={"category": "technology"}
             )
 
+            # Trade latency for recall on an HNSW collection
+            results = collection.query(
+                query_texts=["AI applications"],
+                n_results=10,
+                ef_search=200
+            )
+
             # Access results (first query's results)
             for i, doc_id in enumerate(results["ids"][0]):
                 print(f"ID: {doc_id}")
@@ -62,5 +84,8 @@ class SysQuery:
             n_results=n_results,
             where=where,
             where_document=where_document,
-            include=include
+            include=include,
+            ef_search=ef_search,
+            nprobe=nprobe,
+            rerank=rerank
         )
\ No newline at end of file
@@ -6,14 +6,16 @@ from typing import (
     Any,
     Dict,
     Optional,
-    List
+    List,
+    Union
 )
+import numpy as np
 
 class SysUpdate:
     def update(
         self,
         ids: List[str],
-        embeddings: Optional[List[List[float]]] = None,
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
         documents: Optional[List[str]] = None,
         metadatas: Optional[List[Dict[str, Any]]] = None
     ) -> None:
@@ -22,7 +24,7 @@ class SysUpdate:
 
         Args:
             ids: IDs of items to update
-            embeddings: Optional new embeddings
+            embeddings: Optional new embeddings, as a list or a (n, d) NumPy array
             documents: Optional new documents (will be re-embedded)
             metadatas: Optional new metadata
 
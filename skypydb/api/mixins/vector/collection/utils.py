@@ -5,7 +5,8 @@ Module containing the Utils class, which is used to do a bunch of stuff related
 from typing import (
     Any,
     Dict,
-    List
+    List,
+    Optional
 )
 
 class Utils:
@@ -24,7 +25,23 @@ class Utils:
         """
 
         return self._metadata
+
+    @property
+    def dimension(self) -> Optional[int]:
+        """
+        Get the embedding dimension of the collection, None until the first write.
+        """
+
+        return self._db.get_collection_dimension(self._name)
     
+    @property
+    def metric(self) -> str:
+        """
+        Get the distance metric of the collection: "cosine", "l2" or "ip".
+        """
+
+        return self._db.get_collection_metric(self._name)
+
     def count(self) -> int:
         """
         Count the number of items in the collection.
@@ -1,5 +1,5 @@
 """
-Module containing the Utils class, which is used to check and reset the database.
+Module containing the Utils class, which is used to check, commit and reset the database.
 """
 
 import time
@@ -33,6 +33,20 @@ class Utils:
         self._collections.clear()
         return True
 
+    def commit(
+        self
+    ) -> None:
+        """
+        Commit the writes of adds made with defer_commit=True.
+
+        Example:
+            for batch in batches:
+                collection.add(**batch, defer_commit=True)
+            client.commit()
+        """
+
+        self._db.commit()
+
     def heartbeat(
         self
     ) -> int:
@@ -9,6 +9,8 @@ from typing import (
     Optional
 )
 from skypydb.database.vector_db import VectorDatabase
+from skypydb.database.mixins.vector.syscache import DEFAULT_CACHE_MAX_BYTES
+from skypydb.database.mixins.vector.sysquery import DEFAULT_SEARCH_TILE_BYTES
 from skypydb.embeddings import get_embedding_function
 from skypydb.api.collection import Collection
 from skypydb.database.database_linker import DatabaseLinker
@@ -35,15 +37,21 @@ class VectorClient(
         self,
         path: str = "./db/_generated/vector.db",
         embedding_provider: str = "ollama",
-        embedding_model_config: Optional[Dict[str, Any]] = None
+        embedding_model_config: Optional[Dict[str, Any]] = None,
+        cache_max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+        search_tile_bytes: int = DEFAULT_SEARCH_TILE_BYTES
     ):
         """
         Initialize Vector Client.
 
         Args:
             path: Path to the database file. Defaults to ./db/_generated/vector.db
-            embedding_provider: Embedding provider (ollama, openai, sentence-transformers)
+            embedding_provider: Embedding provider (ollama, openai, sentence-transformers, hash)
             embedding_model_config: Provider-specific config dictionary.
+            cache_max_bytes: Memory budget for collections kept resident in memory
+                (LRU across collections). None means unbounded and 0 disables the cache.
+            search_tile_bytes: Memory budget of the distance tiles scored at once when
+                searching, raise it to answer large query batches in fewer passes.
 
         Example:
             # Basic usage with defaults
@@ -84,7 +92,9 @@ class VectorClient(
         # initialize vector database
         self._db = VectorDatabase(
             path=DB_PATH,
-            embedding_function=self._embedding_function
+            embedding_function=self._embedding_function,
+            cache_max_bytes=cache_max_bytes,
+            search_tile_bytes=search_tile_bytes
         )
         self.database_linker.ensure_db_link_metadata(DB_PATH, db_type="vector")
 
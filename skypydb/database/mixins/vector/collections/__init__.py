@@ -7,11 +7,19 @@ from skypydb.database.mixins.vector.collections.syscreate import SysCreate
 from skypydb.database.mixins.vector.collections.sysget import SysGet
 from skypydb.database.mixins.vector.collections.syscount import SysCount
 from skypydb.database.mixins.vector.collections.sysdelete import SysDelete
+from skypydb.database.mixins.vector.collections.sysmigrate import SysMigrate
+from skypydb.database.mixins.vector.collections.sysmetadataindex import SysMetadataIndex
+from skypydb.database.mixins.vector.collections.sysdimension import SysDimension
+from skypydb.database.mixins.vector.collections.sysmetric import SysMetric
 
 __all__ = [
     AuditCollections,
     SysCreate,
     SysGet,
     SysCount,
-    SysDelete
+    SysDelete,
+    SysMigrate,
+    SysMetadataIndex,
+    SysDimension,
+    SysMetric
 ]
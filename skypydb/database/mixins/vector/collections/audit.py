@@ -5,9 +5,12 @@ Module containing the AuditCollections class, which is used to check the integri
 from typing import (
     Optional,
     Dict,
+    List,
     Any
 )
 from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.filters import compile_filters
+from skypydb.database.mixins.vector.utils import LEGACY_STORAGE_VERSION
 
 class AuditCollections:
     def collection_exists(
@@ -41,15 +44,58 @@ class AuditCollections:
 
         cursor = self.conn.cursor()
 
-        cursor.execute("""
+        cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS _vector_collections (
                 name TEXT PRIMARY KEY,
                 metadata TEXT,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                storage_version INTEGER NOT NULL DEFAULT {LEGACY_STORAGE_VERSION}
             )
         """)
+
+        # databases created before the storage version marker existed only
+        # hold legacy JSON encoded collections
+        cursor.execute("PRAGMA table_info(_vector_collections)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if "storage_version" not in columns:
+            cursor.execute(
+                "ALTER TABLE _vector_collections ADD COLUMN storage_version "
+                f"INTEGER NOT NULL DEFAULT {LEGACY_STORAGE_VERSION}"
+            )
         self.conn.commit()
 
+    def _select_matching_ids(
+        self,
+        collection_name: str,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, str]] = None
+    ) -> Optional[List[str]]:
+        """
+        Resolve filters in SQL, without loading or parsing the rows in Python.
+
+        Args:
+            collection_name: Name of the collection
+            where: Metadata filter
+            where_document: Document filter
+
+        Returns:
+            IDs of the matching items in storage order, or None if the filters
+            can't be compiled to SQL and have to go through _matches_filters
+        """
+
+        compiled = compile_filters(where, where_document)
+        if compiled is None:
+            return None
+        condition, params = compiled
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            f"SELECT id FROM [vec_{collection_name}] WHERE {condition} ORDER BY rowid",
+            params
+        )
+        return [row[0] for row in cursor.fetchall()]
+
     def _matches_filters(
         self,
         item: Dict[str, Any],
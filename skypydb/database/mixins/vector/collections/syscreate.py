@@ -10,6 +10,19 @@ from typing import (
     Any
 )
 from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.utils import (
+    EMBEDDING_STORAGE_VERSION,
+    METRIC_KEY,
+    parse_metric
+)
+from skypydb.database.mixins.vector.indexes import (
+    parse_index_config,
+    create_index
+)
+from skypydb.database.mixins.vector.quantization import parse_quantization_config
+from skypydb.database.mixins.vector.sysquantize import RERANK_COLUMN
+from skypydb.database.mixins.vector.collections.sysmetadataindex import parse_metadata_indexes
+from skypydb.database.mixins.vector.collections.sysdimension import parse_dimension
 
 class SysCreate:
     def create_collection(
@@ -22,10 +35,25 @@ class SysCreate:
 
         Args:
             name: Collection name
-            metadata: Optional collection metadata
+            metadata: Optional collection metadata. An approximate search index
+                can be configured here, e.g. {"index": "hnsw", "hnsw:M": 16,
+                "hnsw:ef_construction": 200, "hnsw:ef_search": 50} or
+                {"index": "ivf", "ivf:nlist": 100, "ivf:nprobe": 8}. Stored
+                embeddings can be compressed with {"quantization": "float16"} or
+                {"quantization": "int8"}, or product-quantized with
+                {"quantization": "pq", "pq:m": 16}; adding
+                {"quantization:rerank": True} keeps full-precision copies for
+                exact re-ranking. Metadata keys listed in
+                {"metadata_indexes": ["user_id", "agent_id", "run_id"]} are
+                indexed so that filters on them are B-tree lookups. The
+                embedding dimension can be declared with {"dimension": 1024},
+                otherwise it is recorded on the first write. The distance
+                metric is chosen with {"metric": "cosine"} (default), "l2"
+                (squared Euclidean distance) or "ip" (1 - inner product)
 
         Raises:
-            ValueError: If collection already exists
+            ValueError: If collection already exists or the index, quantization,
+                metadata index, dimension or metric configuration is invalid
         """
 
         name = InputValidator.validate_table_name(name)
@@ -33,6 +61,16 @@ class SysCreate:
         if self.collection_exists(name):
             raise ValueError(f"Collection '{name}' already exists")
 
+        index_config = parse_index_config(metadata)
+        if index_config is not None:
+            # fail early if the index backend is unavailable
+            create_index(index_config)
+        quantization_config = parse_quantization_config(metadata)
+        metadata_indexes = parse_metadata_indexes(metadata)
+        parse_dimension(metadata)
+        # recorded so that the metric of a collection can't change with the default
+        metadata = {**(metadata or {}), METRIC_KEY: parse_metric(metadata)}
+
         cursor = self.conn.cursor()
 
         # create the collection table
@@ -40,15 +78,39 @@ class SysCreate:
             CREATE TABLE [{table_name}] (
                 id TEXT PRIMARY KEY,
                 document TEXT,
-                embedding TEXT NOT NULL,
+                embedding BLOB NOT NULL,
                 metadata TEXT,
                 created_at TEXT NOT NULL
             )
         """)
 
+        # full-precision copies used to re-rank results of quantized collections
+        if quantization_config["rerank"]:
+            cursor.execute(f"ALTER TABLE [{table_name}] ADD COLUMN {RERANK_COLUMN} BLOB")
+
+        # expression indexes on the declared metadata keys
+        self._install_metadata_indexes(name, metadata_indexes)
+
+        # record writes so the index can be maintained incrementally
+        if index_config is not None:
+            self._ensure_assignment_column(name, index_config)
+            self._install_index_journal(name)
+
         # store collection metadata
         cursor.execute(
-            "INSERT INTO _vector_collections (name, metadata, created_at) VALUES (?, ?, ?)",
-            (name, json.dumps(metadata or {}), datetime.now().isoformat())
+            """
+            INSERT INTO _vector_collections (name, metadata, created_at, storage_version)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                name,
+                json.dumps(metadata),
+                datetime.now().isoformat(),
+                EMBEDDING_STORAGE_VERSION
+            )
         )
-        self.conn.commit()
\ No newline at end of file
+        self.conn.commit()
+        self._cache_evict(name)
+        self._index_configs.pop(name, None)
+        self._forget_quantizer(name)
+        self._metrics.pop(name, None)
\ No newline at end of file
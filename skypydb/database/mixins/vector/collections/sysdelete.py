@@ -29,9 +29,18 @@ class SysDelete:
         table_name = f"vec_{name}"
         cursor.execute("DROP TABLE [" + table_name + "]")
 
+        # remove the index snapshot and journal
+        self._drop_index(name)
+
+        # remove the trained quantizer state
+        self._drop_codebooks(name)
+
         # remove from collections metadata
         cursor.execute(
             "DELETE FROM _vector_collections WHERE name = ?",
             (name,)
         )
-        self.conn.commit()
\ No newline at end of file
+        self.conn.commit()
+        self._cache_evict(name)
+        self._forget_quantizer(name)
+        self._metrics.pop(name, None)
\ No newline at end of file
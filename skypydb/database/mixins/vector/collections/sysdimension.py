@@ -0,0 +1,114 @@
+"""
+Module containing the SysDimension class, which is used to record and enforce the embedding dimension of a collection.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Optional
+)
+from skypydb.security.validation import InputValidator
+
+# collection metadata key holding the embedding dimension
+DIMENSION_KEY = "dimension"
+
+def parse_dimension(
+    metadata: Optional[Dict[str, Any]]
+) -> Optional[int]:
+    """
+    Extract the embedding dimension from collection metadata.
+
+    Args:
+        metadata: Collection metadata, e.g. {"dimension": 1024}
+
+    Returns:
+        The dimension, None if it isn't recorded
+
+    Raises:
+        ValueError: If the dimension isn't a positive integer
+    """
+
+    dimension = (metadata or {}).get(DIMENSION_KEY)
+    if dimension is None:
+        return None
+    if isinstance(dimension, bool) or not isinstance(dimension, int) or dimension <= 0:
+        raise ValueError(f"'{DIMENSION_KEY}' must be a positive integer, got {dimension!r}")
+    return dimension
+
+class SysDimension:
+    def get_collection_dimension(
+        self,
+        collection_name: str
+    ) -> Optional[int]:
+        """
+        Get the embedding dimension of a collection.
+
+        The dimension is recorded in the collection metadata on the first
+        write, so it is known without generating an embedding.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            The dimension, None if the collection has never been written to
+
+        Raises:
+            ValueError: If collection doesn't exist
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+
+        dimension = parse_dimension(self._collection_metadata(collection_name))
+        if dimension is None:
+            dimension = self._stored_dimension(collection_name)
+        return dimension
+
+    def _stored_dimension(
+        self,
+        collection_name: str
+    ) -> Optional[int]:
+        """
+        Get the dimension of a stored embedding, for collections written
+        before dimensions were recorded.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(f"SELECT embedding FROM [vec_{collection_name}] LIMIT 1")
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return self._decode_embeddings(collection_name, [row[0]]).shape[1]
+
+    def _check_dimension(
+        self,
+        collection_name: str,
+        dimension: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check that embeddings about to be written match the dimension of a collection.
+
+        Returns:
+            The collection metadata with the dimension recorded, to be written
+            with the embeddings, or None if it is already recorded
+
+        Raises:
+            ValueError: If the dimension doesn't match the collection's
+        """
+
+        metadata = self._collection_metadata(collection_name)
+        expected = parse_dimension(metadata)
+        recorded = expected is not None
+        if not recorded:
+            expected = self._stored_dimension(collection_name)
+        if expected is not None and dimension != expected:
+            raise ValueError(
+                f"Embedding dimension {dimension} doesn't match the dimension {expected} "
+                f"of collection '{collection_name}'"
+            )
+        if recorded:
+            return None
+        metadata[DIMENSION_KEY] = dimension
+        return metadata
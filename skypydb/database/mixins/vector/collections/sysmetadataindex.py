@@ -0,0 +1,202 @@
+"""
+Module containing the SysMetadataIndex class, which is used to index metadata keys of a collection.
+"""
+
+import hashlib
+import json
+import re
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional
+)
+from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.filters import (
+    UncompilableFilter,
+    metadata_expression
+)
+
+# collection metadata key listing the indexed metadata keys
+METADATA_INDEXES_KEY = "metadata_indexes"
+
+def parse_metadata_indexes(
+    metadata: Optional[Dict[str, Any]]
+) -> List[str]:
+    """
+    Extract the indexed metadata keys from collection metadata.
+
+    Args:
+        metadata: Collection metadata, e.g. {"metadata_indexes": ["user_id", "agent_id"]}
+
+    Returns:
+        Indexed metadata keys, without duplicates
+
+    Raises:
+        ValueError: If the keys aren't a list of indexable strings
+    """
+
+    keys = (metadata or {}).get(METADATA_INDEXES_KEY) or []
+    if not isinstance(keys, (list, tuple)):
+        raise ValueError(f"'{METADATA_INDEXES_KEY}' must be a list of metadata keys, got {keys!r}")
+    for key in keys:
+        _validate_metadata_key(key)
+    return list(dict.fromkeys(keys))
+
+def _validate_metadata_key(key: Any) -> str:
+    """
+    Check that a metadata key can be indexed and get its SQL expression.
+    """
+
+    try:
+        return metadata_expression(key)
+    except UncompilableFilter:
+        raise ValueError(
+            f"Metadata key {key!r} can't be indexed. Indexed keys must be printable ASCII "
+            "strings without quotes or backslashes."
+        ) from None
+
+def metadata_index_name(
+    collection_name: str,
+    key: str
+) -> str:
+    """
+    Get the name of the SQL index on a metadata key of a collection.
+    """
+
+    # the digest keeps keys that only differ by punctuation apart
+    readable = re.sub(r"[^0-9A-Za-z_]", "_", key)[:32]
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+    return f"vec_{collection_name}__meta_{readable}_{digest}"
+
+class SysMetadataIndex:
+    def create_metadata_index(
+        self,
+        collection_name: str,
+        key: str
+    ) -> None:
+        """
+        Index a top-level metadata key of a collection.
+
+        Filters on the key, e.g. where={"user_id": "u42"}, are then resolved
+        with a B-tree lookup instead of scanning the collection. Only the
+        index is built, the collection table isn't rewritten.
+
+        Args:
+            collection_name: Name of the collection
+            key: Metadata key to index
+
+        Raises:
+            ValueError: If collection doesn't exist or the key can't be indexed
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+        _validate_metadata_key(key)
+
+        metadata = self._collection_metadata(collection_name)
+        keys = parse_metadata_indexes(metadata)
+
+        self._install_metadata_indexes(collection_name, [key])
+        if key not in keys:
+            metadata[METADATA_INDEXES_KEY] = keys + [key]
+            self._write_collection_metadata(collection_name, metadata)
+        self.conn.commit()
+
+    def drop_metadata_index(
+        self,
+        collection_name: str,
+        key: str
+    ) -> None:
+        """
+        Remove the index on a metadata key of a collection.
+
+        Args:
+            collection_name: Name of the collection
+            key: Indexed metadata key
+
+        Raises:
+            ValueError: If collection doesn't exist or the key isn't indexed
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+
+        metadata = self._collection_metadata(collection_name)
+        keys = parse_metadata_indexes(metadata)
+        if key not in keys:
+            raise ValueError(
+                f"Metadata key {key!r} isn't indexed in collection '{collection_name}'"
+            )
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(f"DROP INDEX IF EXISTS [{metadata_index_name(collection_name, key)}]")
+        metadata[METADATA_INDEXES_KEY] = [item for item in keys if item != key]
+        self._write_collection_metadata(collection_name, metadata)
+        self.conn.commit()
+
+    def list_metadata_indexes(
+        self,
+        collection_name: str
+    ) -> List[str]:
+        """
+        Get the indexed metadata keys of a collection.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Indexed metadata keys, in declaration order
+
+        Raises:
+            ValueError: If collection doesn't exist
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+        return parse_metadata_indexes(self._collection_metadata(collection_name))
+
+    def _install_metadata_indexes(
+        self,
+        collection_name: str,
+        keys: List[str]
+    ) -> None:
+        """
+        Create the expression indexes of metadata keys on a collection table.
+
+        The indexed expression is the one the filter compiler emits, so that
+        SQLite matches compiled filters against it. The caller is responsible
+        for committing.
+        """
+
+        cursor = self.conn.cursor()
+
+        for key in keys:
+            cursor.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS [{metadata_index_name(collection_name, key)}]
+                ON [vec_{collection_name}] ({_validate_metadata_key(key)})
+                """
+            )
+
+    def _write_collection_metadata(
+        self,
+        collection_name: str,
+        metadata: Dict[str, Any]
+    ) -> None:
+        """
+        Replace the raw metadata of a collection.
+
+        The caller is responsible for committing.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "UPDATE _vector_collections SET metadata = ? WHERE name = ?",
+            (json.dumps(metadata), collection_name)
+        )
@@ -0,0 +1,44 @@
+"""
+Module containing the SysMetric class, which is used to resolve the distance metric of a collection.
+"""
+
+from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.utils import parse_metric
+
+class SysMetric:
+    def get_collection_metric(
+        self,
+        collection_name: str
+    ) -> str:
+        """
+        Get the distance metric of a collection.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            "cosine", "l2" or "ip"
+
+        Raises:
+            ValueError: If collection doesn't exist
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+        return self._distance_metric(collection_name)
+
+    def _distance_metric(
+        self,
+        collection_name: str
+    ) -> str:
+        """
+        Get the distance metric of a collection, cosine for collections
+        created before the metric was recorded.
+        """
+
+        metric = self._metrics.get(collection_name)
+        if metric is None:
+            metric = parse_metric(self._collection_metadata(collection_name))
+            self._metrics[collection_name] = metric
+        return metric
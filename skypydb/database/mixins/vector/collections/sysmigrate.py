@@ -0,0 +1,130 @@
+"""
+Module containing the SysMigrate class, which is used to migrate collections to the current storage format.
+"""
+
+import json
+from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.collections.sysmetadataindex import parse_metadata_indexes
+from skypydb.database.mixins.vector.utils import (
+    EMBEDDING_STORAGE_VERSION,
+    serialize_embedding
+)
+
+# number of rows converted per batch while migrating a collection
+MIGRATION_BATCH_SIZE = 1000
+
+class SysMigrate:
+    def migrate_collection(
+        self,
+        name: str
+    ) -> bool:
+        """
+        Rewrite a legacy collection so that embeddings are stored as packed float32 BLOBs.
+
+        The collection table is rebuilt inside a single transaction, so an
+        interrupted migration leaves the legacy table untouched.
+
+        Args:
+            name: Collection name
+
+        Returns:
+            True if the collection was migrated, False if it was already up to date
+
+        Raises:
+            ValueError: If collection doesn't exist
+        """
+
+        name = InputValidator.validate_table_name(name)
+        if not self.collection_exists(name):
+            raise ValueError(f"Collection '{name}' not found")
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "SELECT storage_version FROM _vector_collections WHERE name = ?",
+            (name,)
+        )
+        row = cursor.fetchone()
+        if row is None or row["storage_version"] >= EMBEDDING_STORAGE_VERSION:
+            return False
+
+        table_name = f"vec_{name}"
+        # the temporary table never starts with "vec_" so it can't clash with a collection
+        migration_table = f"_migrate_{name}"
+
+        if self.conn.in_transaction:
+            self.conn.commit()
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS [{migration_table}]")
+            cursor.execute(f"""
+                CREATE TABLE [{migration_table}] (
+                    id TEXT PRIMARY KEY,
+                    document TEXT,
+                    embedding BLOB NOT NULL,
+                    metadata TEXT,
+                    created_at TEXT NOT NULL
+                )
+            """)
+
+            reader = self.conn.cursor()
+            reader.execute(
+                f"SELECT id, document, embedding, metadata, created_at FROM [{table_name}] ORDER BY rowid"
+            )
+            while True:
+                rows = reader.fetchmany(MIGRATION_BATCH_SIZE)
+                if not rows:
+                    break
+                cursor.executemany(
+                    f"""
+                    INSERT INTO [{migration_table}]
+                    (id, document, embedding, metadata, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            row["id"],
+                            row["document"],
+                            serialize_embedding(json.loads(row["embedding"])),
+                            row["metadata"],
+                            row["created_at"]
+                        )
+                        for row in rows
+                    ]
+                )
+
+            cursor.execute(f"DROP TABLE [{table_name}]")
+            cursor.execute(f"ALTER TABLE [{migration_table}] RENAME TO [{table_name}]")
+            self._install_metadata_indexes(
+                name,
+                parse_metadata_indexes(self._collection_metadata(name))
+            )
+            index_config = self._index_config(name)
+            if index_config is not None:
+                self._ensure_assignment_column(name, index_config)
+                self._install_index_journal(name)
+            cursor.execute(
+                "UPDATE _vector_collections SET storage_version = ? WHERE name = ?",
+                (EMBEDDING_STORAGE_VERSION, name)
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self._cache_evict(name)
+        return True
+
+    def _migrate_legacy_collections(self) -> None:
+        """
+        Migrate every collection still stored in a legacy format.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "SELECT name FROM _vector_collections WHERE storage_version < ?",
+            (EMBEDDING_STORAGE_VERSION,)
+        )
+        for row in cursor.fetchall():
+            if self.collection_exists(row["name"]):
+                self.migrate_collection(row["name"])
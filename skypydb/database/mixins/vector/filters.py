@@ -0,0 +1,190 @@
+"""
+Module containing the filter compiler, which is used to turn where and where_document filters into SQL.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+# comparison operators and their SQL counterpart, NULL never compares
+_COMPARISONS = {
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<="
+}
+
+# range of integers SQLite can bind
+_MIN_INTEGER = -(2 ** 63)
+_MAX_INTEGER = 2 ** 63 - 1
+
+class UncompilableFilter(Exception):
+    """
+    Raised when a filter can't be expressed in SQL with the same semantics
+    as the Python evaluation, e.g. equality on a list or a nested object.
+    """
+
+def metadata_expression(key: str) -> str:
+    """
+    Get the SQL expression extracting a metadata key.
+
+    The path is inlined rather than bound so that the expression matches
+    expression indexes declared on the same key.
+
+    Args:
+        key: Top-level metadata key
+
+    Returns:
+        SQL expression, e.g. json_extract(metadata, '$."user_id"')
+
+    Raises:
+        UncompilableFilter: If the key can't be written as a JSON path
+    """
+
+    # metadata is stored by json.dumps, which escapes non-ASCII keys that JSON paths can't match
+    if (
+        not isinstance(key, str)
+        or not key.isascii()
+        or not key.isprintable()
+        or any(char in key for char in '"\\')
+    ):
+        raise UncompilableFilter(f"Metadata key {key!r} can't be used in a JSON path")
+    path = f'$."{key}"'.replace("'", "''")
+    return f"json_extract(metadata, '{path}')"
+
+def _scalar(value: Any) -> Any:
+    """
+    Validate a value bound as a parameter.
+    """
+
+    if isinstance(value, bool) or isinstance(value, str):
+        return value
+    if isinstance(value, int) and _MIN_INTEGER <= value <= _MAX_INTEGER:
+        return value
+    if isinstance(value, float) and value == value:
+        return value
+    raise UncompilableFilter(f"Filter value {value!r} can't be compared in SQL")
+
+def _compile_condition(
+    key: str,
+    condition: Any,
+    params: List[Any]
+) -> str:
+    """
+    Compile the condition on one metadata key.
+    """
+
+    expression = metadata_expression(key)
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+
+    clauses = []
+    for op, value in condition.items():
+        if op in ("$eq", "$ne"):
+            if value is None:
+                # a missing key compares equal to None, like metadata.get(key)
+                clauses.append(f"{expression} IS {'NOT ' if op == '$ne' else ''}NULL")
+            else:
+                params.append(_scalar(value))
+                clauses.append(f"{expression} {'=' if op == '$eq' else 'IS NOT'} ?")
+        elif op in _COMPARISONS:
+            params.append(_scalar(value))
+            clauses.append(f"{expression} {_COMPARISONS[op]} ?")
+        elif op in ("$in", "$nin"):
+            if not isinstance(value, (list, tuple, set)):
+                raise UncompilableFilter(f"Operator {op} expects a list, got {value!r}")
+            values = [_scalar(item) for item in value if item is not None]
+            has_none = len(values) != len(value)
+            membership = (
+                f"{expression} IN ({', '.join(['?' for _ in values])})" if values else "0"
+            )
+            params.extend(values)
+            if op == "$in":
+                clauses.append(f"({membership} OR {expression} IS NULL)" if has_none else membership)
+            elif has_none:
+                clauses.append(f"({expression} IS NOT NULL AND NOT ({membership}))")
+            else:
+                clauses.append(f"({expression} IS NULL OR NOT ({membership}))")
+        # unknown operators are ignored, like the Python evaluation does
+    return " AND ".join(clauses) or "1"
+
+def _compile_where(
+    where: Dict[str, Any],
+    params: List[Any]
+) -> str:
+    """
+    Compile a metadata filter.
+    """
+
+    clauses = []
+    for key, value in where.items():
+        if key == "$and" or key == "$or":
+            if not isinstance(value, (list, tuple)):
+                raise UncompilableFilter(f"Operator {key} expects a list, got {value!r}")
+            if not value:
+                clauses.append("1" if key == "$and" else "0")
+                continue
+            if not all(isinstance(cond, dict) for cond in value):
+                raise UncompilableFilter(f"Operator {key} expects a list of filters")
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append(
+                "(" + joiner.join(f"({_compile_where(cond, params)})" for cond in value) + ")"
+            )
+        elif key.startswith("$"):
+            # unknown operators are ignored, like the Python evaluation does
+            continue
+        else:
+            clauses.append(_compile_condition(key, value, params))
+    return " AND ".join(clauses) or "1"
+
+def _compile_where_document(
+    where_document: Dict[str, str],
+    params: List[Any]
+) -> str:
+    """
+    Compile a document filter.
+    """
+
+    clauses = []
+    for op, value in where_document.items():
+        if op not in ("$contains", "$not_contains"):
+            continue
+        if not isinstance(value, str):
+            raise UncompilableFilter(f"Operator {op} expects a string, got {value!r}")
+        params.append(value)
+        # instr is case-sensitive like Python's in, and a missing document searches as ""
+        clauses.append(
+            f"instr(COALESCE(document, ''), ?) {'>' if op == '$contains' else '='} 0"
+        )
+    return " AND ".join(clauses) or "1"
+
+def compile_filters(
+    where: Optional[Dict[str, Any]] = None,
+    where_document: Optional[Dict[str, str]] = None
+) -> Optional[Tuple[str, List[Any]]]:
+    """
+    Compile where and where_document filters into a parameterized SQL condition.
+
+    Args:
+        where: Metadata filter, e.g. {"user_id": "u42", "score": {"$gte": 0.5}}
+        where_document: Document filter, e.g. {"$contains": "python"}
+
+    Returns:
+        Tuple of the SQL condition over a collection table and its parameters,
+        or None if the filters can only be evaluated in Python
+    """
+
+    params: List[Any] = []
+    clauses = []
+    try:
+        if where is not None:
+            clauses.append(_compile_where(where, params))
+        if where_document is not None:
+            clauses.append(_compile_where_document(where_document, params))
+    except UncompilableFilter:
+        return None
+    return " AND ".join(f"({clause})" for clause in clauses) or "1", params
@@ -0,0 +1,137 @@
+"""
+Vector index module.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Union
+)
+from skypydb.database.mixins.vector.indexes.hnsw import HnswIndex
+from skypydb.database.mixins.vector.indexes.ivf import IvfIndex
+from skypydb.database.mixins.vector.utils import parse_metric
+
+# collection metadata key selecting the index type
+INDEX_METADATA_KEY = "index"
+
+def _positive_int(
+    key: str,
+    value: Any
+) -> int:
+    """
+    Validate an integer index parameter.
+    """
+
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ValueError(f"Index parameter '{key}' must be a positive integer, got {value!r}")
+    return value
+
+def _imbalance_factor(
+    key: str,
+    value: Any
+) -> float:
+    """
+    Validate the imbalance factor that triggers retraining.
+    """
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 1:
+        raise ValueError(f"Index parameter '{key}' must be a number greater than 1, got {value!r}")
+    return float(value)
+
+# parameters accepted by each index type, with their validator
+_INDEX_PARAMETERS = {
+    "hnsw": {
+        "M": _positive_int,
+        "ef_construction": _positive_int,
+        "ef_search": _positive_int
+    },
+    "ivf": {
+        "nlist": _positive_int,
+        "nprobe": _positive_int,
+        "sample_size": _positive_int,
+        "max_imbalance": _imbalance_factor
+    }
+}
+
+def parse_index_config(
+    metadata: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Extract the index configuration from collection metadata.
+
+    Args:
+        metadata: Collection metadata, e.g.
+            {"index": "hnsw", "hnsw:M": 16, "hnsw:ef_construction": 200, "hnsw:ef_search": 50}
+            or {"index": "ivf", "ivf:nlist": 100, "ivf:nprobe": 8}
+
+    Returns:
+        Index configuration with a "kind" key and the "metric" of the collection,
+        or None for brute-force collections
+
+    Raises:
+        ValueError: If the index type or one of its parameters is invalid
+    """
+
+    metadata = metadata or {}
+    kind = metadata.get(INDEX_METADATA_KEY)
+    if kind is None or kind == "flat":
+        return None
+
+    if kind not in _INDEX_PARAMETERS:
+        raise ValueError(
+            f"Unsupported index type '{kind}'. Supported index types: flat, hnsw, ivf."
+        )
+
+    parameters = _INDEX_PARAMETERS[kind]
+    prefix = f"{kind}:"
+    config: Dict[str, Any] = {"kind": kind, "metric": parse_metric(metadata)}
+    for key, value in metadata.items():
+        if not key.startswith(prefix):
+            continue
+        name = key[len(prefix):]
+        if name not in parameters:
+            raise ValueError(
+                f"Unsupported {kind.upper()} parameter '{key}'. "
+                f"Supported parameters: {', '.join(prefix + param for param in parameters)}."
+            )
+        config[name] = parameters[name](key, value)
+    return config
+
+def create_index(
+    config: Dict[str, Any]
+) -> Union[HnswIndex, IvfIndex]:
+    """
+    Create an empty index from a configuration returned by parse_index_config.
+    """
+
+    params = {key: value for key, value in config.items() if key != "kind"}
+    if config["kind"] == "hnsw":
+        return HnswIndex(**params)
+    if config["kind"] == "ivf":
+        return IvfIndex(**params)
+    raise ValueError(f"Unsupported index type '{config['kind']}'.")
+
+def load_index(
+    config: Dict[str, Any],
+    data: bytes
+) -> Union[HnswIndex, IvfIndex]:
+    """
+    Restore an index snapshot written by its to_bytes method.
+    """
+
+    params = {key: value for key, value in config.items() if key != "kind"}
+    if config["kind"] == "hnsw":
+        return HnswIndex.from_bytes(data, **params)
+    if config["kind"] == "ivf":
+        return IvfIndex.from_bytes(data, **params)
+    raise ValueError(f"Unsupported index type '{config['kind']}'.")
+
+__all__ = [
+    "HnswIndex",
+    "IvfIndex",
+    "INDEX_METADATA_KEY",
+    "parse_index_config",
+    "create_index",
+    "load_index"
+]
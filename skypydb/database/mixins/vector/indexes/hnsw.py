@@ -0,0 +1,317 @@
+"""
+Module containing the HnswIndex class, which is used to run approximate nearest-neighbour search with HNSW graphs.
+"""
+
+import os
+import tempfile
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+import numpy as np
+from skypydb.database.mixins.vector.utils import (
+    DEFAULT_METRIC,
+    deserialize_state,
+    serialize_state
+)
+
+# default graph parameters, overridable through the collection metadata
+DEFAULT_M = 16
+DEFAULT_EF_CONSTRUCTION = 200
+DEFAULT_EF_SEARCH = 50
+
+# fraction of tombstoned nodes that triggers a rebuild of the graph
+COMPACTION_RATIO = 0.25
+
+class HnswIndex:
+    """
+    HNSW graph over the embeddings of a collection.
+
+    Items are addressed by their collection ID; the graph itself uses integer
+    labels that are allocated here. Deleted items are tombstoned in the graph
+    and the graph is rebuilt once tombstones exceed COMPACTION_RATIO.
+    """
+
+    kind = "hnsw"
+    search_params = ("ef_search",)
+    # HNSW keeps everything in its snapshot, nothing is stored in the collection table
+    assignment_column = None
+
+    def __init__(
+        self,
+        M: int = DEFAULT_M,
+        ef_construction: int = DEFAULT_EF_CONSTRUCTION,
+        ef_search: int = DEFAULT_EF_SEARCH,
+        metric: str = DEFAULT_METRIC
+    ):
+        """
+        Initialize an empty HNSW index.
+
+        Args:
+            M: Number of bi-directional links per node
+            ef_construction: Size of the candidate list while inserting
+            ef_search: Default size of the candidate list while searching
+            metric: Distance metric of the collection, one of "cosine", "l2" or "ip"
+        """
+
+        try:
+            import hnswlib
+        except ImportError as exc:
+            raise ImportError(
+                "HNSW indexes require the `hnswlib` package. "
+                "Install it with `pip install hnswlib`."
+            ) from exc
+
+        self._hnswlib = hnswlib
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.metric = metric
+        self._graph: Optional[Any] = None
+        self._labels: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._next_label = 0
+        self._tombstones = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Number of live items in the index.
+        """
+
+        return len(self._labels)
+
+    @property
+    def dimension(self) -> Optional[int]:
+        """
+        Dimension of the indexed vectors, None until the first insert.
+        """
+
+        return self._graph.dim if self._graph is not None else None
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray
+    ) -> None:
+        """
+        Insert items, or move them if their ID is already indexed.
+
+        Args:
+            ids: Item IDs
+            vectors: (n, d) float32 matrix of embeddings
+        """
+
+        if len(ids) == 0:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self._graph is None:
+            self._graph = self._new_graph(vectors.shape[1], len(ids))
+        elif vectors.shape[1] != self._graph.dim:
+            raise ValueError(
+                f"Vector dimensions don't match: {vectors.shape[1]} vs {self._graph.dim}"
+            )
+
+        labels = []
+        for item_id in ids:
+            label = self._labels.get(item_id)
+            if label is None:
+                label = self._next_label
+                self._next_label += 1
+                self._labels[item_id] = label
+                self._ids[label] = item_id
+            labels.append(label)
+
+        required = self._graph.element_count + len(ids)
+        if required > self._graph.get_max_elements():
+            self._graph.resize_index(max(required, 2 * self._graph.get_max_elements()))
+        self._graph.add_items(vectors, np.asarray(labels, dtype=np.int64))
+
+    def remove(
+        self,
+        ids: Sequence[str]
+    ) -> None:
+        """
+        Tombstone items in the graph.
+
+        Args:
+            ids: Item IDs
+        """
+
+        for item_id in ids:
+            label = self._labels.pop(item_id, None)
+            if label is None:
+                continue
+            del self._ids[label]
+            self._graph.mark_deleted(label)
+            self._tombstones += 1
+
+    def needs_training(self) -> bool:
+        """
+        HNSW graphs are built incrementally and never need training.
+        """
+
+        return False
+
+    def needs_compaction(self) -> bool:
+        """
+        Check if enough tombstones accumulated to justify a rebuild.
+        """
+
+        if self._graph is None or self._tombstones == 0:
+            return False
+        return self._tombstones > COMPACTION_RATIO * self._graph.element_count
+
+    def compact(self) -> None:
+        """
+        Rebuild the graph from its live items, dropping every tombstone.
+        """
+
+        ids = list(self._labels)
+        vectors = (
+            self._graph.get_items(
+                np.asarray([self._labels[item_id] for item_id in ids], dtype=np.int64),
+                return_type="numpy"
+            )
+            if ids else None
+        )
+
+        self._graph = None
+        self._labels = {}
+        self._ids = {}
+        self._next_label = 0
+        self._tombstones = 0
+        if ids:
+            self.add(ids, vectors)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        cached: Any,
+        ef_search: Optional[int] = None
+    ) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Find the approximate k nearest items of each query.
+
+        Args:
+            queries: (q, d) float32 matrix of query vectors
+            k: Number of neighbours per query
+            cached: Resident copy of the collection (unused, the graph holds its vectors)
+            ef_search: Optional candidate list size overriding the default;
+                higher values trade latency for recall
+
+        Returns:
+            One (ids, distances) pair per query, closest first
+        """
+
+        k = min(k, self.size)
+        if k <= 0 or self._graph is None:
+            return [([], np.empty(0, dtype=np.float32)) for _ in range(len(queries))]
+
+        self._graph.set_ef(max(ef_search or self.ef_search, k))
+        try:
+            labels, distances = self._graph.knn_query(queries, k=k)
+        except RuntimeError:
+            # too many tombstones around the entry point for the current ef,
+            # fall back to an exhaustive walk of the graph
+            self._graph.set_ef(max(self._graph.element_count, k))
+            labels, distances = self._graph.knn_query(queries, k=k)
+        return [
+            ([self._ids[int(label)] for label in row_labels], row_distances)
+            for row_labels, row_distances in zip(labels, distances)
+        ]
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the index for storage in the sidecar table.
+
+        The graph is written in hnswlib's own format and the label map as JSON.
+        """
+
+        state = {
+            "M": self.M,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "metric": self.metric,
+            "ids": list(self._labels),
+            "labels": list(self._labels.values()),
+            "next_label": self._next_label,
+            "tombstones": self._tombstones,
+            "dimension": self.dimension,
+            "max_elements": self._graph.get_max_elements() if self._graph is not None else 0
+        }
+        arrays = {}
+        if self._graph is not None:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "graph.bin")
+                self._graph.save_index(path)
+                with open(path, "rb") as file:
+                    arrays["graph"] = np.frombuffer(file.read(), dtype=np.uint8)
+        return serialize_state(state, arrays)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        **config: Any
+    ) -> "HnswIndex":
+        """
+        Restore an index produced by to_bytes.
+
+        Args:
+            data: Serialized index
+            **config: Current collection config, which takes precedence
+                over the search parameters stored in the snapshot
+
+        Raises:
+            ValueError: If the snapshot can't be read
+        """
+
+        state, arrays = deserialize_state(data)
+        index = cls(
+            M=state["M"],
+            ef_construction=state["ef_construction"],
+            ef_search=config.get("ef_search", state["ef_search"]),
+            metric=state["metric"]
+        )
+        if "graph" in arrays:
+            index._graph = index._hnswlib.Index(space=index.metric, dim=state["dimension"])
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "graph.bin")
+                with open(path, "wb") as file:
+                    file.write(arrays["graph"].tobytes())
+                try:
+                    index._graph.load_index(path, max_elements=state["max_elements"])
+                except RuntimeError as exc:
+                    raise ValueError("Corrupted HNSW graph snapshot") from exc
+            index._graph.set_ef(index.ef_search)
+        index._labels = dict(zip(state["ids"], state["labels"]))
+        index._ids = {label: item_id for item_id, label in index._labels.items()}
+        index._next_label = state["next_label"]
+        index._tombstones = state["tombstones"]
+        return index
+
+    def _new_graph(
+        self,
+        dimension: int,
+        capacity: int
+    ) -> Any:
+        """
+        Allocate an empty graph.
+        """
+
+        # hnswlib spaces are named like the metrics and return the same distances
+        graph = self._hnswlib.Index(space=self.metric, dim=dimension)
+        graph.init_index(
+            max_elements=max(capacity, 16),
+            ef_construction=self.ef_construction,
+            M=self.M
+        )
+        graph.set_ef(self.ef_search)
+        return graph
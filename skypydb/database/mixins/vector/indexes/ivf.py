@@ -0,0 +1,428 @@
+"""
+Module containing the IvfIndex class, which is used to run partitioned search over k-means inverted lists.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+import numpy as np
+from skypydb.database.mixins.vector.utils import (
+    DEFAULT_METRIC,
+    deserialize_state,
+    normalize_rows,
+    serialize_state,
+    top_k_indices
+)
+
+# default partitioning parameters, overridable through the collection metadata
+DEFAULT_NLIST = 100
+DEFAULT_NPROBE = 8
+DEFAULT_SAMPLE_SIZE = 50000
+DEFAULT_MAX_IMBALANCE = 2.0
+
+# minimum number of items per list before the quantizer is trained
+MIN_POINTS_PER_LIST = 4
+
+# number of Lloyd iterations used to train the quantizer
+KMEANS_ITERATIONS = 20
+
+# rows assigned per matrix multiply, bounds the temporary (rows, nlist) matrix
+_ASSIGN_BATCH_SIZE = 8192
+
+def _centroid_distances(
+    vectors: np.ndarray,
+    centroids: np.ndarray,
+    metric: str
+) -> np.ndarray:
+    """
+    Score rows against the centroids under a metric, lower is closer.
+    """
+
+    if metric == "cosine":
+        # cosine centroids are unit vectors
+        return -(normalize_rows(vectors) @ centroids.T)
+    dots = vectors @ centroids.T
+    if metric == "l2":
+        # the squared norm of a row is the same for every centroid, so it is left out
+        return np.square(centroids).sum(axis=1) - 2.0 * dots
+    return -dots
+
+def _nearest_centroids(
+    vectors: np.ndarray,
+    centroids: np.ndarray,
+    metric: str = DEFAULT_METRIC
+) -> np.ndarray:
+    """
+    Assign each row to its closest centroid under a metric.
+    """
+
+    assignments = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], _ASSIGN_BATCH_SIZE):
+        block = vectors[start:start + _ASSIGN_BATCH_SIZE]
+        assignments[start:start + block.shape[0]] = np.argmin(
+            _centroid_distances(block, centroids, metric),
+            axis=1
+        )
+    return assignments
+
+def train_kmeans(
+    sample: np.ndarray,
+    nlist: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0,
+    metric: str = DEFAULT_METRIC
+) -> np.ndarray:
+    """
+    Train k-means centroids on a sample of vectors.
+
+    Cosine collections use spherical k-means; l2 and ip collections use
+    mean centroids, assigned by Euclidean distance and inner product
+    respectively.
+
+    Args:
+        sample: (n, d) float32 training vectors, n >= nlist
+        nlist: Number of centroids
+        iterations: Maximum number of Lloyd iterations
+        seed: Seed of the random initialization
+        metric: Distance metric of the collection
+
+    Returns:
+        (nlist, d) float32 matrix of centroids, unit-norm for cosine
+    """
+
+    rng = np.random.default_rng(seed)
+    sample = np.asarray(sample, dtype=np.float32)
+    if metric == "cosine":
+        sample = normalize_rows(sample)
+    centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+
+    assignments = None
+    for _ in range(iterations):
+        new_assignments = _nearest_centroids(sample, centroids, metric)
+        if assignments is not None and np.array_equal(assignments, new_assignments):
+            break
+        assignments = new_assignments
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=nlist)
+
+        # re-seed empty lists with random training points
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            sums[empty] = sample[rng.choice(sample.shape[0], empty.size, replace=False)]
+            counts[empty] = 1
+        if metric == "cosine":
+            centroids = normalize_rows(sums)
+        else:
+            centroids = (sums / counts[:, np.newaxis]).astype(np.float32)
+    return centroids
+
+class IvfIndex:
+    """
+    Inverted-file index over the embeddings of a collection.
+
+    A k-means coarse quantizer splits the collection into nlist lists and a
+    query only scans the nprobe lists closest to it. Until the collection is
+    large enough to train the quantizer, every query scans all items.
+    """
+
+    kind = "ivf"
+    search_params = ("nprobe",)
+    # column of the collection table holding each row's list
+    assignment_column = "ivf_list"
+
+    def __init__(
+        self,
+        nlist: int = DEFAULT_NLIST,
+        nprobe: int = DEFAULT_NPROBE,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        max_imbalance: float = DEFAULT_MAX_IMBALANCE,
+        metric: str = DEFAULT_METRIC
+    ):
+        """
+        Initialize an untrained IVF index.
+
+        Args:
+            nlist: Number of inverted lists
+            nprobe: Default number of lists scanned per query
+            sample_size: Number of stored vectors used to train the quantizer
+            max_imbalance: Imbalance factor above which the quantizer is retrained
+            metric: Distance metric of the collection, one of "cosine", "l2" or "ip"
+        """
+
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.sample_size = sample_size
+        self.max_imbalance = max_imbalance
+        self.metric = metric
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._assignments: Dict[str, Optional[int]] = {}
+        self._lists: List[Dict[str, None]] = []
+
+    @property
+    def size(self) -> int:
+        """
+        Number of live items in the index.
+        """
+
+        return len(self._assignments)
+
+    @property
+    def trained(self) -> bool:
+        """
+        Whether the coarse quantizer has been trained.
+        """
+
+        return self.centroids is not None
+
+    def assignment(
+        self,
+        item_id: str
+    ) -> Optional[int]:
+        """
+        Get the list of an item, None while the quantizer is untrained.
+        """
+
+        return self._assignments.get(item_id)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray
+    ) -> None:
+        """
+        Assign items to their nearest list, moving them if already indexed.
+
+        Args:
+            ids: Item IDs
+            vectors: (n, d) float32 matrix of embeddings
+        """
+
+        if len(ids) == 0:
+            return
+
+        self.remove(ids)
+        if not self.trained:
+            for item_id in ids:
+                self._assignments[item_id] = None
+            return
+
+        assignments = _nearest_centroids(
+            np.asarray(vectors, dtype=np.float32),
+            self.centroids,
+            self.metric
+        )
+        for item_id, list_id in zip(ids, assignments.tolist()):
+            self._assignments[item_id] = list_id
+            self._lists[list_id][item_id] = None
+
+    def restore(
+        self,
+        ids: Sequence[str],
+        list_ids: Sequence[int]
+    ) -> None:
+        """
+        Restore list assignments read back from the collection table.
+
+        Items without a valid list are registered as unassigned and have to
+        be added again once the quantizer is trained.
+        """
+
+        for item_id, list_id in zip(ids, list_ids):
+            if list_id is None or not 0 <= list_id < len(self._lists):
+                self._assignments[item_id] = None
+                continue
+            self._assignments[item_id] = list_id
+            self._lists[list_id][item_id] = None
+
+    def unassigned(self) -> List[str]:
+        """
+        Get the IDs of items not assigned to any list.
+        """
+
+        return [item_id for item_id, list_id in self._assignments.items() if list_id is None]
+
+    def remove(
+        self,
+        ids: Sequence[str]
+    ) -> None:
+        """
+        Remove items from their list.
+
+        Args:
+            ids: Item IDs
+        """
+
+        for item_id in ids:
+            if item_id not in self._assignments:
+                continue
+            list_id = self._assignments.pop(item_id)
+            if list_id is not None:
+                self._lists[list_id].pop(item_id, None)
+
+    def imbalance(self) -> float:
+        """
+        Imbalance factor of the lists, 1.0 when every list has the same size.
+        """
+
+        sizes = np.asarray([len(items) for items in self._lists], dtype=np.float64)
+        total = sizes.sum()
+        if total == 0:
+            return 1.0
+        return float(len(sizes) * np.square(sizes).sum() / (total * total))
+
+    def needs_training(self) -> bool:
+        """
+        Check if the quantizer should be (re)trained.
+
+        A trained quantizer is only retrained once the collection changed
+        noticeably since training, so a skewed dataset can't cause a retrain
+        on every write.
+        """
+
+        if not self.trained:
+            return self.size >= self.nlist * MIN_POINTS_PER_LIST
+        drift = abs(self.size - self.trained_size)
+        if drift < max(self.trained_size // 10, len(self._lists)):
+            return False
+        return self.imbalance() > self.max_imbalance
+
+    def train(
+        self,
+        sample: np.ndarray
+    ) -> None:
+        """
+        Train the coarse quantizer and empty every list.
+
+        Items have to be added again to be assigned to the new lists.
+
+        Args:
+            sample: (n, d) float32 training vectors
+        """
+
+        nlist = min(self.nlist, sample.shape[0])
+        self.centroids = train_kmeans(sample, nlist, metric=self.metric)
+        self.trained_size = self.size
+        self._assignments = {}
+        self._lists = [{} for _ in range(nlist)]
+
+    def needs_compaction(self) -> bool:
+        """
+        Lists are updated in place, so there is never anything to compact.
+        """
+
+        return False
+
+    def compact(self) -> None:
+        """
+        Lists are updated in place, so there is never anything to compact.
+        """
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        cached: Any,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Find the nearest items of each query within its nprobe closest lists.
+
+        Args:
+            queries: (q, d) float32 matrix of query vectors
+            k: Number of neighbours per query
+            cached: Resident copy of the collection, used to score candidates
+            nprobe: Optional number of lists to scan overriding the default;
+                higher values trade latency for recall
+
+        Returns:
+            One (ids, distances) pair per query, closest first
+        """
+
+        if not self.trained:
+            candidates = [np.arange(cached.size)] * len(queries)
+        else:
+            nprobe = min(nprobe or self.nprobe, len(self._lists))
+            probes = _centroid_distances(queries, self.centroids, self.metric)
+            candidates = []
+            for query_probes in probes:
+                lists = top_k_indices(query_probes, nprobe)
+                candidates.append(np.asarray(
+                    [
+                        cached.positions[item_id]
+                        for list_id in lists
+                        for item_id in self._lists[list_id]
+                    ],
+                    dtype=np.intp
+                ))
+
+        results = []
+        for query, positions in zip(queries, candidates):
+            if positions.shape[0] == 0:
+                results.append(([], np.empty(0, dtype=np.float32)))
+                continue
+            distances = cached.distances(query.reshape(1, -1), positions)[0]
+            top = top_k_indices(distances, k)
+            results.append((
+                [cached.ids[index] for index in positions[top]],
+                distances[top]
+            ))
+        return results
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the quantizer for storage in the sidecar table.
+
+        List assignments live in the collection table, so only the
+        centroids and parameters are stored.
+        """
+
+        state = {
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "sample_size": self.sample_size,
+            "max_imbalance": self.max_imbalance,
+            "metric": self.metric,
+            "trained_size": self.trained_size
+        }
+        arrays = {"centroids": self.centroids} if self.centroids is not None else {}
+        return serialize_state(state, arrays)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        **config: Any
+    ) -> "IvfIndex":
+        """
+        Restore an index produced by to_bytes.
+
+        Args:
+            data: Serialized index
+            **config: Current collection config, which takes precedence
+                over the parameters stored in the snapshot
+
+        Raises:
+            ValueError: If the snapshot can't be read
+        """
+
+        state, arrays = deserialize_state(data)
+        index = cls(
+            nlist=config.get("nlist", state["nlist"]),
+            nprobe=config.get("nprobe", state["nprobe"]),
+            sample_size=config.get("sample_size", state["sample_size"]),
+            max_imbalance=config.get("max_imbalance", state["max_imbalance"]),
+            metric=state["metric"]
+        )
+        index.centroids = arrays.get("centroids")
+        index.trained_size = state["trained_size"]
+        if index.centroids is not None:
+            index._lists = [{} for _ in range(index.centroids.shape[0])]
+        return index
@@ -0,0 +1,102 @@
+"""
+Vector quantization module.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Optional
+)
+from skypydb.database.mixins.vector.quantization.base import Quantizer
+from skypydb.database.mixins.vector.quantization.scalar import ScalarQuantizer
+from skypydb.database.mixins.vector.quantization.product import ProductQuantizer
+
+# collection metadata key selecting the quantization mode
+QUANTIZATION_METADATA_KEY = "quantization"
+
+def parse_quantization_config(
+    metadata: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Extract the quantization configuration from collection metadata.
+
+    Args:
+        metadata: Collection metadata, e.g. {"quantization": "int8", "quantization:rerank": True}
+            or {"quantization": "pq", "pq:m": 16, "pq:train_size": 10000}
+
+    Returns:
+        Quantization configuration with "mode" and "rerank" keys, plus the
+        pq "m" and "train_size" when set
+
+    Raises:
+        ValueError: If the quantization mode or one of its parameters is invalid
+    """
+
+    metadata = metadata or {}
+    mode = metadata.get(QUANTIZATION_METADATA_KEY) or "float32"
+    if mode not in {"float32", "float16", "int8", "pq"}:
+        raise ValueError(
+            f"Unsupported quantization '{mode}'. Supported quantizations: float32, float16, int8, pq."
+        )
+
+    config: Dict[str, Any] = {"mode": mode, "rerank": False}
+    for key, value in metadata.items():
+        if key.startswith("pq:"):
+            name = key[len("pq:"):]
+            if mode != "pq":
+                raise ValueError(f"Quantization parameter '{key}' requires the pq quantization")
+            if name not in {"m", "train_size"}:
+                raise ValueError(
+                    f"Unsupported product quantization parameter '{key}'. "
+                    "Supported parameters: pq:m, pq:train_size."
+                )
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f"Quantization parameter '{key}' must be a positive integer, got {value!r}")
+            config[name] = value
+            continue
+        if not key.startswith("quantization:"):
+            continue
+        name = key[len("quantization:"):]
+        if name == "rerank":
+            if not isinstance(value, bool):
+                raise ValueError(f"Quantization parameter '{key}' must be a boolean, got {value!r}")
+            config["rerank"] = value
+        else:
+            raise ValueError(
+                f"Unsupported quantization parameter '{key}'. "
+                "Supported parameters: quantization:rerank."
+            )
+
+    if config["rerank"] and mode == "float32":
+        raise ValueError("quantization:rerank requires a float16, int8 or pq quantization")
+    return config
+
+def create_quantizer(
+    config: Dict[str, Any],
+    codebooks: Optional[bytes] = None
+) -> Quantizer:
+    """
+    Create a quantizer from a configuration returned by parse_quantization_config.
+
+    Args:
+        config: Quantization configuration
+        codebooks: Trained state persisted by the quantizer's to_bytes, if any
+    """
+
+    if config["mode"] == "int8" and codebooks is not None:
+        return ScalarQuantizer.from_bytes(codebooks)
+    if config["mode"] == "pq":
+        params = {key: config[key] for key in ("m", "train_size") if key in config}
+        if codebooks is not None:
+            return ProductQuantizer.from_bytes(codebooks, **params)
+        return ProductQuantizer(**params)
+    return ScalarQuantizer(config["mode"])
+
+__all__ = [
+    "Quantizer",
+    "ScalarQuantizer",
+    "ProductQuantizer",
+    "QUANTIZATION_METADATA_KEY",
+    "parse_quantization_config",
+    "create_quantizer"
+]
@@ -0,0 +1,153 @@
+"""
+Module containing the Quantizer class, which is the base of the quantizers encoding stored embeddings.
+"""
+
+from typing import (
+    List,
+    Optional,
+    Sequence
+)
+import numpy as np
+
+# rows decoded at once, bounds the temporary float32 copy of the codes
+DECODE_BLOCK_ROWS = 16384
+
+class Quantizer:
+    """
+    Encoding of the embeddings stored in a collection.
+
+    Codes are fixed-size rows of code_dtype, stored one BLOB per item and
+    kept in memory as one (n, width) matrix.
+    """
+
+    mode = "float32"
+    code_dtype = np.dtype("<f4")
+
+    # number of stored vectors required before the quantizer can be trained,
+    # None when it doesn't need (more) training
+    training_size: Optional[int] = None
+
+    @property
+    def fitted(self) -> bool:
+        """
+        Whether the quantizer can encode vectors.
+        """
+
+        return True
+
+    def fit(
+        self,
+        vectors: np.ndarray
+    ) -> "Quantizer":
+        """
+        Get a quantizer able to encode the given vectors, self if nothing has to change.
+        """
+
+        return self
+
+    def train(
+        self,
+        sample: np.ndarray
+    ) -> "Quantizer":
+        """
+        Get a quantizer trained on a sample of the collection.
+        """
+
+        return self
+
+    def encode(
+        self,
+        vectors: np.ndarray
+    ) -> np.ndarray:
+        """
+        Encode (n, d) float32 vectors into codes.
+        """
+
+        return np.asarray(vectors, dtype=np.float32).astype(self.code_dtype)
+
+    def decode(
+        self,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Decode codes back into (n, d) float32 vectors.
+        """
+
+        return codes.astype(np.float32, copy=False)
+
+    def dot(
+        self,
+        queries: np.ndarray,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the inner products between queries and the vectors encoded by codes.
+
+        Args:
+            queries: (q, d) float32 query vectors
+            codes: (n, width) codes produced by encode
+
+        Returns:
+            (q, n) float32 matrix of inner products
+        """
+
+        if queries.shape[1] != codes.shape[1]:
+            raise ValueError(
+                f"Vector dimensions don't match: {queries.shape[1]} vs {codes.shape[1]}"
+            )
+        return queries @ codes.T
+
+    def norms(
+        self,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the L2 norms of the vectors encoded by codes.
+        """
+
+        norms = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], DECODE_BLOCK_ROWS):
+            block = self.decode(codes[start:start + DECODE_BLOCK_ROWS])
+            norms[start:start + block.shape[0]] = np.linalg.norm(block, axis=1)
+        return norms
+
+    def to_blobs(
+        self,
+        codes: np.ndarray
+    ) -> List[bytes]:
+        """
+        Pack each row of codes into a BLOB.
+        """
+
+        codes = np.ascontiguousarray(codes, dtype=self.code_dtype)
+        return [row.tobytes() for row in codes]
+
+    def from_blobs(
+        self,
+        blobs: Sequence[bytes]
+    ) -> np.ndarray:
+        """
+        Unpack BLOBs written by to_blobs into one (n, width) matrix of codes.
+
+        Raises:
+            ValueError: If the codes don't all have the same width
+        """
+
+        if not blobs:
+            return np.empty((0, 0), dtype=self.code_dtype)
+
+        size = len(blobs[0])
+        if any(len(blob) != size for blob in blobs):
+            raise ValueError("Vector dimensions don't match across the collection")
+
+        return np.frombuffer(b"".join(blobs), dtype=self.code_dtype).reshape(
+            len(blobs),
+            size // self.code_dtype.itemsize
+        )
+
+    def to_bytes(self) -> Optional[bytes]:
+        """
+        Serialize the trained state to persist in the codebook table, None if there is none.
+        """
+
+        return None
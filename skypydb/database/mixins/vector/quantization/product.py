@@ -0,0 +1,313 @@
+"""
+Module containing the ProductQuantizer class, which is used to compress stored embeddings to product-quantization codes.
+"""
+
+from typing import (
+    Any,
+    List,
+    Optional
+)
+import numpy as np
+from skypydb.database.mixins.vector.quantization.base import (
+    DECODE_BLOCK_ROWS,
+    Quantizer
+)
+from skypydb.database.mixins.vector.utils import (
+    deserialize_state,
+    serialize_state
+)
+
+# default number of subspaces, overridable through the collection metadata
+DEFAULT_M = 8
+
+# default number of stored vectors after which codebooks are trained on them
+DEFAULT_TRAIN_SIZE = 10000
+
+# centroids per subspace, so that every code fits in one byte
+CODEBOOK_SIZE = 256
+
+# number of Lloyd iterations used to train each codebook
+KMEANS_ITERATIONS = 20
+
+def _nearest_centroids(
+    vectors: np.ndarray,
+    centroids: np.ndarray
+) -> np.ndarray:
+    """
+    Assign each row to the centroid with the smallest L2 distance.
+    """
+
+    centroid_norms = np.square(centroids).sum(axis=1)
+    assignments = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], DECODE_BLOCK_ROWS):
+        block = vectors[start:start + DECODE_BLOCK_ROWS]
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, and ||x||^2 doesn't change the argmin
+        assignments[start:start + block.shape[0]] = np.argmin(
+            centroid_norms - 2 * (block @ centroids.T),
+            axis=1
+        )
+    return assignments
+
+def train_codebook(
+    sample: np.ndarray,
+    size: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Train k-means centroids of one subspace.
+
+    Args:
+        sample: (n, dsub) float32 training vectors
+        size: Maximum number of centroids, capped by the number of vectors
+        iterations: Maximum number of Lloyd iterations
+        seed: Seed of the random initialization
+
+    Returns:
+        (min(size, n), dsub) float32 matrix of centroids
+    """
+
+    rng = np.random.default_rng(seed)
+    size = min(size, sample.shape[0])
+    centroids = sample[rng.choice(sample.shape[0], size, replace=False)].copy()
+
+    assignments = None
+    for _ in range(iterations):
+        new_assignments = _nearest_centroids(sample, centroids)
+        if assignments is not None and np.array_equal(assignments, new_assignments):
+            break
+        assignments = new_assignments
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=size).astype(np.float32)
+
+        # re-seed empty centroids with random training points
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            sums[empty] = sample[rng.choice(sample.shape[0], empty.size, replace=False)]
+            counts[empty] = 1.0
+        centroids = (sums / counts[:, None]).astype(np.float32)
+    return centroids
+
+class ProductQuantizer(Quantizer):
+    """
+    Product quantizer.
+
+    Vectors are split into m subspaces and each subspace is replaced by the
+    index of its nearest centroid in a 256-entry codebook, so a vector takes
+    m bytes. Inner products with a query are computed by asymmetric distance
+    computation: one lookup table per subspace holds the products of the
+    query with every centroid, and a code is scored by summing m lookups.
+
+    Until enough vectors are stored to train the codebooks, vectors are
+    stored unchanged as float32.
+    """
+
+    mode = "pq"
+
+    def __init__(
+        self,
+        m: int = DEFAULT_M,
+        train_size: int = DEFAULT_TRAIN_SIZE,
+        codebooks: Optional[List[np.ndarray]] = None
+    ):
+        """
+        Initialize the quantizer.
+
+        Args:
+            m: Number of subspaces, i.e. bytes per stored vector
+            train_size: Number of stored vectors used to train the codebooks
+            codebooks: Trained (k, dsub) centroid matrices, one per subspace
+        """
+
+        self.m = m
+        self.train_size = train_size
+        self.codebooks = codebooks
+        self.code_dtype = np.dtype("u1") if self.trained else np.dtype("<f4")
+        if self.trained:
+            widths = [codebook.shape[1] for codebook in codebooks]
+            self._bounds = np.cumsum([0] + widths).tolist()
+            self._centroid_norms = [
+                np.square(codebook).sum(axis=1) for codebook in codebooks
+            ]
+
+    @property
+    def trained(self) -> bool:
+        """
+        Whether the codebooks have been trained.
+        """
+
+        return self.codebooks is not None
+
+    @property
+    def dimension(self) -> Optional[int]:
+        """
+        Dimension of the encoded vectors, None until trained.
+        """
+
+        return self._bounds[-1] if self.trained else None
+
+    @property
+    def training_size(self) -> Optional[int]:
+        """
+        Number of stored vectors required to train the codebooks, None once trained.
+        """
+
+        return None if self.trained else self.train_size
+
+    def train(
+        self,
+        sample: np.ndarray
+    ) -> "ProductQuantizer":
+        """
+        Get a quantizer whose codebooks are trained on a sample of the collection.
+
+        Args:
+            sample: (n, d) float32 training vectors, d >= m
+        """
+
+        sample = np.asarray(sample, dtype=np.float32)
+        if sample.shape[1] < self.m:
+            raise ValueError(
+                f"Product quantization needs at least pq:m={self.m} dimensions, got {sample.shape[1]}"
+            )
+        codebooks = [
+            train_codebook(np.ascontiguousarray(subspace), CODEBOOK_SIZE)
+            for subspace in np.array_split(sample, self.m, axis=1)
+        ]
+        return ProductQuantizer(self.m, self.train_size, codebooks)
+
+    def encode(
+        self,
+        vectors: np.ndarray
+    ) -> np.ndarray:
+        """
+        Encode (n, d) float32 vectors into (n, m) codes.
+        """
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not self.trained:
+            return vectors.astype(self.code_dtype)
+        self._check_dimension(vectors.shape[1])
+
+        codes = np.empty((vectors.shape[0], self.m), dtype=self.code_dtype)
+        for j, codebook in enumerate(self.codebooks):
+            subspace = np.ascontiguousarray(vectors[:, self._bounds[j]:self._bounds[j + 1]])
+            codes[:, j] = _nearest_centroids(subspace, codebook)
+        return codes
+
+    def decode(
+        self,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Decode codes back into (n, d) float32 vectors.
+        """
+
+        if not self.trained:
+            return codes.astype(np.float32, copy=False)
+        return np.concatenate(
+            [codebook[codes[:, j]] for j, codebook in enumerate(self.codebooks)],
+            axis=1
+        )
+
+    def dot(
+        self,
+        queries: np.ndarray,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the inner products between queries and the vectors encoded by codes.
+
+        Args:
+            queries: (q, d) float32 query vectors
+            codes: (n, m) codes produced by encode
+
+        Returns:
+            (q, n) float32 matrix of inner products
+        """
+
+        if not self.trained:
+            return super().dot(queries, codes)
+        self._check_dimension(queries.shape[1])
+
+        dots = np.zeros((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        for j, codebook in enumerate(self.codebooks):
+            # (q, k) products of every query with every centroid of the subspace
+            table = queries[:, self._bounds[j]:self._bounds[j + 1]] @ codebook.T
+            dots += table[:, codes[:, j]]
+        return dots
+
+    def norms(
+        self,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the L2 norms of the vectors encoded by codes.
+
+        Subspaces are disjoint, so the squared norm is the sum of the squared
+        norms of the selected centroids.
+        """
+
+        if not self.trained:
+            return super().norms(codes)
+
+        squares = np.zeros(codes.shape[0], dtype=np.float32)
+        for j, centroid_norms in enumerate(self._centroid_norms):
+            squares += centroid_norms[codes[:, j]]
+        return np.sqrt(squares)
+
+    def to_bytes(self) -> Optional[bytes]:
+        """
+        Serialize the codebooks to persist in the codebook table, None until trained.
+        """
+
+        if not self.trained:
+            return None
+        return serialize_state(
+            {"m": self.m, "train_size": self.train_size},
+            {f"codebook_{j}": codebook for j, codebook in enumerate(self.codebooks)}
+        )
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        **config: Any
+    ) -> "ProductQuantizer":
+        """
+        Restore a quantizer produced by to_bytes.
+
+        Args:
+            data: Serialized codebooks
+            **config: Current collection config; the trained number of
+                subspaces always wins since the stored codes depend on it
+
+        Raises:
+            ValueError: If the codebooks can't be read
+        """
+
+        state, arrays = deserialize_state(data)
+        try:
+            codebooks = [arrays[f"codebook_{j}"] for j in range(state["m"])]
+        except KeyError as exc:
+            raise ValueError("Unreadable product quantization codebooks") from exc
+        return cls(
+            state["m"],
+            config.get("train_size", state["train_size"]),
+            [np.asarray(codebook, dtype=np.float32) for codebook in codebooks]
+        )
+
+    def _check_dimension(
+        self,
+        dimension: int
+    ) -> None:
+        """
+        Validate the dimension of vectors against the codebooks.
+        """
+
+        if dimension != self.dimension:
+            raise ValueError(
+                f"Vector dimensions don't match: {dimension} vs {self.dimension}"
+            )
@@ -0,0 +1,215 @@
+"""
+Module containing the ScalarQuantizer class, which is used to compress stored embeddings to float16 or int8 codes.
+"""
+
+from typing import (
+    Optional,
+    Sequence
+)
+import numpy as np
+from skypydb.database.mixins.vector.quantization.base import (
+    DECODE_BLOCK_ROWS,
+    Quantizer
+)
+
+# little-endian code type of every scalar mode
+CODE_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float16": np.dtype("<f2"),
+    "int8": np.dtype("i1")
+}
+
+# int8 codes are symmetric around the offset so that 0 decodes to it exactly
+_INT8_LEVELS = 127
+
+# fraction of the observed range added on each side when fitting int8 parameters,
+# so that slightly larger values written later don't force a requantization
+RANGE_MARGIN = 0.05
+
+class ScalarQuantizer(Quantizer):
+    """
+    Per-dimension scalar quantizer.
+
+    float32 stores vectors unchanged, float16 halves them and int8 stores
+    round((x - offset) / scale) per dimension, a quarter of the original
+    size. Inner products are computed on the codes without decoding the
+    whole collection at once.
+    """
+
+    def __init__(
+        self,
+        mode: str = "float32",
+        scale: Optional[Sequence[float]] = None,
+        offset: Optional[Sequence[float]] = None
+    ):
+        """
+        Initialize the quantizer.
+
+        Args:
+            mode: One of float32, float16 or int8
+            scale: Per-dimension step of the int8 codes, None until fitted
+            offset: Per-dimension value decoded from code 0, None until fitted
+        """
+
+        if mode not in CODE_DTYPES:
+            raise ValueError(
+                f"Unsupported quantization '{mode}'. Supported quantizations: float32, float16, int8."
+            )
+
+        self.mode = mode
+        self.code_dtype = CODE_DTYPES[mode]
+        self.scale = np.asarray(scale, dtype=np.float32) if scale is not None else None
+        self.offset = np.asarray(offset, dtype=np.float32) if offset is not None else None
+
+    @property
+    def fitted(self) -> bool:
+        """
+        Whether the quantizer can encode vectors.
+        """
+
+        return self.mode != "int8" or self.scale is not None
+
+    def covers(
+        self,
+        vectors: np.ndarray
+    ) -> bool:
+        """
+        Check if vectors can be encoded without clipping.
+        """
+
+        if self.mode != "int8":
+            return True
+        if vectors.shape[1] != self.scale.shape[0]:
+            raise ValueError(
+                f"Vector dimensions don't match: {vectors.shape[1]} vs {self.scale.shape[0]}"
+            )
+        low = self.offset - _INT8_LEVELS * self.scale
+        high = self.offset + _INT8_LEVELS * self.scale
+        return bool(np.all(vectors >= low) and np.all(vectors <= high))
+
+    def fit(
+        self,
+        vectors: np.ndarray
+    ) -> "ScalarQuantizer":
+        """
+        Get a quantizer whose range covers both this one and the given vectors.
+
+        Args:
+            vectors: (n, d) float32 vectors that must be representable
+
+        Returns:
+            A new fitted quantizer, or self if nothing has to change
+        """
+
+        if self.mode != "int8" or (self.fitted and self.covers(vectors)):
+            return self
+
+        low = vectors.min(axis=0)
+        high = vectors.max(axis=0)
+        if self.fitted:
+            low = np.minimum(low, self.offset - _INT8_LEVELS * self.scale)
+            high = np.maximum(high, self.offset + _INT8_LEVELS * self.scale)
+
+        margin = (high - low) * RANGE_MARGIN
+        low = low - margin
+        high = high + margin
+        # constant dimensions still need a non-zero step to be decodable
+        scale = np.where(high > low, (high - low) / (2 * _INT8_LEVELS), 1.0)
+        return ScalarQuantizer("int8", scale=scale, offset=(high + low) / 2)
+
+    def encode(
+        self,
+        vectors: np.ndarray
+    ) -> np.ndarray:
+        """
+        Encode (n, d) float32 vectors into codes.
+        """
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.mode != "int8":
+            return vectors.astype(self.code_dtype)
+        if not self.fitted:
+            raise ValueError("int8 quantizer must be fitted before encoding")
+        if vectors.shape[1] != self.scale.shape[0]:
+            raise ValueError(
+                f"Vector dimensions don't match: {vectors.shape[1]} vs {self.scale.shape[0]}"
+            )
+        codes = np.rint((vectors - self.offset) / self.scale)
+        return np.clip(codes, -_INT8_LEVELS, _INT8_LEVELS).astype(self.code_dtype)
+
+    def decode(
+        self,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Decode codes back into (n, d) float32 vectors.
+        """
+
+        if self.mode != "int8":
+            return codes.astype(np.float32, copy=False)
+        return codes.astype(np.float32) * self.scale + self.offset
+
+    def dot(
+        self,
+        queries: np.ndarray,
+        codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the inner products between queries and the vectors encoded by codes.
+
+        Args:
+            queries: (q, d) float32 query vectors
+            codes: (n, d) codes produced by encode
+
+        Returns:
+            (q, n) float32 matrix of inner products
+        """
+
+        if self.mode == "float32":
+            return super().dot(queries, codes)
+        if queries.shape[1] != codes.shape[1]:
+            raise ValueError(
+                f"Vector dimensions don't match: {queries.shape[1]} vs {codes.shape[1]}"
+            )
+
+        # q . (offset + scale * c) = q . offset + (q * scale) . c
+        if self.mode == "int8":
+            bias = (queries @ self.offset).reshape(-1, 1)
+            queries = queries * self.scale
+        else:
+            bias = 0.0
+
+        dots = np.empty((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        for start in range(0, codes.shape[0], DECODE_BLOCK_ROWS):
+            block = codes[start:start + DECODE_BLOCK_ROWS].astype(np.float32)
+            dots[:, start:start + block.shape[0]] = queries @ block.T
+        return dots + bias
+
+    def to_bytes(self) -> Optional[bytes]:
+        """
+        Serialize the int8 parameters to persist in the codebook table, None if
+        there are none: the little-endian float32 scales followed by the offsets.
+        """
+
+        if self.mode != "int8" or not self.fitted:
+            return None
+        return np.concatenate([self.scale, self.offset]).astype("<f4").tobytes()
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        mode: str = "int8"
+    ) -> "ScalarQuantizer":
+        """
+        Restore a quantizer from the parameters written by to_bytes.
+
+        Raises:
+            ValueError: If the data isn't a pair of equally long float32 vectors
+        """
+
+        values = np.frombuffer(data, dtype="<f4")
+        if values.shape[0] == 0 or values.shape[0] % 2:
+            raise ValueError("Corrupted int8 quantization parameters")
+        dimension = values.shape[0] // 2
+        return cls(mode, scale=values[:dimension], offset=values[dimension:])
@@ -3,23 +3,43 @@ Module containing the SysAdd class, which is used to add items in the collection
 """
 
 import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from typing import (
+    Callable,
     Dict,
     Any,
+    Iterable,
     List,
-    Optional
+    Optional,
+    Tuple,
+    Union
 )
+import numpy as np
 from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.sysquantize import RERANK_COLUMN
+
+# number of rows prepared and written per executemany call
+INSERT_CHUNK_SIZE = 10000
+
+# default number of records embedded and written together by add_stream
+DEFAULT_STREAM_BATCH_SIZE = 256
+
+# default number of batches being embedded concurrently by add_stream
+DEFAULT_STREAM_MAX_INFLIGHT = 4
 
 class SysAdd:
     def add(
         self,
         collection_name: str,
         ids: List[str],
-        embeddings: Optional[List[List[float]]] = None,
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
         documents: Optional[List[str]] = None,
-        metadatas: Optional[List[Dict[str, Any]]] = None
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        defer_commit: bool = False
     ) -> List[str]:
         """
         Add items to a collection.
@@ -27,15 +47,20 @@ class SysAdd:
         Args:
             collection_name: Name of the collection
             ids: List of unique IDs for each item
-            embeddings: Optional list of embedding vectors
+            embeddings: Optional list of embedding vectors, or a (n, d) float32
+                NumPy array, which is stored without conversion
             documents: Optional list of documents (will be embedded if embedding_function is set)
             metadatas: Optional list of metadata dictionaries
+            defer_commit: Leave the transaction open so that several adds are
+                grouped into one commit, made by commit() or the next write
+                that commits
             
         Returns:
             List of IDs of added items
             
         Raises:
-            ValueError: If neither embeddings nor documents are provided
+            ValueError: If neither embeddings nor documents are provided, or
+                the embeddings don't have the dimension of the collection
         """
 
         collection_name = InputValidator.validate_table_name(collection_name)
@@ -75,24 +100,185 @@ class SysAdd:
         
         now = datetime.now().isoformat()
 
-        for i, item_id in enumerate(ids):
-            embedding = embeddings[i]
-            document = documents[i] if documents else None
-            metadata = metadatas[i] if metadatas else None
-
-            cursor.execute(
-                f"""
-                INSERT OR REPLACE INTO [vec_{collection_name}] 
-                (id, document, embedding, metadata, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    item_id,
-                    document,
-                    json.dumps(embedding),
-                    json.dumps(metadata) if metadata else None,
-                    now
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(n_items, -1 if n_items else 0)
+        # rejected before the transaction starts, so deferred writes of the caller are kept
+        pending_metadata = self._check_dimension(collection_name, matrix.shape[1]) if n_items else None
+        # one explicit transaction for the whole call, or a savepoint in the caller's
+        # while commits are deferred, so a failure only undoes this batch
+        began = not self.conn.in_transaction
+        cursor.execute("BEGIN" if began else "SAVEPOINT skypydb_add")
+        try:
+            # the dimension is recorded with the first embeddings written
+            if pending_metadata is not None:
+                self._write_collection_metadata(collection_name, pending_metadata)
+
+            # encoded with the collection's quantization, which may widen its int8 range first
+            blobs = self._encode_embeddings(collection_name, matrix)
+            full_blobs = self._full_precision_blobs(collection_name, matrix)
+            columns = "id, document, embedding, metadata, created_at"
+            if full_blobs is not None:
+                columns += f", {RERANK_COLUMN}"
+            statement = f"""
+                INSERT OR REPLACE INTO [vec_{collection_name}]
+                ({columns})
+                VALUES ({", ".join(["?" for _ in columns.split(", ")])})
+            """
+
+            # rows are prepared and written a chunk at a time to bound memory
+            for start in range(0, n_items, INSERT_CHUNK_SIZE):
+                stop = min(start + INSERT_CHUNK_SIZE, n_items)
+                rows = [
+                    (
+                        ids[i],
+                        documents[i] if documents else None,
+                        blobs[i],
+                        json.dumps(metadatas[i]) if metadatas and metadatas[i] else None,
+                        now
+                    ) + ((full_blobs[i],) if full_blobs is not None else ())
+                    for i in range(start, stop)
+                ]
+                cursor.executemany(statement, rows)
+        except Exception:
+            if began:
+                self.rollback()
+            else:
+                cursor.execute("ROLLBACK TO SAVEPOINT skypydb_add")
+                cursor.execute("RELEASE SAVEPOINT skypydb_add")
+                # the quantizer may have been widened for the discarded rows
+                self._forget_quantizer(collection_name)
+            raise
+        if not began:
+            cursor.execute("RELEASE SAVEPOINT skypydb_add")
+
+        if not defer_commit:
+            self.conn.commit()
+        self._cache_upsert(
+            collection_name,
+            ids=ids,
+            embeddings=matrix,
+            documents=documents,
+            metadatas=metadatas
+        )
+        if not defer_commit:
+            self._sync_loaded_index(collection_name)
+        return ids
+
+    def add_stream(
+        self,
+        collection_name: str,
+        records: Iterable[Dict[str, Any]],
+        batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+        max_inflight: int = DEFAULT_STREAM_MAX_INFLIGHT,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Add a stream of records, embedding batches concurrently with the writes.
+
+        Records are grouped into batches that are embedded on a thread pool
+        while the batches already embedded are written, in order, on the
+        calling thread. At most max_inflight batches are embedded at once and
+        records are only read from the iterable when one of them is written,
+        so memory stays bounded and a slow writer throttles the provider.
+
+        Args:
+            collection_name: Name of the collection
+            records: Iterable of dictionaries with an "id" and an "embedding"
+                or a "document" to embed, plus an optional "metadata"
+            batch_size: Number of records per batch
+            max_inflight: Maximum number of batches being embedded at once
+            progress: Optional callback receiving the statistics after each written batch
+
+        Returns:
+            Statistics with the number of "items" and "batches" written, the
+            "elapsed_seconds", the "items_per_second" throughput, and the time
+            spent embedding ("embed_seconds", summed over workers) and writing
+            ("write_seconds")
+
+        Raises:
+            ValueError: If collection doesn't exist, batch_size or max_inflight
+                isn't positive, or a record has no ID or neither an embedding
+                nor a document to embed
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+        if batch_size <= 0 or max_inflight <= 0:
+            raise ValueError("batch_size and max_inflight must be positive")
+
+        started = time.perf_counter()
+        stats: Dict[str, Any] = {
+            "items": 0,
+            "batches": 0,
+            "elapsed_seconds": 0.0,
+            "items_per_second": 0.0,
+            "embed_seconds": 0.0,
+            "write_seconds": 0.0
+        }
+        records = iter(records)
+
+        with ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="skypydb-embed") as executor:
+            inflight = deque()
+            try:
+                while True:
+                    batch = list(islice(records, batch_size))
+                    if batch:
+                        inflight.append((batch, executor.submit(self._embed_records, batch)))
+                    # backpressure: wait for the oldest batch before reading more records
+                    if inflight and (len(inflight) >= max_inflight or not batch):
+                        done, future = inflight.popleft()
+                        embeddings, embed_seconds = future.result()
+
+                        write_started = time.perf_counter()
+                        self.add(
+                            collection_name,
+                            ids=[record["id"] for record in done],
+                            embeddings=embeddings,
+                            documents=[record.get("document") for record in done],
+                            metadatas=[record.get("metadata") for record in done]
+                        )
+                        stats["write_seconds"] += time.perf_counter() - write_started
+                        stats["embed_seconds"] += embed_seconds
+                        stats["items"] += len(done)
+                        stats["batches"] += 1
+                        stats["elapsed_seconds"] = time.perf_counter() - started
+                        stats["items_per_second"] = stats["items"] / stats["elapsed_seconds"]
+                        if progress is not None:
+                            progress(dict(stats))
+                    elif not batch:
+                        break
+            except BaseException:
+                # don't start embedding batches that will never be written
+                for _, future in inflight:
+                    future.cancel()
+                raise
+        return stats
+
+    def _embed_records(
+        self,
+        records: List[Dict[str, Any]]
+    ) -> Tuple[List[Any], float]:
+        """
+        Embed the documents of the records that don't carry an embedding.
+
+        Returns:
+            Tuple of one embedding per record and the time spent embedding
+        """
+
+        started = time.perf_counter()
+        if any("id" not in record for record in records):
+            raise ValueError("Every record needs an 'id'")
+        embeddings = [record.get("embedding") for record in records]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            documents = [records[i].get("document") for i in missing]
+            if any(document is None for document in documents):
+                raise ValueError("Every record needs an embedding or a document to embed")
+            if self.embedding_function is None:
+                raise ValueError(
+                    "Documents provided but no embedding function set. "
+                    "Either provide embeddings directly or set an embedding_function."
                 )
-            )
-        self.conn.commit()
-        return ids
\ No newline at end of file
+            for i, embedding in zip(missing, self.embedding_function(documents)):
+                embeddings[i] = embedding
+        return embeddings, time.perf_counter() - started
\ No newline at end of file
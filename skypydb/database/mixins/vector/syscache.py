@@ -0,0 +1,480 @@
+"""
+Module containing the SysCache class, which is used to keep collections resident in memory between calls.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union
+)
+import numpy as np
+from skypydb.database.mixins.vector.quantization import (
+    Quantizer,
+    ScalarQuantizer
+)
+from skypydb.database.mixins.vector.utils import (
+    DEFAULT_METRIC,
+    distance_kernel
+)
+
+# default memory budget shared by all cached collections (512 MiB)
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# rough per-item bookkeeping overhead (list slots, dict entry, object headers)
+_ITEM_OVERHEAD_BYTES = 128
+
+class CachedCollection:
+    """
+    Resident copy of a collection.
+
+    Embeddings are kept as one contiguous matrix of the codes stored in
+    SQLite together with the precomputed norms of the vectors they decode
+    to, so scoring needs no per-call decoding or norm computation and
+    results return the stored vectors unchanged.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[Optional[str]],
+        metadatas: Sequence[Optional[Dict[str, Any]]],
+        codes: np.ndarray,
+        quantizer: Optional[Quantizer] = None,
+        metric: str = DEFAULT_METRIC
+    ):
+        """
+        Initialize the cached collection.
+
+        Args:
+            ids: Item IDs in storage order
+            documents: Item documents
+            metadatas: Parsed item metadata
+            codes: (n, d) matrix of stored codes
+            quantizer: Quantizer the codes were produced by, float32 if None
+            metric: Distance metric of the collection
+        """
+
+        self.quantizer = quantizer or ScalarQuantizer()
+        self.metric = metric
+        self._kernel = distance_kernel(metric)
+        self.ids: List[str] = []
+        self.documents: List[Optional[str]] = []
+        self.metadatas: List[Optional[Dict[str, Any]]] = []
+        self.positions: Dict[str, int] = {}
+        self._payload_bytes: List[int] = []
+        self._size = 0
+        self._codes = np.empty((0, 0), dtype=self.quantizer.code_dtype)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._append(ids, documents, metadatas, codes)
+
+    @property
+    def size(self) -> int:
+        """
+        Number of cached items.
+        """
+
+        return self._size
+
+    @property
+    def dimension(self) -> int:
+        """
+        Width of the stored codes, 0 while the collection is empty.
+        """
+
+        return self._codes.shape[1]
+
+    @property
+    def codes(self) -> np.ndarray:
+        """
+        (n, d) matrix of stored codes.
+        """
+
+        return self._codes[:self._size]
+
+    @property
+    def norms(self) -> np.ndarray:
+        """
+        (n,) L2 norms of the embeddings.
+        """
+
+        return self._norms[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Estimated memory used by this entry.
+        """
+
+        return (
+            self._codes.nbytes
+            + self._norms.nbytes
+            + sum(self._payload_bytes)
+            + self._size * _ITEM_OVERHEAD_BYTES
+        )
+
+    def embeddings(
+        self,
+        indices: Any
+    ) -> np.ndarray:
+        """
+        Decode the embeddings of some rows into a float32 matrix.
+        """
+
+        return self.quantizer.decode(self.codes[indices])
+
+    def distances(
+        self,
+        queries: np.ndarray,
+        indices: Optional[Union[np.ndarray, slice]] = None
+    ) -> np.ndarray:
+        """
+        Calculate distances between queries and some rows under the collection's metric, computed on the codes.
+
+        Args:
+            queries: (q, d) float32 query vectors
+            indices: Positions or slice of the rows to score, all rows if None
+
+        Returns:
+            (q, n) matrix of distances, lower is more similar
+        """
+
+        codes = self.codes if indices is None else self.codes[indices]
+        norms = self.norms if indices is None else self.norms[indices]
+        return self._kernel(
+            self.quantizer.dot(queries, codes),
+            np.linalg.norm(queries, axis=1),
+            norms
+        )
+
+    def item(
+        self,
+        index: int
+    ) -> Dict[str, Any]:
+        """
+        Get a row in the item format used by filters.
+        """
+
+        return {
+            "id": self.ids[index],
+            "document": self.documents[index],
+            "metadata": self.metadatas[index]
+        }
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[Optional[str]],
+        metadatas: Sequence[Optional[Dict[str, Any]]],
+        embeddings: np.ndarray
+    ) -> None:
+        """
+        Insert or replace items, mirroring INSERT OR REPLACE.
+
+        Replaced rows move to the end, like their SQLite rowid does.
+        Embeddings are float32 and get encoded like the stored rows.
+        """
+
+        # a repeated ID within one batch keeps its last occurrence
+        last_occurrence = {item_id: index for index, item_id in enumerate(ids)}
+        order = sorted(last_occurrence.values())
+        if len(order) != len(ids):
+            ids = [ids[index] for index in order]
+            documents = [documents[index] for index in order]
+            metadatas = [metadatas[index] for index in order]
+            embeddings = embeddings[order]
+
+        self.remove(ids)
+        self._append(ids, documents, metadatas, self.quantizer.encode(embeddings))
+
+    def update(
+        self,
+        ids: Sequence[str],
+        embeddings: Optional[np.ndarray] = None,
+        documents: Optional[Sequence[Optional[str]]] = None,
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+    ) -> None:
+        """
+        Update existing items in place, mirroring UPDATE.
+        """
+
+        for i, item_id in enumerate(ids):
+            index = self.positions.get(item_id)
+            if index is None:
+                continue
+            if embeddings is not None:
+                self._set_vector(index, embeddings[i])
+            if documents is not None:
+                self.documents[index] = documents[i]
+            if metadatas is not None:
+                self.metadatas[index] = metadatas[i] or None
+            self._payload_bytes[index] = self._estimate_payload(
+                item_id,
+                self.documents[index],
+                self.metadatas[index]
+            )
+
+    def remove(
+        self,
+        ids: Sequence[str]
+    ) -> None:
+        """
+        Remove items, keeping the remaining rows in storage order.
+        """
+
+        drop = [self.positions[item_id] for item_id in ids if item_id in self.positions]
+        if not drop:
+            return
+
+        mask = np.ones(self._size, dtype=bool)
+        mask[drop] = False
+        keep = np.flatnonzero(mask)
+        remaining = keep.shape[0]
+        self._codes[:remaining] = self._codes[keep]
+        self._norms[:remaining] = self._norms[keep]
+        keep = keep.tolist()
+        self.ids = [self.ids[index] for index in keep]
+        self.documents = [self.documents[index] for index in keep]
+        self.metadatas = [self.metadatas[index] for index in keep]
+        self._payload_bytes = [self._payload_bytes[index] for index in keep]
+        self.positions = {item_id: index for index, item_id in enumerate(self.ids)}
+        self._size = remaining
+
+    def _append(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[Optional[str]],
+        metadatas: Sequence[Optional[Dict[str, Any]]],
+        codes: np.ndarray
+    ) -> None:
+        """
+        Append encoded items at the end of the cache, growing the buffers geometrically.
+        """
+
+        count = len(ids)
+        if count == 0:
+            return
+
+        codes = np.asarray(codes, dtype=self.quantizer.code_dtype).reshape(count, -1)
+        if self._size == 0 and self.dimension != codes.shape[1]:
+            self._codes = np.empty((0, codes.shape[1]), dtype=self.quantizer.code_dtype)
+        elif codes.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vector dimensions don't match: {codes.shape[1]} vs {self.dimension}"
+            )
+
+        required = self._size + count
+        if required > self._codes.shape[0]:
+            capacity = max(required, 2 * self._codes.shape[0], 16)
+            buffer = np.empty((capacity, codes.shape[1]), dtype=self.quantizer.code_dtype)
+            buffer[:self._size] = self.codes
+            norms = np.empty(capacity, dtype=np.float32)
+            norms[:self._size] = self.norms
+            self._codes = buffer
+            self._norms = norms
+
+        self._codes[self._size:required] = codes
+        self._norms[self._size:required] = self.quantizer.norms(codes)
+        for i, item_id in enumerate(ids):
+            self.positions[item_id] = self._size + i
+        self.ids.extend(ids)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadata or None for metadata in metadatas)
+        self._payload_bytes.extend(
+            self._estimate_payload(item_id, document, metadata)
+            for item_id, document, metadata in zip(ids, documents, metadatas)
+        )
+        self._size = required
+
+    def _set_vector(
+        self,
+        index: int,
+        embedding: Any
+    ) -> None:
+        """
+        Encode and store one embedding and its norm.
+        """
+
+        codes = self.quantizer.encode(np.asarray(embedding, dtype=np.float32).reshape(1, -1))
+        if codes.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vector dimensions don't match: {codes.shape[1]} vs {self.dimension}"
+            )
+        self._codes[index] = codes[0]
+        self._norms[index] = self.quantizer.norms(codes)[0]
+
+    @staticmethod
+    def _estimate_payload(
+        item_id: str,
+        document: Optional[str],
+        metadata: Optional[Dict[str, Any]]
+    ) -> int:
+        """
+        Estimate the memory held by an item's id, document and metadata.
+        """
+
+        size = len(item_id) + len(document or "")
+        if metadata:
+            size += 2 * len(json.dumps(metadata))
+        return size
+
+class SysCache:
+    def _init_cache(
+        self,
+        max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES
+    ) -> None:
+        """
+        Initialize the resident collection cache.
+
+        Args:
+            max_bytes: Memory budget shared by all cached collections.
+                None means unbounded, 0 disables caching.
+        """
+
+        self._cache_max_bytes = max_bytes
+        self._cache: "OrderedDict[str, CachedCollection]" = OrderedDict()
+        self._cache_lock = threading.RLock()
+
+    def _get_cached_collection(
+        self,
+        collection_name: str
+    ) -> CachedCollection:
+        """
+        Get the resident copy of a collection, loading it from SQLite on a miss.
+
+        The entry is marked as most recently used. When caching is disabled or
+        the collection alone exceeds the budget, a transient copy is returned.
+        """
+
+        with self._cache_lock:
+            entry = self._cache.get(collection_name)
+            if entry is not None:
+                self._cache.move_to_end(collection_name)
+                return entry
+
+            # resolved before the codes are read, since restoring it may re-encode them
+            quantizer = self._quantizer(collection_name)
+            items, codes = self._get_all_items_matrix(collection_name)
+            entry = CachedCollection(
+                ids=[item["id"] for item in items],
+                documents=[item["document"] for item in items],
+                metadatas=[item["metadata"] for item in items],
+                codes=codes,
+                quantizer=quantizer,
+                metric=self._distance_metric(collection_name)
+            )
+            if self._cache_max_bytes is None or entry.nbytes <= self._cache_max_bytes:
+                self._cache[collection_name] = entry
+                self._enforce_cache_budget()
+            return entry
+
+    def _is_collection_cached(
+        self,
+        collection_name: str
+    ) -> bool:
+        """
+        Check if a collection is currently resident in memory.
+        """
+
+        with self._cache_lock:
+            return collection_name in self._cache
+
+    def _cache_upsert(
+        self,
+        collection_name: str,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        documents: Optional[Sequence[Optional[str]]] = None,
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+    ) -> None:
+        """
+        Mirror an insert into the cached copy of a collection, if resident.
+        """
+
+        with self._cache_lock:
+            entry = self._cache.get(collection_name)
+            if entry is None:
+                return
+            try:
+                entry.upsert(
+                    ids=ids,
+                    documents=documents if documents is not None else [None] * len(ids),
+                    metadatas=metadatas if metadatas is not None else [None] * len(ids),
+                    embeddings=np.asarray(embeddings, dtype=np.float32)
+                )
+            except ValueError:
+                # the write reached SQLite, so the stale copy is dropped and reloaded on the next read
+                self._cache.pop(collection_name, None)
+                return
+            self._enforce_cache_budget()
+
+    def _cache_update(
+        self,
+        collection_name: str,
+        ids: Sequence[str],
+        embeddings: Optional[Sequence[Sequence[float]]] = None,
+        documents: Optional[Sequence[Optional[str]]] = None,
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+    ) -> None:
+        """
+        Mirror an update into the cached copy of a collection, if resident.
+        """
+
+        with self._cache_lock:
+            entry = self._cache.get(collection_name)
+            if entry is None:
+                return
+            try:
+                entry.update(
+                    ids=ids,
+                    embeddings=np.asarray(embeddings, dtype=np.float32) if embeddings is not None else None,
+                    documents=documents,
+                    metadatas=metadatas
+                )
+            except ValueError:
+                # the write reached SQLite, so the stale copy is dropped and reloaded on the next read
+                self._cache.pop(collection_name, None)
+                return
+            self._enforce_cache_budget()
+
+    def _cache_remove(
+        self,
+        collection_name: str,
+        ids: Sequence[str]
+    ) -> None:
+        """
+        Mirror a delete into the cached copy of a collection, if resident.
+        """
+
+        with self._cache_lock:
+            entry = self._cache.get(collection_name)
+            if entry is not None:
+                entry.remove(ids)
+
+    def _cache_evict(
+        self,
+        collection_name: str
+    ) -> None:
+        """
+        Drop the cached copy of a collection.
+        """
+
+        with self._cache_lock:
+            self._cache.pop(collection_name, None)
+
+    def _enforce_cache_budget(self) -> None:
+        """
+        Evict least recently used collections until the cache fits its budget.
+        """
+
+        if self._cache_max_bytes is None:
+            return
+        total = sum(entry.nbytes for entry in self._cache.values())
+        while self._cache and total > self._cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            total -= evicted.nbytes
@@ -0,0 +1,550 @@
+"""
+Module containing the SysIndex class, which is used to maintain the approximate search index of a collection.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence
+)
+from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.indexes import (
+    parse_index_config,
+    create_index,
+    load_index
+)
+
+# journal entries replayed since the last snapshot before a new snapshot is written
+INDEX_SNAPSHOT_INTERVAL = 10000
+
+# number of IDs looked up per statement while replaying the journal
+_LOOKUP_BATCH_SIZE = 500
+
+# number of rows assigned per batch while (re)training an index
+_TRAIN_BATCH_SIZE = 10000
+
+@dataclass
+class IndexState:
+    """
+    In-memory index of a collection and its position in the journal.
+    """
+
+    index: Any
+    applied_seq: int
+    pending: int = 0
+
+class SysIndex:
+    def _ensure_index_tables(self) -> None:
+        """
+        Ensure the index snapshot and journal tables exist.
+
+        Every write to an indexed collection is recorded in the journal by
+        triggers, so the index can be brought up to date from its last
+        snapshot no matter which connection wrote the rows.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS _vector_indexes (
+                collection TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                data BLOB NOT NULL,
+                applied_seq INTEGER NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS _vector_index_journal (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                collection TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                op TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS _vector_index_journal_collection
+            ON _vector_index_journal (collection, seq)
+        """)
+        self.conn.commit()
+        self._indexes: Dict[str, IndexState] = {}
+        self._index_configs: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def _install_index_journal(
+        self,
+        collection_name: str
+    ) -> None:
+        """
+        Create the triggers recording writes to an indexed collection.
+
+        The caller is responsible for committing.
+        """
+
+        table_name = f"vec_{collection_name}"
+        cursor = self.conn.cursor()
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS [{table_name}_index_insert]
+            AFTER INSERT ON [{table_name}]
+            BEGIN
+                INSERT INTO _vector_index_journal (collection, item_id, op)
+                VALUES ('{collection_name}', NEW.id, 'upsert');
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS [{table_name}_index_update]
+            AFTER UPDATE OF embedding ON [{table_name}]
+            BEGIN
+                INSERT INTO _vector_index_journal (collection, item_id, op)
+                VALUES ('{collection_name}', NEW.id, 'upsert');
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS [{table_name}_index_delete]
+            AFTER DELETE ON [{table_name}]
+            BEGIN
+                INSERT INTO _vector_index_journal (collection, item_id, op)
+                VALUES ('{collection_name}', OLD.id, 'delete');
+            END
+        """)
+
+    def _ensure_assignment_column(
+        self,
+        collection_name: str,
+        config: Dict[str, Any]
+    ) -> None:
+        """
+        Add the column storing list assignments if the index type needs one.
+
+        The caller is responsible for committing.
+        """
+
+        column = create_index(config).assignment_column
+        if column is None:
+            return
+
+        table_name = f"vec_{collection_name}"
+        cursor = self.conn.cursor()
+
+        cursor.execute(f"PRAGMA table_info([{table_name}])")
+        if column not in {row["name"] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE [{table_name}] ADD COLUMN {column} INTEGER")
+
+    def _index_config(
+        self,
+        collection_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the index configuration of a collection, None if it has no index.
+        """
+
+        if collection_name not in self._index_configs:
+            self._index_configs[collection_name] = parse_index_config(
+                self._collection_metadata(collection_name)
+            )
+        return self._index_configs[collection_name]
+
+    def _get_index(
+        self,
+        collection_name: str
+    ) -> Optional[Any]:
+        """
+        Get the up-to-date index of a collection.
+
+        The index is restored from its snapshot (or built from the table) on
+        first use, then caught up with the journal. Inside a transaction left
+        open by add(..., defer_commit=True), the index writes join it instead
+        of committing the caller's pending writes.
+
+        Returns:
+            The index, or None if the collection has no index configured
+        """
+
+        config = self._index_config(collection_name)
+        if config is None:
+            return None
+
+        # checked before the index writes below open a transaction of their own
+        defer_commit = self.conn.in_transaction
+        with self._cache_lock:
+            state = self._indexes.get(collection_name)
+            if state is None:
+                state = self._load_index(collection_name, config, defer_commit=defer_commit)
+                self._indexes[collection_name] = state
+            self._sync_index(collection_name, state, defer_commit=defer_commit)
+            return state.index
+
+    def _sync_loaded_index(
+        self,
+        collection_name: str
+    ) -> None:
+        """
+        Apply recent writes to the index of a collection if it is loaded in memory.
+        """
+
+        with self._cache_lock:
+            state = self._indexes.get(collection_name)
+            if state is not None:
+                self._sync_index(collection_name, state)
+
+    def rebuild_index(
+        self,
+        collection_name: str
+    ) -> None:
+        """
+        Rebuild the index of a collection from its stored embeddings.
+
+        Args:
+            collection_name: Name of the collection
+
+        Raises:
+            ValueError: If collection doesn't exist or has no index configured
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+
+        config = self._index_config(collection_name)
+        if config is None:
+            raise ValueError(f"Collection '{collection_name}' has no index configured")
+
+        with self._cache_lock:
+            state = self._build_index(collection_name, config)
+            self._indexes[collection_name] = state
+            self._save_index(collection_name, state)
+
+    def _load_index(
+        self,
+        collection_name: str,
+        config: Dict[str, Any],
+        defer_commit: bool = False
+    ) -> IndexState:
+        """
+        Restore the index snapshot of a collection, building it from the
+        table if there is none or it can't be read.
+
+        With defer_commit, the writes are left to the caller's transaction.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "SELECT kind, data, applied_seq FROM _vector_indexes WHERE collection = ?",
+            (collection_name,)
+        )
+        row = cursor.fetchone()
+        index = None
+        if row is not None and row["kind"] == config["kind"]:
+            try:
+                index = load_index(config, row["data"])
+            except ValueError:
+                # rebuilt from the table below
+                pass
+        if index is not None:
+            state = IndexState(index=index, applied_seq=row["applied_seq"])
+            if state.index.assignment_column is not None:
+                self._restore_assignments(collection_name, state, defer_commit=defer_commit)
+            return state
+
+        state = self._build_index(collection_name, config)
+        self._save_index(collection_name, state, defer_commit=defer_commit)
+        return state
+
+    def _restore_assignments(
+        self,
+        collection_name: str,
+        state: IndexState,
+        defer_commit: bool = False
+    ) -> None:
+        """
+        Read back the list assignments stored in the collection table.
+
+        Rows that were never assigned are assigned now, committed unless
+        defer_commit leaves them to the caller's transaction.
+        """
+
+        index = state.index
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            f"SELECT id, {index.assignment_column} FROM [vec_{collection_name}]"
+        )
+        rows = cursor.fetchall()
+        index.restore([row[0] for row in rows], [row[1] for row in rows])
+
+        if index.trained:
+            unassigned = index.unassigned()
+            for start in range(0, len(unassigned), _LOOKUP_BATCH_SIZE):
+                self._reindex_rows(collection_name, state, unassigned[start:start + _LOOKUP_BATCH_SIZE])
+            if unassigned and not defer_commit:
+                self.conn.commit()
+
+    def _build_index(
+        self,
+        collection_name: str,
+        config: Dict[str, Any]
+    ) -> IndexState:
+        """
+        Build a fresh index over every row of a collection.
+        """
+
+        cursor = self.conn.cursor()
+
+        # rows written after this point are replayed from the journal
+        applied_seq = self._journal_head(collection_name)
+
+        cursor.execute(f"SELECT id, embedding FROM [vec_{collection_name}]")
+        rows = cursor.fetchall()
+
+        index = create_index(config)
+        if rows:
+            index.add(
+                [row["id"] for row in rows],
+                self._decode_embeddings(collection_name, [row["embedding"] for row in rows])
+            )
+        state = IndexState(index=index, applied_seq=applied_seq)
+        if index.needs_training():
+            self._train_index(collection_name, state)
+        return state
+
+    def _train_index(
+        self,
+        collection_name: str,
+        state: IndexState
+    ) -> None:
+        """
+        Train the index on a random sample of the collection and reassign every row.
+
+        The caller is responsible for saving the snapshot, which commits the
+        new assignments together with the quantizer they refer to.
+        """
+
+        index = state.index
+        table_name = f"vec_{collection_name}"
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            f"SELECT embedding FROM [{table_name}] ORDER BY RANDOM() LIMIT ?",
+            (index.sample_size,)
+        )
+        index.train(self._decode_embeddings(
+            collection_name,
+            [row["embedding"] for row in cursor.fetchall()]
+        ))
+
+        # walk the table by rowid so the assignments can be written while reading
+        last_rowid = 0
+        while True:
+            cursor.execute(
+                f"""
+                SELECT rowid, id, embedding FROM [{table_name}]
+                WHERE rowid > ? ORDER BY rowid LIMIT ?
+                """,
+                (last_rowid, _TRAIN_BATCH_SIZE)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            ids = [row["id"] for row in rows]
+            index.add(ids, self._decode_embeddings(collection_name, [row["embedding"] for row in rows]))
+            self._persist_assignments(collection_name, index, ids)
+            last_rowid = rows[-1]["rowid"]
+
+    def _reindex_rows(
+        self,
+        collection_name: str,
+        state: IndexState,
+        ids: Sequence[str]
+    ) -> None:
+        """
+        Add rows to the index from their stored embeddings.
+
+        The caller is responsible for committing.
+        """
+
+        cursor = self.conn.cursor()
+
+        placeholders = ", ".join(["?" for _ in ids])
+        cursor.execute(
+            f"SELECT id, embedding FROM [vec_{collection_name}] WHERE id IN ({placeholders})",
+            list(ids)
+        )
+        rows = cursor.fetchall()
+        if rows:
+            row_ids = [row["id"] for row in rows]
+            state.index.add(
+                row_ids,
+                self._decode_embeddings(collection_name, [row["embedding"] for row in rows])
+            )
+            self._persist_assignments(collection_name, state.index, row_ids)
+
+    def _persist_assignments(
+        self,
+        collection_name: str,
+        index: Any,
+        ids: Sequence[str]
+    ) -> None:
+        """
+        Store the list assignments of rows in the collection table.
+
+        The caller is responsible for committing.
+        """
+
+        if index.assignment_column is None:
+            return
+
+        cursor = self.conn.cursor()
+
+        cursor.executemany(
+            f"UPDATE [vec_{collection_name}] SET {index.assignment_column} = ? WHERE id = ?",
+            [(index.assignment(item_id), item_id) for item_id in ids]
+        )
+
+    def _sync_index(
+        self,
+        collection_name: str,
+        state: IndexState,
+        defer_commit: bool = False
+    ) -> None:
+        """
+        Replay the journal entries written since the index was last synced.
+
+        With defer_commit, the assignment and snapshot writes are left to the
+        caller's transaction, so they are committed or rolled back with it.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT seq, item_id, op FROM _vector_index_journal
+            WHERE collection = ? AND seq > ?
+            ORDER BY seq
+            """,
+            (collection_name, state.applied_seq)
+        )
+        entries = cursor.fetchall()
+        if not entries:
+            return
+
+        # only the last operation on each item matters
+        last_ops: Dict[str, str] = {}
+        for entry in entries:
+            last_ops.pop(entry["item_id"], None)
+            last_ops[entry["item_id"]] = entry["op"]
+
+        deleted = [item_id for item_id, op in last_ops.items() if op == "delete"]
+        upserted = [item_id for item_id, op in last_ops.items() if op == "upsert"]
+
+        state.index.remove(deleted)
+        for start in range(0, len(upserted), _LOOKUP_BATCH_SIZE):
+            self._reindex_rows(collection_name, state, upserted[start:start + _LOOKUP_BATCH_SIZE])
+
+        state.applied_seq = entries[-1]["seq"]
+        state.pending += len(entries)
+
+        if state.index.needs_training():
+            self._train_index(collection_name, state)
+            self._save_index(collection_name, state, defer_commit=defer_commit)
+        elif state.index.needs_compaction():
+            state.index.compact()
+            self._save_index(collection_name, state, defer_commit=defer_commit)
+        elif state.pending >= INDEX_SNAPSHOT_INTERVAL:
+            self._save_index(collection_name, state, defer_commit=defer_commit)
+        elif state.index.assignment_column is not None and not defer_commit:
+            self.conn.commit()
+
+    def _save_index(
+        self,
+        collection_name: str,
+        state: IndexState,
+        defer_commit: bool = False
+    ) -> None:
+        """
+        Persist an index snapshot and truncate the journal it covers.
+
+        With defer_commit, the snapshot is left to the caller's transaction.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO _vector_indexes
+            (collection, kind, data, applied_seq, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                collection_name,
+                state.index.kind,
+                state.index.to_bytes(),
+                state.applied_seq,
+                datetime.now().isoformat()
+            )
+        )
+        cursor.execute(
+            "DELETE FROM _vector_index_journal WHERE collection = ? AND seq <= ?",
+            (collection_name, state.applied_seq)
+        )
+        if not defer_commit:
+            self.conn.commit()
+        state.pending = 0
+
+    def _journal_head(
+        self,
+        collection_name: str
+    ) -> int:
+        """
+        Get the sequence number of the latest journal entry of a collection.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "SELECT MAX(seq) FROM _vector_index_journal WHERE collection = ?",
+            (collection_name,)
+        )
+        row = cursor.fetchone()
+        return row[0] if row[0] is not None else 0
+
+    def _drop_index(
+        self,
+        collection_name: str
+    ) -> None:
+        """
+        Forget the index of a collection, in memory and on disk.
+
+        The caller is responsible for committing.
+        """
+
+        with self._cache_lock:
+            self._indexes.pop(collection_name, None)
+            self._index_configs.pop(collection_name, None)
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "DELETE FROM _vector_indexes WHERE collection = ?",
+            (collection_name,)
+        )
+        cursor.execute(
+            "DELETE FROM _vector_index_journal WHERE collection = ?",
+            (collection_name,)
+        )
+
+    def _flush_indexes(self) -> None:
+        """
+        Snapshot every index with journal entries not yet persisted.
+        """
+
+        with self._cache_lock:
+            names: List[str] = [
+                name for name, state in self._indexes.items() if state.pending
+            ]
+            for name in names:
+                self._save_index(name, self._indexes[name])
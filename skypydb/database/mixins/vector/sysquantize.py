@@ -0,0 +1,405 @@
+"""
+Module containing the SysQuantize class, which is used to encode and decode the stored embeddings of a collection.
+"""
+
+import json
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+import numpy as np
+from skypydb.database.mixins.vector.quantization import (
+    parse_quantization_config,
+    create_quantizer
+)
+from skypydb.database.mixins.vector.utils import (
+    deserialize_embeddings,
+    distance_kernel,
+    serialize_embedding,
+    top_k_indices
+)
+
+# candidates scored on the codes per requested result when re-ranking exactly
+RERANK_OVERFETCH = 4
+
+# column holding the full-precision embeddings of collections that re-rank
+RERANK_COLUMN = "embedding_full"
+
+# number of rows re-encoded per batch when the quantizer of a collection changes
+_REQUANTIZE_BATCH_SIZE = 10000
+
+class SysQuantize:
+    def _init_quantizers(self) -> None:
+        """
+        Initialize the per-collection quantizer and configuration caches.
+        """
+
+        self._quantizers: Dict[str, Any] = {}
+        self._quantization_configs: Dict[str, Dict[str, Any]] = {}
+
+    def _ensure_codebook_table(self) -> None:
+        """
+        Ensure the table holding trained quantizer state (e.g. PQ codebooks) exists.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS _vector_codebooks (
+                collection TEXT PRIMARY KEY,
+                mode TEXT NOT NULL,
+                data BLOB NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def _quantization_config(
+        self,
+        collection_name: str
+    ) -> Dict[str, Any]:
+        """
+        Get the quantization configuration of a collection.
+        """
+
+        if collection_name not in self._quantization_configs:
+            self._quantization_configs[collection_name] = parse_quantization_config(
+                self._collection_metadata(collection_name)
+            )
+        return self._quantization_configs[collection_name]
+
+    def _quantizer(
+        self,
+        collection_name: str
+    ) -> Any:
+        """
+        Get the quantizer encoding the embeddings of a collection.
+        """
+
+        quantizer = self._quantizers.get(collection_name)
+        if quantizer is None:
+            config = self._quantization_config(collection_name)
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT data FROM _vector_codebooks WHERE collection = ? AND mode = ?",
+                (collection_name, config["mode"])
+            )
+            row = cursor.fetchone()
+            if row is None:
+                quantizer = create_quantizer(config)
+            else:
+                try:
+                    quantizer = create_quantizer(config, row["data"])
+                except ValueError:
+                    quantizer = self._retrain_quantizer(collection_name, config)
+            self._quantizers[collection_name] = quantizer
+        return quantizer
+
+    def _restore_quantizers(self) -> None:
+        """
+        Load the trained quantizer state of every collection, so that a state
+        that can't be read is retrained before any stored code is decoded.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute("SELECT collection FROM _vector_codebooks")
+        for row in cursor.fetchall():
+            try:
+                self._quantizer(row["collection"])
+            except ValueError:
+                # reported when the collection is used
+                pass
+
+    def _retrain_quantizer(
+        self,
+        collection_name: str,
+        config: Dict[str, Any]
+    ) -> Any:
+        """
+        Train a new quantizer for a collection whose trained state can't be
+        read, from the full-precision copies kept for reranking, and re-encode
+        the stored rows with it.
+
+        Committed unless a transaction is already open, whose writes it joins.
+
+        Raises:
+            ValueError: If the collection keeps no full-precision copies
+        """
+
+        if not config["rerank"]:
+            raise ValueError(
+                f"The quantizer state of collection '{collection_name}' can't be read "
+                "and there are no full-precision embeddings to retrain it from"
+            )
+
+        # checked before the writes below open a transaction of their own
+        defer_commit = self.conn.in_transaction
+        table_name = f"vec_{collection_name}"
+        cursor = self.conn.cursor()
+
+        # the int8 range is fitted on every stored vector, the PQ codebooks on a sample
+        quantizer = create_quantizer(config)
+        last_rowid = 0
+        while True:
+            cursor.execute(
+                f"""
+                SELECT rowid, {RERANK_COLUMN} FROM [{table_name}]
+                WHERE rowid > ? ORDER BY rowid LIMIT ?
+                """,
+                (last_rowid, _REQUANTIZE_BATCH_SIZE)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            quantizer = quantizer.fit(deserialize_embeddings([row[1] for row in rows]))
+            last_rowid = rows[-1][0]
+        if quantizer.training_size is not None:
+            cursor.execute(
+                f"SELECT {RERANK_COLUMN} FROM [{table_name}] ORDER BY RANDOM() LIMIT ?",
+                (quantizer.training_size,)
+            )
+            rows = cursor.fetchall()
+            if rows:
+                quantizer = quantizer.train(deserialize_embeddings([row[0] for row in rows]))
+
+        # the codes are rewritten from the full-precision copies
+        self._requantize_collection(collection_name, quantizer, quantizer)
+        if not defer_commit:
+            self.conn.commit()
+        return quantizer
+
+    def _forget_quantizer(
+        self,
+        collection_name: str
+    ) -> None:
+        """
+        Drop the cached quantizer of a collection so it is reloaded from its metadata.
+        """
+
+        self._quantizers.pop(collection_name, None)
+        self._quantization_configs.pop(collection_name, None)
+
+    def _collection_metadata(
+        self,
+        collection_name: str
+    ) -> Dict[str, Any]:
+        """
+        Read the raw metadata of a collection.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "SELECT metadata FROM _vector_collections WHERE name = ?",
+            (collection_name,)
+        )
+        row = cursor.fetchone()
+        return json.loads(row["metadata"]) if row and row["metadata"] else {}
+
+    def _encode_embeddings(
+        self,
+        collection_name: str,
+        embeddings: np.ndarray
+    ) -> List[bytes]:
+        """
+        Encode embeddings into the BLOBs stored in a collection.
+
+        If the int8 range of the collection doesn't cover the new embeddings,
+        it is widened, and once a product-quantized collection holds enough
+        vectors its codebooks are trained; either way the stored rows are
+        re-encoded. The caller is responsible for committing.
+
+        Args:
+            collection_name: Name of the collection
+            embeddings: (n, d) float32 embeddings about to be written
+
+        Returns:
+            One BLOB per embedding
+        """
+
+        quantizer = self._quantizer(collection_name)
+        if embeddings.shape[0] == 0:
+            return []
+
+        fitted = quantizer.fit(embeddings)
+        if fitted is quantizer and quantizer.training_size is not None:
+            cursor = self.conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM [vec_{collection_name}]")
+            if cursor.fetchone()[0] + embeddings.shape[0] >= quantizer.training_size:
+                fitted = quantizer.train(
+                    self._training_sample(collection_name, quantizer, embeddings)
+                )
+        if fitted is not quantizer:
+            self._requantize_collection(collection_name, quantizer, fitted)
+            quantizer = fitted
+        return quantizer.to_blobs(quantizer.encode(embeddings))
+
+    def _training_sample(
+        self,
+        collection_name: str,
+        quantizer: Any,
+        embeddings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Draw a random sample of stored vectors, completed with the ones about to be written.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            f"SELECT embedding FROM [vec_{collection_name}] ORDER BY RANDOM() LIMIT ?",
+            (quantizer.training_size,)
+        )
+        stored = quantizer.decode(quantizer.from_blobs([row[0] for row in cursor.fetchall()]))
+        missing = quantizer.training_size - stored.shape[0]
+        if stored.shape[0] == 0:
+            return embeddings[:missing]
+        return np.concatenate([stored, embeddings[:missing]])
+
+    def _decode_embeddings(
+        self,
+        collection_name: str,
+        blobs: Sequence[bytes]
+    ) -> np.ndarray:
+        """
+        Decode stored BLOBs into a (n, d) float32 matrix.
+        """
+
+        quantizer = self._quantizer(collection_name)
+        return quantizer.decode(quantizer.from_blobs(blobs))
+
+    def _requantize_collection(
+        self,
+        collection_name: str,
+        old: Any,
+        new: Any
+    ) -> None:
+        """
+        Re-encode every stored row with a new quantizer and persist its parameters.
+
+        The caller is responsible for committing.
+        """
+
+        table_name = f"vec_{collection_name}"
+        rerank = self._quantization_config(collection_name)["rerank"]
+        source = RERANK_COLUMN if rerank else "embedding"
+        cursor = self.conn.cursor()
+
+        if old.fitted:
+            # walk the table by rowid so the codes can be rewritten while reading
+            last_rowid = 0
+            while True:
+                cursor.execute(
+                    f"""
+                    SELECT rowid, {source} FROM [{table_name}]
+                    WHERE rowid > ? ORDER BY rowid LIMIT ?
+                    """,
+                    (last_rowid, _REQUANTIZE_BATCH_SIZE)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                blobs = [row[1] for row in rows]
+                vectors = (
+                    deserialize_embeddings(blobs) if rerank
+                    else old.decode(old.from_blobs(blobs))
+                )
+                cursor.executemany(
+                    f"UPDATE [{table_name}] SET embedding = ? WHERE rowid = ?",
+                    zip(new.to_blobs(new.encode(vectors)), [row[0] for row in rows])
+                )
+                last_rowid = rows[-1][0]
+
+        data = new.to_bytes()
+        if data is not None:
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO _vector_codebooks (collection, mode, data, updated_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (collection_name, new.mode, data, datetime.now().isoformat())
+            )
+
+        # reload from the database on next use, so a rollback can't leave stale parameters behind
+        self._forget_quantizer(collection_name)
+        self._cache_evict(collection_name)
+
+    def _drop_codebooks(
+        self,
+        collection_name: str
+    ) -> None:
+        """
+        Remove the trained quantizer state of a collection.
+
+        The caller is responsible for committing.
+        """
+
+        cursor = self.conn.cursor()
+
+        cursor.execute(
+            "DELETE FROM _vector_codebooks WHERE collection = ?",
+            (collection_name,)
+        )
+
+    def _full_precision_blobs(
+        self,
+        collection_name: str,
+        embeddings: np.ndarray
+    ) -> Optional[List[bytes]]:
+        """
+        Get the full-precision BLOBs to store next to the codes, None if the collection doesn't re-rank.
+        """
+
+        if not self._quantization_config(collection_name)["rerank"]:
+            return None
+        return [serialize_embedding(embedding) for embedding in embeddings]
+
+    def _rerank(
+        self,
+        collection_name: str,
+        query: np.ndarray,
+        item_ids: Sequence[str],
+        n_results: int
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Re-score candidates of one query with their full-precision embeddings.
+
+        Args:
+            collection_name: Name of the collection
+            query: (d,) float32 query vector
+            item_ids: IDs of the candidates selected on the codes
+            n_results: Number of results to keep
+
+        Returns:
+            Tuple of the kept IDs and their exact distances, closest first
+        """
+
+        if not item_ids:
+            return [], np.empty(0, dtype=np.float32)
+
+        cursor = self.conn.cursor()
+
+        placeholders = ", ".join(["?" for _ in item_ids])
+        cursor.execute(
+            f"SELECT id, {RERANK_COLUMN} FROM [vec_{collection_name}] WHERE id IN ({placeholders})",
+            list(item_ids)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return [], np.empty(0, dtype=np.float32)
+
+        vectors = deserialize_embeddings([row[1] for row in rows])
+        queries = query.reshape(1, -1)
+        distances = distance_kernel(self._distance_metric(collection_name))(
+            queries @ vectors.T,
+            np.linalg.norm(queries, axis=1),
+            np.linalg.norm(vectors, axis=1)
+        )[0]
+        top = top_k_indices(distances, n_results)
+        return [rows[index]["id"] for index in top], distances[top]
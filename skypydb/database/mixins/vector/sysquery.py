@@ -6,33 +6,88 @@ from typing import (
     Dict,
     List,
     Optional,
-    Any
+    Tuple,
+    Any,
+    Union
 )
+import numpy as np
 from skypydb.security.validation import InputValidator
-from skypydb.database.mixins.vector.utils import cosine_similarity
+from skypydb.database.mixins.vector.syscache import CachedCollection
+from skypydb.database.mixins.vector.sysquantize import RERANK_OVERFETCH
+from skypydb.database.mixins.vector.collections.sysdimension import parse_dimension
+
+# filtered searches score the matching rows exactly when at most this many match
+PREFILTER_MAX_ROWS = 10000
+
+# or when at most this fraction of the collection matches
+PREFILTER_SELECTIVITY = 0.05
+
+# results fetched from the index per result kept, scaled by the inverse of the selectivity
+POSTFILTER_OVERFETCH = 2.0
+
+# default memory budget of the (queries, rows) distance tiles of an exact search (64 MiB)
+DEFAULT_SEARCH_TILE_BYTES = 64 * 1024 * 1024
+
+# bytes held per scored pair: the float32 distance and the inner product it is computed from
+_SCORE_BYTES = 8
+
+def _top_k_rows(
+    distances: np.ndarray,
+    positions: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the k smallest distances of every row of a tile, unsorted.
+
+    Args:
+        distances: (q, n) matrix of distances
+        positions: (q, n) cached positions of the scored rows
+        k: Number of distances to keep per row, at most n
+
+    Returns:
+        Tuple of the (q, k) kept distances and their positions
+    """
+
+    if k < distances.shape[1]:
+        keep = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        distances = np.take_along_axis(distances, keep, axis=1)
+        positions = np.take_along_axis(positions, keep, axis=1)
+    return distances, positions
 
 class SysQuery:
     def query(
         self,
         collection_name: str,
-        query_embeddings: Optional[List[List[float]]] = None,
+        query_embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
         query_texts: Optional[List[str]] = None,
         n_results: int = 10,
         where: Optional[Dict[str, Any]] = None,
         where_document: Optional[Dict[str, str]] = None,
-        include: Optional[List[str]] = None
+        include: Optional[List[str]] = None,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        rerank: Optional[bool] = None
     ) -> Dict[str, List[List[Any]]]:
         """
         Query a collection for similar items.
         
         Args:
             collection_name: Name of the collection
-            query_embeddings: Optional list of query embeddings
+            query_embeddings: Optional list of query embeddings, or a (q, d)
+                float32 NumPy array, which is searched without conversion. Many
+                queries are searched together, filters are resolved once and
+                exact searches score them in tiles bounded by search_tile_bytes
             query_texts: Optional list of query texts (will be embedded)
             n_results: Number of results to return per query
             where: Optional metadata filter
             where_document: Optional document filter
             include: Optional list of fields to include
+            ef_search: Optional HNSW candidate list size for this query, higher
+                values improve recall at the cost of latency
+            nprobe: Optional number of IVF lists scanned for this query, higher
+                values improve recall at the cost of latency
+            rerank: Whether to re-score the best candidates of a quantized collection
+                with their full-precision embeddings, defaults to quantization:rerank
             
         Returns:
             Dictionary with nested lists of results for each query
@@ -54,9 +109,6 @@ class SysQuery:
 
         include = include or ["embeddings", "documents", "metadatas", "distances"]
 
-        # get all items from collection
-        all_items = self._get_all_items(collection_name)
-
         results = {
             "ids": [],
             "embeddings": [] if "embeddings" in include else None,
@@ -65,47 +117,246 @@ class SysQuery:
             "distances": [] if "distances" in include else None,
         }
 
-        for query_embedding in query_embeddings:
-            # calculate similarities and filter
-            scored_items = []
-
-            for item in all_items:
-                # apply filters
-                if not self._matches_filters(item, where, where_document):
-                    continue
-
-                # calculate cosine similarity
-                similarity = cosine_similarity(query_embedding, item["embedding"])
-                # convert to distance (1 - similarity, so lower is better)
-                distance = 1.0 - similarity
-
-                scored_items.append((item, distance))
-
-            # sort by distance (ascending) and take top n
-            scored_items.sort(key=lambda x: x[1])
-            top_items = scored_items[:n_results]
-
-            # extract results for this query
-            query_ids = []
-            query_embeddings_result = []
-            query_documents = []
-            query_metadatas = []
-            query_distances = []
-
-            for item, distance in top_items:
-                query_ids.append(item["id"])
-                query_embeddings_result.append(item["embedding"])
-                query_documents.append(item["document"])
-                query_metadatas.append(item["metadata"])
-                query_distances.append(distance)
-
-            results["ids"].append(query_ids)
-            if results["embeddings"] is not None:
-                results["embeddings"].append(query_embeddings_result)
-            if results["documents"] is not None:
-                results["documents"].append(query_documents)
-            if results["metadatas"] is not None:
-                results["metadatas"].append(query_metadatas)
-            if results["distances"] is not None:
-                results["distances"].append(query_distances)
-        return results
\ No newline at end of file
+        # no queries, no results
+        if len(query_embeddings) == 0:
+            return results
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        dimension = parse_dimension(self._collection_metadata(collection_name))
+        if dimension is not None and len(queries) and queries.shape[1] != dimension:
+            raise ValueError(
+                f"Query embedding dimension {queries.shape[1]} doesn't match the dimension "
+                f"{dimension} of collection '{collection_name}'"
+            )
+
+        quantization = self._quantization_config(collection_name)
+        if rerank is None:
+            rerank = quantization["rerank"]
+        elif rerank and not quantization["rerank"]:
+            raise ValueError(
+                f"Collection '{collection_name}' doesn't store full-precision embeddings, "
+                "create it with {'quantization:rerank': True} to re-rank results"
+            )
+        # candidates selected on the codes before exact re-ranking
+        n_candidates = n_results * RERANK_OVERFETCH if rerank else n_results
+
+        with self._cache_lock:
+            # resident copy of the collection with its code matrix and norms
+            cached = self._get_cached_collection(collection_name)
+            index = self._get_index(collection_name)
+
+            # filters don't depend on the query, so they are resolved once for all queries
+            mask = None
+            if where is not None or where_document is not None:
+                mask = self._filter_bitmap(collection_name, cached, where, where_document)
+
+            if index is not None and (mask is None or self._use_postfilter(mask)):
+                # only forward the search parameters understood by this index type
+                params = {
+                    key: value
+                    for key, value in (("ef_search", ef_search), ("nprobe", nprobe))
+                    if value is not None and key in index.search_params
+                }
+                if mask is None:
+                    neighbours = index.search(queries, n_candidates, cached, **params)
+                else:
+                    neighbours = self._postfiltered_search(
+                        index,
+                        queries,
+                        n_candidates,
+                        cached,
+                        mask,
+                        params
+                    )
+            else:
+                neighbours = self._exact_search(
+                    queries,
+                    n_candidates,
+                    cached,
+                    np.flatnonzero(mask) if mask is not None else None
+                )
+
+            for query, (neighbour_ids, neighbour_distances) in zip(queries, neighbours):
+                if rerank:
+                    neighbour_ids, neighbour_distances = self._rerank(
+                        collection_name,
+                        query,
+                        neighbour_ids,
+                        n_results
+                    )
+                self._append_query_result(
+                    results,
+                    cached,
+                    np.asarray(
+                        [cached.positions[item_id] for item_id in neighbour_ids],
+                        dtype=np.intp
+                    ),
+                    neighbour_distances
+                )
+        return results
+
+    def _filter_bitmap(
+        self,
+        collection_name: str,
+        cached: CachedCollection,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, str]]
+    ) -> np.ndarray:
+        """
+        Resolve filters into a boolean mask over the cached rows, in SQL when they can be compiled.
+        """
+
+        mask = np.zeros(cached.size, dtype=bool)
+        matching = self._select_matching_ids(collection_name, where, where_document)
+        if matching is not None:
+            positions = cached.positions
+            mask[[positions[item_id] for item_id in matching if item_id in positions]] = True
+        else:
+            for index in range(cached.size):
+                mask[index] = self._matches_filters(cached.item(index), where, where_document)
+        return mask
+
+    def _use_postfilter(
+        self,
+        mask: np.ndarray
+    ) -> bool:
+        """
+        Choose between searching the index and dropping non-matching results
+        (post-filtering) or scoring the matching rows exactly (pre-filtering).
+
+        Scoring the matches is cheap when few rows match, and the index would
+        have to over-fetch a lot to find enough of them.
+        """
+
+        matched = int(np.count_nonzero(mask))
+        return matched > PREFILTER_MAX_ROWS and matched > PREFILTER_SELECTIVITY * mask.shape[0]
+
+    def _postfiltered_search(
+        self,
+        index: Any,
+        queries: np.ndarray,
+        k: int,
+        cached: CachedCollection,
+        mask: np.ndarray,
+        params: Dict[str, Any]
+    ) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Search the index with an over-fetch sized by the filter selectivity,
+        then keep the matching results.
+
+        Queries that still get fewer than k matching results are answered by
+        scoring the matching rows exactly.
+        """
+
+        matched = int(np.count_nonzero(mask))
+        selectivity = matched / mask.shape[0]
+        fetch = min(mask.shape[0], int(np.ceil(k * POSTFILTER_OVERFETCH / selectivity)))
+
+        neighbours = []
+        missing = []
+        results = index.search(queries, fetch, cached, **params)
+        for query_index, (item_ids, distances) in enumerate(results):
+            keep = [
+                position for position, item_id in enumerate(item_ids)
+                if mask[cached.positions[item_id]]
+            ][:k]
+            neighbours.append(([item_ids[position] for position in keep], np.asarray(distances)[keep]))
+            if len(keep) < min(k, matched):
+                missing.append(query_index)
+
+        if missing:
+            exact = self._exact_search(queries[missing], k, cached, np.flatnonzero(mask))
+            for query_index, result in zip(missing, exact):
+                neighbours[query_index] = result
+        return neighbours
+
+    def _exact_search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        cached: CachedCollection,
+        indices: Optional[np.ndarray] = None
+    ) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Score every query against the given cached rows in batched tiles.
+
+        The candidate rows are scanned once per block of queries, and each
+        (queries, rows) tile of distances fits in the search memory budget.
+        The k best rows of every query are kept across the row tiles of its
+        block, so large query batches and collections never materialize
+        the full distance matrix.
+
+        Args:
+            queries: (q, d) float32 query vectors
+            k: Number of neighbours per query
+            cached: Resident copy of the collection
+            indices: Positions of the candidate rows, None for all rows
+
+        Returns:
+            One (ids, distances) pair per query, closest first
+        """
+
+        # every row is a candidate: tiles are slices of the code matrix, which aren't gathered
+        full_scan = indices is None or indices.shape[0] == cached.size
+        n_rows = cached.size if full_scan else indices.shape[0]
+        k = min(k, n_rows)
+        if k <= 0:
+            return [([], np.empty(0, dtype=np.float32)) for _ in range(queries.shape[0])]
+
+        # a tile holds whole rows of the collection for as many queries as fit in the budget,
+        # or a slice of the rows for one query when a single row of distances doesn't fit
+        budget = max(self._search_tile_bytes // _SCORE_BYTES, 1)
+        row_tile = max(min(n_rows, budget), k)
+        query_tile = max(budget // row_tile, 1)
+
+        neighbours = []
+        for query_start in range(0, queries.shape[0], query_tile):
+            block = queries[query_start:query_start + query_tile]
+            best_distances = best_positions = None
+            for row_start in range(0, n_rows, row_tile):
+                row_stop = min(row_start + row_tile, n_rows)
+                if full_scan:
+                    rows = slice(row_start, row_stop)
+                    positions = np.arange(row_start, row_stop)
+                else:
+                    rows = positions = indices[row_start:row_stop]
+                distances = cached.distances(block, rows)
+                tile_positions = np.broadcast_to(positions, distances.shape)
+                if best_distances is not None:
+                    # merge with the best rows of the previous tiles
+                    distances = np.concatenate([best_distances, distances], axis=1)
+                    tile_positions = np.concatenate([best_positions, tile_positions], axis=1)
+                best_distances, best_positions = _top_k_rows(distances, tile_positions, k)
+
+            order = np.argsort(best_distances, axis=1, kind="stable")
+            best_distances = np.take_along_axis(best_distances, order, axis=1)
+            best_positions = np.take_along_axis(best_positions, order, axis=1)
+            for query_distances, query_positions in zip(best_distances, best_positions):
+                neighbours.append((
+                    [cached.ids[index] for index in query_positions],
+                    query_distances
+                ))
+        return neighbours
+
+    def _append_query_result(
+        self,
+        results: Dict[str, List[List[Any]]],
+        cached: CachedCollection,
+        indices: np.ndarray,
+        distances: np.ndarray
+    ) -> None:
+        """
+        Append the results of one query, given the cached rows of its neighbours.
+        """
+
+        results["ids"].append([cached.ids[index] for index in indices])
+        if results["embeddings"] is not None:
+            results["embeddings"].append(cached.embeddings(indices).tolist())
+        if results["documents"] is not None:
+            results["documents"].append([cached.documents[index] for index in indices])
+        if results["metadatas"] is not None:
+            results["metadatas"].append([cached.metadatas[index] for index in indices])
+        if results["distances"] is not None:
+            results["distances"].append(np.asarray(distances).tolist())
\ No newline at end of file
@@ -7,16 +7,19 @@ from typing import (
     Dict,
     List,
     Optional,
-    Any
+    Any,
+    Union
 )
+import numpy as np
 from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.sysquantize import RERANK_COLUMN
 
 class SysUpdate:
     def update(
         self,
         collection_name: str,
         ids: List[str],
-        embeddings: Optional[List[List[float]]] = None,
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
         documents: Optional[List[str]] = None,
         metadatas: Optional[List[Dict[str, Any]]] = None
     ) -> None:
@@ -26,7 +29,7 @@ class SysUpdate:
         Args:
             collection_name: Name of the collection
             ids: List of IDs to update
-            embeddings: Optional new embeddings
+            embeddings: Optional new embeddings, as a list or a (n, d) NumPy array
             documents: Optional new documents (will be embedded)
             metadatas: Optional new metadata
         """
@@ -43,12 +46,29 @@ class SysUpdate:
 
         cursor = self.conn.cursor()
 
+        # encoded with the collection's quantization, which may widen its int8 range first
+        matrix = blobs = full_blobs = None
+        if embeddings is not None:
+            matrix = np.asarray(embeddings, dtype=np.float32).reshape(
+                len(embeddings),
+                -1 if len(embeddings) else 0
+            )
+            if len(embeddings):
+                pending_metadata = self._check_dimension(collection_name, matrix.shape[1])
+                if pending_metadata is not None:
+                    self._write_collection_metadata(collection_name, pending_metadata)
+            blobs = self._encode_embeddings(collection_name, matrix)
+            full_blobs = self._full_precision_blobs(collection_name, matrix)
+
         for i, item_id in enumerate(ids):
             updates = []
             params = []
-            if embeddings is not None:
+            if blobs is not None:
                 updates.append("embedding = ?")
-                params.append(json.dumps(embeddings[i]))
+                params.append(blobs[i])
+            if full_blobs is not None:
+                updates.append(f"{RERANK_COLUMN} = ?")
+                params.append(full_blobs[i])
             if documents is not None:
                 updates.append("document = ?")
                 params.append(documents[i])
@@ -61,4 +81,12 @@ class SysUpdate:
                     f"UPDATE [vec_{collection_name}] SET {', '.join(updates)} WHERE id = ?",
                     params
                 )
-        self.conn.commit()
\ No newline at end of file
+        self.conn.commit()
+        self._cache_update(
+            collection_name,
+            ids=ids,
+            embeddings=matrix,
+            documents=documents,
+            metadatas=metadatas
+        )
+        self._sync_loaded_index(collection_name)
\ No newline at end of file
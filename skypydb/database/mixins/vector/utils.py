@@ -1,9 +1,322 @@
 """
-Module containing the base definition, which are used to calculate cosine and euclidean vectors.
+Module containing the base definition, which are used to calculate cosine, euclidean and inner product distances between vectors.
 """
 
+import io
+import json
 import math
-from typing import List
+import sys
+import zipfile
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+import numpy as np
+
+# on-disk storage format versions for the embedding column of a collection
+#   1: JSON encoded text (legacy)
+#   2: packed little-endian float32 BLOB
+LEGACY_STORAGE_VERSION = 1
+EMBEDDING_STORAGE_VERSION = 2
+
+# collection metadata key selecting the distance metric
+METRIC_KEY = "metric"
+
+# supported distance metrics, the first one is the default
+METRICS = ("cosine", "l2", "ip")
+DEFAULT_METRIC = "cosine"
+
+def parse_metric(
+    metadata: Optional[Dict[str, Any]]
+) -> str:
+    """
+    Extract the distance metric from collection metadata.
+
+    Args:
+        metadata: Collection metadata, e.g. {"metric": "l2"}
+
+    Returns:
+        The metric, DEFAULT_METRIC if it isn't declared
+
+    Raises:
+        ValueError: If the metric isn't supported
+    """
+
+    metric = (metadata or {}).get(METRIC_KEY, DEFAULT_METRIC)
+    if metric not in METRICS:
+        raise ValueError(
+            f"Unsupported metric {metric!r}. Supported metrics: {', '.join(METRICS)}."
+        )
+    return metric
+
+def serialize_embedding(embedding: Sequence[float]) -> bytes:
+    """
+    Pack an embedding vector into a little-endian float32 BLOB.
+
+    Args:
+        embedding: Embedding vector
+
+    Returns:
+        Packed bytes, 4 bytes per dimension
+    """
+
+    values = array("f", embedding)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+def deserialize_embedding(blob: bytes) -> List[float]:
+    """
+    Unpack a little-endian float32 BLOB into an embedding vector.
+
+    Args:
+        blob: Packed bytes produced by serialize_embedding
+
+    Returns:
+        Embedding vector
+    """
+
+    values = array("f")
+    values.frombytes(blob)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+def deserialize_embeddings(blobs: Sequence[bytes]) -> np.ndarray:
+    """
+    Unpack float32 BLOBs into one contiguous (n, d) matrix.
+
+    Args:
+        blobs: Packed embeddings produced by serialize_embedding
+
+    Returns:
+        Float32 matrix with one row per embedding
+
+    Raises:
+        ValueError: If the embeddings don't all have the same dimension
+    """
+
+    if not blobs:
+        return np.empty((0, 0), dtype=np.float32)
+
+    size = len(blobs[0])
+    if any(len(blob) != size for blob in blobs):
+        raise ValueError("Vector dimensions don't match across the collection")
+
+    matrix = np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), size // 4)
+    return matrix.astype(np.float32, copy=False)
+
+def serialize_state(
+    state: Dict[str, Any],
+    arrays: Optional[Dict[str, np.ndarray]] = None
+) -> bytes:
+    """
+    Pack the state of an index or quantizer into an .npz archive.
+
+    Loading the archive back never runs code, so a crafted database file
+    can't execute anything when it is opened.
+
+    Args:
+        state: JSON-serializable parameters
+        arrays: Numeric arrays, stored in the .npy format
+
+    Returns:
+        Archive bytes
+    """
+
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        state=np.frombuffer(json.dumps(state).encode("utf-8"), dtype=np.uint8),
+        **(arrays or {})
+    )
+    return buffer.getvalue()
+
+def deserialize_state(data: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Unpack an archive written by serialize_state.
+
+    Args:
+        data: Archive bytes
+
+    Returns:
+        Tuple of the parameters and the arrays by name
+
+    Raises:
+        ValueError: If the data isn't an archive written by serialize_state
+    """
+
+    try:
+        with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+            arrays = {name: archive[name] for name in archive.files}
+        state = json.loads(arrays.pop("state").tobytes().decode("utf-8"))
+    except (KeyError, ValueError, OSError, EOFError, zipfile.BadZipFile) as exc:
+        raise ValueError("Unreadable serialized state") from exc
+    return state, arrays
+
+def cosine_distances(
+    queries: np.ndarray,
+    matrix: np.ndarray,
+    norms: np.ndarray
+) -> np.ndarray:
+    """
+    Calculate cosine distances between every query and every row of a matrix.
+
+    Args:
+        queries: (q, d) matrix of query vectors
+        matrix: (n, d) matrix of stored vectors
+        norms: (n,) precomputed L2 norms of the rows of matrix
+
+    Returns:
+        (q, n) matrix of distances (1 - cosine similarity, lower is more similar)
+    """
+
+    if queries.shape[1] != matrix.shape[1]:
+        raise ValueError(
+            f"Vector dimensions don't match: {queries.shape[1]} vs {matrix.shape[1]}"
+        )
+
+    return cosine_distances_from_dots(queries @ matrix.T, np.linalg.norm(queries, axis=1), norms)
+
+def cosine_distances_from_dots(
+    dots: np.ndarray,
+    query_norms: np.ndarray,
+    norms: np.ndarray
+) -> np.ndarray:
+    """
+    Turn inner products into cosine distances.
+
+    Args:
+        dots: (q, n) matrix of inner products
+        query_norms: (q,) L2 norms of the queries
+        norms: (n,) L2 norms of the stored vectors
+
+    Returns:
+        (q, n) matrix of distances (1 - cosine similarity, lower is more similar)
+    """
+
+    denominator = np.outer(query_norms, norms)
+    # zero vectors have no direction, so they get a similarity of 0 like cosine_similarity
+    similarities = np.divide(
+        dots,
+        denominator,
+        out=np.zeros(denominator.shape, dtype=np.float32),
+        where=denominator > 0
+    )
+    # rounding can push the similarity of parallel vectors slightly above one
+    np.clip(similarities, -1.0, 1.0, out=similarities)
+    return 1.0 - similarities
+
+def inner_product_distances_from_dots(
+    dots: np.ndarray,
+    query_norms: Optional[np.ndarray],
+    norms: Optional[np.ndarray]
+) -> np.ndarray:
+    """
+    Turn inner products into inner product distances.
+
+    Args:
+        dots: (q, n) matrix of inner products
+        query_norms: Unused, the distance only depends on the inner products
+        norms: Unused, the distance only depends on the inner products
+
+    Returns:
+        (q, n) matrix of distances (1 - inner product, lower is more similar)
+    """
+
+    return 1.0 - dots
+
+def l2_distances_from_dots(
+    dots: np.ndarray,
+    query_norms: np.ndarray,
+    norms: np.ndarray
+) -> np.ndarray:
+    """
+    Turn inner products into squared Euclidean distances.
+
+    Args:
+        dots: (q, n) matrix of inner products
+        query_norms: (q,) L2 norms of the queries
+        norms: (n,) L2 norms of the stored vectors
+
+    Returns:
+        (q, n) matrix of squared Euclidean distances (lower is more similar)
+    """
+
+    distances = np.square(norms)[np.newaxis, :] - 2.0 * dots
+    distances += np.square(query_norms)[:, np.newaxis]
+    # rounding can push the distance of identical vectors slightly below zero
+    return np.maximum(distances, 0.0, out=distances)
+
+def distance_kernel(
+    metric: str
+) -> Callable[[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]], np.ndarray]:
+    """
+    Select the function turning inner products into distances for a metric.
+
+    Args:
+        metric: One of METRICS
+
+    Returns:
+        Function of the (q, n) inner products, the (q,) query norms and the
+        (n,) stored norms returning the (q, n) distances
+    """
+
+    if metric == "l2":
+        return l2_distances_from_dots
+    if metric == "ip":
+        return inner_product_distances_from_dots
+    return cosine_distances_from_dots
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale the rows of a matrix to unit L2 norm, leaving zero rows untouched.
+
+    Args:
+        vectors: (n, d) float32 matrix
+
+    Returns:
+        New (n, d) float32 matrix of unit rows
+    """
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(
+        vectors,
+        norms,
+        out=np.zeros(vectors.shape, dtype=np.float32),
+        where=norms > 0
+    )
+
+def top_k_indices(
+    distances: np.ndarray,
+    k: int
+) -> np.ndarray:
+    """
+    Select the indices of the k smallest distances, sorted ascending.
+
+    Args:
+        distances: (n,) vector of distances
+        k: Number of indices to keep
+
+    Returns:
+        Indices of the k nearest rows, closest first
+    """
+
+    n = distances.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        candidates = np.argpartition(distances, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(distances[candidates], kind="stable")]
 
 def cosine_similarity(
     vec1: List[float],
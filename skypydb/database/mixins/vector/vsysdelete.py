@@ -37,25 +37,28 @@ class VSysDelete:
 
         cursor = self.conn.cursor()
         if ids is not None:
-            placeholders = ", ".join(["?" for _ in ids])
-            cursor.execute(
-                f"DELETE FROM [vec_{collection_name}] WHERE id IN ({placeholders})",
-                list(ids)
-            )
+            ids_to_delete = list(ids)
         else:
-            # get all items and filter
-            items = self._get_all_items(collection_name)
-            ids_to_delete = []
+            # select the matching rows in SQL when the filter can be compiled
+            ids_to_delete = self._select_matching_ids(collection_name, where, where_document)
+        if ids_to_delete is None:
+            # otherwise resolve the filter against the resident copy of the collection
+            with self._cache_lock:
+                cached = self._get_cached_collection(collection_name)
+                ids_to_delete = [
+                    cached.ids[index] for index in range(cached.size)
+                    if self._matches_filters(cached.item(index), where, where_document)
+                ]
+        if not ids_to_delete:
+            return 0
 
-            for item in items:
-                if self._matches_filters(item, where, where_document):
-                    ids_to_delete.append(item["id"])
-            if ids_to_delete:
-                placeholders = ", ".join(["?" for _ in ids_to_delete])
-                cursor.execute(
-                    f"DELETE FROM [vec_{collection_name}] WHERE id IN ({placeholders})",
-                    ids_to_delete
-                )
+        placeholders = ", ".join(["?" for _ in ids_to_delete])
+        cursor.execute(
+            f"DELETE FROM [vec_{collection_name}] WHERE id IN ({placeholders})",
+            ids_to_delete
+        )
         deleted_count = cursor.rowcount
         self.conn.commit()
+        self._cache_remove(collection_name, ids_to_delete)
+        self._sync_loaded_index(collection_name)
         return deleted_count
\ No newline at end of file
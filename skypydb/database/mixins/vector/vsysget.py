@@ -6,10 +6,24 @@ import json
 from typing import (
     Any,
     Dict,
+    Iterator,
     List,
-    Optional
+    Optional,
+    Tuple
 )
+import numpy as np
 from skypydb.security.validation import InputValidator
+from skypydb.database.mixins.vector.filters import compile_filters
+
+# default number of items per batch when iterating over a collection
+DEFAULT_ITER_BATCH_SIZE = 1000
+
+# column read for each field that can be included in the results
+_INCLUDE_COLUMNS = {
+    "embeddings": "embedding",
+    "documents": "document",
+    "metadatas": "metadata"
+}
 
 class VSysGet:
     def get(
@@ -18,7 +32,9 @@ class VSysGet:
         ids: Optional[List[str]] = None,
         where: Optional[Dict[str, Any]] = None,
         where_document: Optional[Dict[str, str]] = None,
-        include: Optional[List[str]] = None
+        include: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
     ) -> Dict[str, List[Any]]:
         """
         Get items from a collection by ID or filter.
@@ -29,52 +45,251 @@ class VSysGet:
             where: Optional metadata filter
             where_document: Optional document filter
             include: Optional list of fields to include (embeddings, documents, metadatas)
+            limit: Optional maximum number of items to return
+            offset: Optional number of matching items to skip
             
         Returns:
             Dictionary with lists of ids, embeddings, documents, and metadatas
+
+        Raises:
+            ValueError: If collection doesn't exist or limit or offset is negative
         """
 
         collection_name = InputValidator.validate_table_name(collection_name)
         if not self.collection_exists(collection_name):
             raise ValueError(f"Collection '{collection_name}' not found")
+        if (limit is not None and limit < 0) or (offset is not None and offset < 0):
+            raise ValueError("limit and offset must be non-negative")
 
         include = include or ["embeddings", "documents", "metadatas"]
+        offset = offset or 0
+
+        results = {
+            "ids": [],
+            "embeddings": [] if "embeddings" in include else None,
+            "documents": [] if "documents" in include else None,
+            "metadatas": [] if "metadatas" in include else None,
+        }
+
+        filtered = where is not None or where_document is not None
+        compiled = compile_filters(where, where_document) if filtered else None
+
+        # resident collections are served from memory, and filters SQL can't
+        # express are evaluated on the resident copy
+        if self._is_collection_cached(collection_name) or (filtered and compiled is None):
+            with self._cache_lock:
+                cached = self._get_cached_collection(collection_name)
+                if ids is not None:
+                    indices = [
+                        cached.positions[item_id] for item_id in dict.fromkeys(ids)
+                        if item_id in cached.positions
+                    ]
+                else:
+                    indices = range(cached.size)
+                if compiled is not None:
+                    matching = self._select_matching_ids(collection_name, where, where_document)
+                    if ids is None:
+                        indices = [
+                            cached.positions[item_id] for item_id in matching
+                            if item_id in cached.positions
+                        ]
+                    else:
+                        matching = set(matching)
+                        indices = [index for index in indices if cached.ids[index] in matching]
+                elif filtered:
+                    indices = [
+                        index for index in indices
+                        if self._matches_filters(cached.item(index), where, where_document)
+                    ]
+                # only the requested page is materialized
+                indices = list(indices[offset:offset + limit if limit else None])
+
+                results["ids"] = [cached.ids[index] for index in indices]
+                if results["embeddings"] is not None:
+                    results["embeddings"] = cached.embeddings(indices).tolist()
+                if results["documents"] is not None:
+                    results["documents"] = [cached.documents[index] for index in indices]
+                if results["metadatas"] is not None:
+                    results["metadatas"] = [cached.metadatas[index] for index in indices]
+            return results
 
         cursor = self.conn.cursor()
 
+        # only read the columns that are returned
+        columns = ["id"] + [
+            column for field, column in _INCLUDE_COLUMNS.items()
+            if results[field] is not None
+        ]
+        conditions = []
+        params: List[Any] = []
+        if ids is not None:
+            conditions.append(f"id IN ({', '.join(['?' for _ in ids])})")
+            params.extend(ids)
+        if compiled is not None:
+            conditions.append(compiled[0])
+            params.extend(compiled[1])
+        query = f"SELECT {', '.join(columns)} FROM [vec_{collection_name}]"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+
         if ids is not None:
-            placeholders = ", ".join(["?" for _ in ids])
+            # results follow the order of the requested IDs, so the page is cut in Python
+            cursor.execute(query, params)
+            rows = {row["id"]: row for row in cursor.fetchall()}
+            page = [rows[item_id] for item_id in dict.fromkeys(ids) if item_id in rows]
+            page = page[offset:offset + limit if limit else None]
+        else:
+            # filter scans follow storage order, so the page is cut in SQL
             cursor.execute(
-                f"SELECT * FROM [vec_{collection_name}] WHERE id IN ({placeholders})",
-                list(ids)
+                f"{query} ORDER BY rowid LIMIT ? OFFSET ?",
+                params + [limit if limit else -1, offset]
             )
-        else:
-            cursor.execute(f"SELECT * FROM [vec_{collection_name}]")
+            page = cursor.fetchall()
 
-        results = {
-            "ids": [],
-            "embeddings": [] if "embeddings" in include else None,
-            "documents": [] if "documents" in include else None,
-            "metadatas": [] if "metadatas" in include else None,
+        return self._rows_to_results(collection_name, page, include)
+
+    def iter(
+        self,
+        collection_name: str,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, str]] = None,
+        include: Optional[List[str]] = None,
+        as_numpy: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Walk a collection in fixed-size batches without loading it in memory.
+
+        Rows are read in ID order, one keyset page at a time, so memory stays
+        bounded by the batch size. Each page restarts after the last ID seen,
+        which keeps the walk stable while other writes happen: rows are never
+        returned twice, rows updated or replaced in place are still returned
+        once, and only rows inserted behind the cursor are skipped.
+
+        Args:
+            collection_name: Name of the collection
+            batch_size: Number of items per batch, the last batch may be smaller
+            where: Optional metadata filter
+            where_document: Optional document filter
+            include: Optional list of fields to include (embeddings, documents, metadatas)
+            as_numpy: Whether to return the embeddings of a batch as a (n, d) float32 array
+
+        Returns:
+            Iterator over dictionaries with lists of ids, embeddings, documents, and metadatas
+
+        Raises:
+            ValueError: If collection doesn't exist or batch_size isn't positive
+        """
+
+        collection_name = InputValidator.validate_table_name(collection_name)
+        if not self.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' not found")
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        include = include or ["embeddings", "documents", "metadatas"]
+        return self._iter_batches(
+            collection_name,
+            batch_size,
+            where,
+            where_document,
+            include,
+            as_numpy
+        )
+
+    def _iter_batches(
+        self,
+        collection_name: str,
+        batch_size: int,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, str]],
+        include: List[str],
+        as_numpy: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate the batches of iter.
+        """
+
+        filtered = where is not None or where_document is not None
+        compiled = compile_filters(where, where_document) if filtered else None
+        evaluate = filtered and compiled is None
+
+        # filters SQL can't express are evaluated on the documents and metadata
+        columns = ["id"] + [
+            column for field, column in _INCLUDE_COLUMNS.items()
+            if field in include or (evaluate and column != "embedding")
+        ]
+        condition, params = compiled if compiled is not None else ("1", [])
+        query = f"SELECT {', '.join(columns)} FROM [vec_{collection_name}] WHERE ({condition})"
+
+        cursor = self.conn.cursor()
+
+        last_id = None
+        pending: List[Any] = []
+        while True:
+            # a new statement per page, so no read is held open between batches
+            if last_id is None:
+                cursor.execute(f"{query} ORDER BY id LIMIT ?", params + [batch_size])
+            else:
+                cursor.execute(
+                    f"{query} AND id > ? ORDER BY id LIMIT ?",
+                    params + [last_id, batch_size]
+                )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            if evaluate:
+                rows = [
+                    row for row in rows
+                    if self._matches_filters(
+                        {
+                            "document": row["document"],
+                            "metadata": json.loads(row["metadata"]) if row["metadata"] else None
+                        },
+                        where,
+                        where_document
+                    )
+                ]
+            pending.extend(rows)
+            while len(pending) >= batch_size:
+                yield self._rows_to_results(collection_name, pending[:batch_size], include, as_numpy)
+                pending = pending[batch_size:]
+
+        if pending:
+            yield self._rows_to_results(collection_name, pending, include, as_numpy)
+
+    def _rows_to_results(
+        self,
+        collection_name: str,
+        rows: List[Any],
+        include: List[str],
+        as_numpy: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Decode rows read from a collection table into the get results format.
+        """
+
+        results: Dict[str, Any] = {
+            "ids": [row["id"] for row in rows],
+            "embeddings": None,
+            "documents": None,
+            "metadatas": None
         }
-        for row in cursor.fetchall():
-            item = {
-                "id": row["id"],
-                "document": row["document"],
-                "embedding": json.loads(row["embedding"]),
-                "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
-            }
-            # apply filters
-            if not self._matches_filters(item, where, where_document):
-                continue
-
-            results["ids"].append(item["id"])
-            if results["embeddings"] is not None:
-                results["embeddings"].append(item["embedding"])
-            if results["documents"] is not None:
-                results["documents"].append(item["document"])
-            if results["metadatas"] is not None:
-                results["metadatas"].append(item["metadata"])
+        if "embeddings" in include:
+            embeddings = self._decode_embeddings(
+                collection_name,
+                [row["embedding"] for row in rows]
+            )
+            results["embeddings"] = embeddings if as_numpy else embeddings.tolist()
+        if "documents" in include:
+            results["documents"] = [row["document"] for row in rows]
+        if "metadatas" in include:
+            results["metadatas"] = [
+                json.loads(row["metadata"]) if row["metadata"] else None
+                for row in rows
+            ]
         return results
 
     def _get_all_items(
@@ -87,15 +302,48 @@ class VSysGet:
 
         cursor = self.conn.cursor()
         
+        cursor.execute(f"SELECT * FROM [vec_{collection_name}]")
+        rows = cursor.fetchall()
+        embeddings = self._decode_embeddings(
+            collection_name,
+            [row["embedding"] for row in rows]
+        ).tolist()
+
+        items = []
+        for row, embedding in zip(rows, embeddings):
+            items.append({
+                "id": row["id"],
+                "document": row["document"],
+                "embedding": embedding,
+                "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
+                "created_at": row["created_at"]
+            })
+        return items
+
+    def _get_all_items_matrix(
+        self,
+        collection_name: str
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        Get all items from a collection with their stored codes packed in one matrix.
+
+        Returns:
+            Tuple of the items (without their embedding) and a contiguous
+            (n, d) matrix of codes whose rows follow the order of the items
+        """
+
+        cursor = self.conn.cursor()
+
         cursor.execute(f"SELECT * FROM [vec_{collection_name}]")
 
         items = []
+        blobs = []
         for row in cursor.fetchall():
             items.append({
                 "id": row["id"],
                 "document": row["document"],
-                "embedding": json.loads(row["embedding"]),
                 "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
                 "created_at": row["created_at"]
             })
-        return items
\ No newline at end of file
+            blobs.append(row["embedding"])
+        return items, self._quantizer(collection_name).from_blobs(blobs)
\ No newline at end of file
@@ -9,8 +9,13 @@ from typing import (
     Optional,
     Callable
 )
+from skypydb.database.mixins.vector.syscache import DEFAULT_CACHE_MAX_BYTES
+from skypydb.database.mixins.vector.sysquery import DEFAULT_SEARCH_TILE_BYTES
 from skypydb.database.mixins.vector import (
     SysEmbeddings,
+    SysCache,
+    SysIndex,
+    SysQuantize,
     SysAdd,
     SysUpdate,
     SysQuery,
@@ -20,11 +25,18 @@ from skypydb.database.mixins.vector import (
     SysCreate,
     SysGet,
     SysCount,
-    SysDelete
+    SysDelete,
+    SysMigrate,
+    SysMetadataIndex,
+    SysDimension,
+    SysMetric
 )
 
 class VectorDatabase(
     SysEmbeddings,
+    SysCache,
+    SysIndex,
+    SysQuantize,
     SysAdd,
     SysUpdate,
     SysQuery,
@@ -34,7 +46,11 @@ class VectorDatabase(
     SysCreate,
     SysGet,
     SysCount,
-    SysDelete
+    SysDelete,
+    SysMigrate,
+    SysMetadataIndex,
+    SysDimension,
+    SysMetric
 ):
     """
     Manages SQLite database for vector storage and similarity search.
@@ -43,7 +59,9 @@ class VectorDatabase(
     def __init__(
         self,
         path: str,
-        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        cache_max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+        search_tile_bytes: int = DEFAULT_SEARCH_TILE_BYTES
     ):
         """
         Initialize vector database.
@@ -51,10 +69,31 @@ class VectorDatabase(
         Args:
             path: Path to SQLite database file
             embedding_function: Optional function to generate embeddings from text
+            cache_max_bytes: Memory budget for collections kept resident in memory,
+                shared by all collections with LRU eviction. None means unbounded
+                and 0 disables the cache.
+            search_tile_bytes: Memory budget of the distance tiles scored at once
+                by exact searches, which bounds the memory of large query batches
+
+        Raises:
+            ValueError: If search_tile_bytes isn't positive
         """
 
+        if search_tile_bytes <= 0:
+            raise ValueError(f"search_tile_bytes must be positive, got {search_tile_bytes}")
+
         self.path = path
         self.embedding_function = embedding_function
+        self._search_tile_bytes = search_tile_bytes
+
+        # resident per-collection copies used by query, get and delete
+        self._init_cache(cache_max_bytes)
+
+        # per-collection quantizers encoding the stored embeddings
+        self._init_quantizers()
+
+        # per-collection distance metrics, read from the collection metadata
+        self._metrics = {}
 
         # create directory if it doesn't exist
         Path(path).parent.mkdir(parents=True, exist_ok=True)
@@ -66,10 +105,49 @@ class VectorDatabase(
         # create collections metadata table
         self._ensure_collections_table()
 
+        # create the table holding trained quantizer state such as PQ codebooks
+        self._ensure_codebook_table()
+
+        # create approximate search index snapshot and journal tables
+        self._ensure_index_tables()
+
+        # convert collections written by older versions to the current storage format
+        self._migrate_legacy_collections()
+
+        # retrain the quantizers whose stored state can't be read
+        self._restore_quantizers()
+
+    def commit(self) -> None:
+        """
+        Commit the writes left pending by add(..., defer_commit=True).
+        """
+
+        self.conn.commit()
+        with self._cache_lock:
+            for collection_name in list(self._indexes):
+                self._sync_loaded_index(collection_name)
+
+    def rollback(self) -> None:
+        """
+        Discard the pending writes and the in-memory state that may reflect them.
+        """
+
+        self.conn.rollback()
+        with self._cache_lock:
+            # resident copies, indexes and quantizers are reloaded from the database on next use
+            self._cache.clear()
+            self._indexes.clear()
+            self._init_quantizers()
+
     def close(self) -> None:
         """
-        Close database connection.
+        Close database connection, committing pending writes.
         """
 
         if self.conn:
+            # writes deferred by add(..., defer_commit=True) are kept
+            self.conn.commit()
+            self._flush_indexes()
             self.conn.close()
+        with self._cache_lock:
+            self._cache.clear()
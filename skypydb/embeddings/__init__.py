@@ -2,20 +2,34 @@
 Embeddings module.
 """
 
+from skypydb.embeddings.cache import (
+    CachedEmbedding,
+    EmbeddingCache
+)
+from skypydb.embeddings.hash import HashEmbedding
 from skypydb.embeddings.ollama import OllamaEmbedding
 from skypydb.embeddings.openai import OpenAIEmbedding
 from skypydb.embeddings.sentence_transformers import SentenceTransformerEmbedding
 from skypydb.embeddings.mixins import (
     EmbeddingsFn,
+    RateLimiter,
     Utils,
-    get_embedding_function
+    get_embedding_function,
+    known_dimension,
+    register_dimension
 )
 
 __all__ = [
+    "CachedEmbedding",
+    "EmbeddingCache",
+    "HashEmbedding",
     "OllamaEmbedding",
     "OpenAIEmbedding",
     "SentenceTransformerEmbedding",
     "EmbeddingsFn",
+    "RateLimiter",
     "Utils",
-    "get_embedding_function"
+    "get_embedding_function",
+    "known_dimension",
+    "register_dimension"
 ]
@@ -0,0 +1,377 @@
+"""
+Module containing the EmbeddingCache and CachedEmbedding classes, which are used to reuse the embeddings of texts that were already embedded.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union
+)
+import numpy as np
+from skypydb.embeddings.mixins import Utils
+
+# default memory budget of the in-process LRU front
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# number of hashes looked up per SQL statement, under SQLite's parameter limit
+_LOOKUP_BATCH_SIZE = 500
+
+# (provider, model, dimension, sha256 of the text)
+CacheKey = Tuple[str, str, int, bytes]
+
+def text_hash(text: str) -> bytes:
+    """
+    Get the SHA-256 digest identifying a text in the cache.
+    """
+
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+class EmbeddingCache:
+    """
+    Content-addressed store of embeddings.
+
+    Embeddings are persisted as float32 BLOBs in a SQLite table keyed by
+    (provider, model, dimension, sha256(text)), behind an in-process LRU
+    bounded in bytes. The cache is thread-safe and can be shared by several
+    embedding functions.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_memory_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path to the SQLite file holding the cache, created if needed
+            max_memory_bytes: Memory budget of the in-process LRU, None for
+                unbounded and 0 to only use the SQLite table
+        """
+
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS _embedding_cache (
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                text_hash BLOB NOT NULL,
+                embedding BLOB NOT NULL,
+                PRIMARY KEY (provider, model, dimension, text_hash)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def get_many(
+        self,
+        namespace: Tuple[str, str, int],
+        hashes: Sequence[bytes]
+    ) -> Dict[bytes, np.ndarray]:
+        """
+        Look up embeddings, first in memory then in the SQLite table.
+
+        Args:
+            namespace: (provider, model, dimension) of the embedding function
+            hashes: Digests of the texts, as returned by text_hash
+
+        Returns:
+            Cached float32 embeddings by digest; missing digests are left out.
+            Hits and misses are counted once per distinct digest.
+        """
+
+        found: Dict[bytes, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            missing = []
+            for digest in unique:
+                key = namespace + (digest,)
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(digest)
+                else:
+                    self._memory.move_to_end(key)
+                    found[digest] = vector
+            self.memory_hits += len(found)
+
+            for start in range(0, len(missing), _LOOKUP_BATCH_SIZE):
+                batch = missing[start:start + _LOOKUP_BATCH_SIZE]
+                rows = self.conn.execute(
+                    f"""
+                    SELECT text_hash, embedding FROM _embedding_cache
+                    WHERE provider = ? AND model = ? AND dimension = ?
+                    AND text_hash IN ({', '.join(['?' for _ in batch])})
+                    """,
+                    list(namespace) + batch
+                ).fetchall()
+                for digest, blob in rows:
+                    vector = np.frombuffer(blob, dtype="<f4")
+                    found[digest] = vector
+                    self._remember(namespace + (digest,), vector)
+
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(
+        self,
+        namespace: Tuple[str, str, int],
+        entries: Dict[bytes, Sequence[float]]
+    ) -> None:
+        """
+        Store embeddings.
+
+        Args:
+            namespace: (provider, model, dimension) of the embedding function
+            entries: Embeddings by digest of their text
+        """
+
+        if not entries:
+            return
+        with self._lock:
+            rows = []
+            for digest, embedding in entries.items():
+                vector = np.asarray(embedding, dtype="<f4")
+                self._remember(namespace + (digest,), vector)
+                rows.append(tuple(namespace) + (digest, vector.tobytes()))
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO _embedding_cache
+                (provider, model, dimension, text_hash, embedding)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            self.conn.commit()
+
+    def _remember(
+        self,
+        key: CacheKey,
+        vector: np.ndarray
+    ) -> None:
+        """
+        Keep a vector in the LRU, evicting the least recently used ones over budget.
+        """
+
+        if self.max_memory_bytes == 0:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.nbytes
+        self._memory[key] = vector
+        self._memory_bytes += vector.nbytes
+        while self.max_memory_bytes is not None and self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the hit and miss counters and the size of the in-process LRU.
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.hits - self.memory_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes
+            }
+
+    def clear(self) -> None:
+        """
+        Remove every cached embedding and reset the counters.
+        """
+
+        with self._lock:
+            self.conn.execute("DELETE FROM _embedding_cache")
+            self.conn.commit()
+            self._memory.clear()
+            self._memory_bytes = 0
+            self.hits = self.memory_hits = self.misses = 0
+
+    def close(self) -> None:
+        """
+        Close the SQLite connection.
+        """
+
+        with self._lock:
+            self.conn.close()
+
+class CachedEmbedding(Utils):
+    """
+    Embedding function that only sends texts missing from a cache to the wrapped one.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Callable[[List[str]], List[List[float]]],
+        cache: EmbeddingCache,
+        provider: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        """
+        Initialize the cached embedding function.
+
+        Args:
+            embedding_function: Embedding function to wrap
+            cache: Cache to read and fill
+            provider: Provider name in the cache key, defaults to the class name
+                of the embedding function
+            model: Model name in the cache key, defaults to its model attribute
+        """
+
+        self.embedding_function = embedding_function
+        self.cache = cache
+        # results have the type of the wrapped function's, lists unless it returns arrays
+        self.returns_array = getattr(embedding_function, "returns_array", False)
+        self.provider = provider or type(embedding_function).__name__
+        self.model = model if model is not None else str(getattr(embedding_function, "model", ""))
+        # normalized and raw outputs of the same model are different embeddings
+        model_key = self.model + ("#normalized" if getattr(embedding_function, "normalize_embeddings", False) else "")
+        # the requested output dimension, 0 for the model's native one
+        dimension = getattr(embedding_function, "dimension", None)
+        self._namespace = (
+            self.provider,
+            model_key,
+            (dimension() if callable(dimension) else dimension) or 0
+        )
+
+    def _collect(
+        self,
+        found: Dict[bytes, np.ndarray],
+        hashes: Sequence[bytes]
+    ) -> Union[List[List[float]], np.ndarray]:
+        """
+        Assemble the embeddings of the texts in order, as a float32 array if
+        the wrapped function returns arrays and as lists otherwise.
+        """
+
+        if self.returns_array:
+            if not hashes:
+                return np.empty((0, self.dimension() or 0), dtype=np.float32)
+            return np.stack([found[digest] for digest in hashes]).astype(np.float32, copy=False)
+        return [found[digest].tolist() for digest in hashes]
+
+    def _record(
+        self,
+        computed: Union[List[List[float]], np.ndarray]
+    ) -> None:
+        """
+        Switch to array results once the wrapped function returns an array.
+        """
+
+        if isinstance(computed, np.ndarray):
+            self.returns_array = True
+
+    def embed(
+        self,
+        texts: List[str]
+    ) -> Union[List[List[float]], np.ndarray]:
+        """
+        Generate embeddings for a list of texts, embedding only the uncached ones.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            Embedding vectors, a (n, d) float32 array if the wrapped function
+            returns arrays and a list of vectors otherwise
+        """
+
+        if not texts:
+            return self._collect({}, [])
+
+        hashes = [text_hash(text) for text in texts]
+        found = self.cache.get_many(self._namespace, hashes)
+        # first position of each uncached text, so that duplicates are embedded once
+        missing: Dict[bytes, int] = {}
+        for i, digest in enumerate(hashes):
+            if digest not in found:
+                missing.setdefault(digest, i)
+
+        if missing:
+            computed = self.embedding_function([texts[i] for i in missing.values()])
+            self._record(computed)
+            entries = dict(zip(missing, computed))
+            self.cache.put_many(self._namespace, entries)
+            found.update({digest: np.asarray(embedding) for digest, embedding in entries.items()})
+        return self._collect(found, hashes)
+
+    async def aembed(
+        self,
+        texts: List[str]
+    ) -> Union[List[List[float]], np.ndarray]:
+        """
+        Async counterpart of embed, which awaits the wrapped function for the
+        uncached texts and reads and fills the cache on a worker thread.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            Embedding vectors, typed like the results of embed
+        """
+
+        if not texts:
+            return self._collect({}, [])
+
+        hashes = [text_hash(text) for text in texts]
+        found = await asyncio.to_thread(self.cache.get_many, self._namespace, hashes)
+        missing: Dict[bytes, int] = {}
+        for i, digest in enumerate(hashes):
+            if digest not in found:
+                missing.setdefault(digest, i)
+
+        if missing:
+            missing_texts = [texts[i] for i in missing.values()]
+            acall = getattr(self.embedding_function, "acall", None)
+            if acall is not None:
+                computed = await acall(missing_texts)
+            else:
+                computed = await asyncio.to_thread(self.embedding_function, missing_texts)
+            self._record(computed)
+            entries = dict(zip(missing, computed))
+            await asyncio.to_thread(self.cache.put_many, self._namespace, entries)
+            found.update({digest: np.asarray(embedding) for digest, embedding in entries.items()})
+        return self._collect(found, hashes)
+
+    def dimension(self) -> Optional[int]:
+        """
+        Get the embedding dimension of the wrapped function, None if unknown yet.
+        """
+
+        dimension = getattr(self.embedding_function, "dimension", None)
+        return dimension() if callable(dimension) else dimension
+
+    def get_dimension(self) -> int:
+        """
+        Get the embedding dimension of the wrapped function, generating a test embedding if needed.
+        """
+
+        get_dimension = getattr(self.embedding_function, "get_dimension", None)
+        if callable(get_dimension):
+            return get_dimension()
+        return len(self.embed(["test"])[0])
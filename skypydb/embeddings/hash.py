@@ -0,0 +1,144 @@
+"""
+Hashing embedding functions for offline benchmarks and tests.
+"""
+
+import asyncio
+import hashlib
+import re
+from typing import (
+    Dict,
+    List
+)
+import numpy as np
+from skypydb.embeddings.mixins import (
+    EmbeddingsFn,
+    Utils
+)
+
+# default number of dimensions, the one of common small embedding models
+DEFAULT_DIMENSION = 384
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+class HashEmbedding(
+    EmbeddingsFn,
+    Utils
+):
+    """
+    Deterministic embedding function built with feature hashing.
+
+    Every word and pair of consecutive words of a text is hashed to a
+    dimension and a sign, and the signed counts are L2-normalized. Texts
+    sharing words get similar embeddings, which is enough to exercise
+    ingestion and search at realistic dimensions without a model or a
+    network. Embeddings are identical across processes and machines.
+    """
+
+    returns_array = True
+
+    def __init__(
+        self,
+        dimension: int = DEFAULT_DIMENSION,
+        seed: int = 0
+    ):
+        """
+        Initialize hashing embedding function.
+
+        Args:
+            dimension: Number of dimensions of the embeddings
+            seed: Salt of the hash function, different seeds give unrelated embeddings
+        """
+
+        if dimension <= 0:
+            raise ValueError(f"dimension must be positive, got {dimension}")
+
+        super().__init__(dimension=dimension)
+        self.seed = seed
+        self.model = f"feature-hash-seed{seed}"
+        self._salt = seed.to_bytes(8, "little", signed=True)
+
+    def _features(
+        self,
+        text: str
+    ) -> List[str]:
+        """
+        Get the hashed features of a text: its lowercase words and word pairs.
+        """
+
+        words = _TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+    def _hash(
+        self,
+        feature: str
+    ) -> int:
+        """
+        Get the signed bucket of a feature, stable across processes unlike hash().
+        """
+
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8, salt=self._salt).digest()
+        value = int.from_bytes(digest, "little")
+        bucket = (value >> 1) % self._dimension
+        return bucket if value & 1 else -bucket - 1
+
+    def embed(
+        self,
+        texts: List[str]
+    ) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts.
+
+        Each distinct feature of the batch is hashed once, and the counts
+        are accumulated for the whole batch at once.
+
+        Returns:
+            (n, d) float32 array of unit vectors, zero vectors for texts without words
+        """
+
+        embeddings = np.zeros((len(texts), self._dimension), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        buckets: Dict[str, int] = {}
+        rows: List[int] = []
+        signed: List[int] = []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                bucket = buckets.get(feature)
+                if bucket is None:
+                    bucket = buckets[feature] = self._hash(feature)
+                rows.append(row)
+                signed.append(bucket)
+
+        if rows:
+            signed_buckets = np.asarray(signed, dtype=np.int64)
+            negative = signed_buckets < 0
+            columns = np.where(negative, -signed_buckets - 1, signed_buckets)
+            np.add.at(
+                embeddings,
+                (np.asarray(rows, dtype=np.int64), columns),
+                np.where(negative, -1.0, 1.0).astype(np.float32)
+            )
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+        return embeddings
+
+    async def aembed(
+        self,
+        texts: List[str]
+    ) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts on a worker thread, so that
+        large batches don't block the event loop.
+        """
+
+        return await asyncio.to_thread(self.embed, texts)
+
+    def get_dimension(
+        self
+    ) -> int:
+        """
+        Get the embedding dimension.
+        """
+
+        return self._dimension
@@ -2,12 +2,20 @@
 Embedding function module.
 """
 
+from skypydb.embeddings.mixins.dimensions import (
+    known_dimension,
+    register_dimension
+)
+from skypydb.embeddings.mixins.rate_limiter import RateLimiter
 from skypydb.embeddings.mixins.embeddings_fn import EmbeddingsFn
 from skypydb.embeddings.mixins.sysget import get_embedding_function
 from skypydb.embeddings.mixins.utils import Utils
 
 __all__ = [
     "EmbeddingsFn",
+    "RateLimiter",
     "Utils",
-    "get_embedding_function"
+    "get_embedding_function",
+    "known_dimension",
+    "register_dimension"
 ]
@@ -0,0 +1,94 @@
+"""
+Module containing the registry of known embedding dimensions, which is used to learn the dimension of a model without calling its provider.
+"""
+
+from typing import (
+    Dict,
+    Optional,
+    Set
+)
+
+# native dimension of common embedding models, by model name
+KNOWN_DIMENSIONS: Dict[str, int] = {
+    # ollama
+    "mxbai-embed-large": 1024,
+    "nomic-embed-text": 768,
+    "all-minilm": 384,
+    "snowflake-arctic-embed": 1024,
+    "bge-m3": 1024,
+    "bge-large": 1024,
+    "paraphrase-multilingual": 768,
+    "embeddinggemma": 768,
+    # openai
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+    # sentence-transformers
+    "all-MiniLM-L6-v2": 384,
+    "all-MiniLM-L12-v2": 384,
+    "all-mpnet-base-v2": 768,
+    "multi-qa-MiniLM-L6-cos-v1": 384,
+    "multi-qa-mpnet-base-dot-v1": 768,
+    "paraphrase-MiniLM-L6-v2": 384,
+    "paraphrase-multilingual-MiniLM-L12-v2": 384,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+    "BAAI/bge-large-en-v1.5": 1024
+}
+
+# models that can be asked for shortened embeddings, e.g. with the dimensions parameter of OpenAI
+SHORTENABLE_MODELS: Set[str] = {
+    "text-embedding-3-small",
+    "text-embedding-3-large"
+}
+
+def _normalize_model_name(model: str) -> str:
+    """
+    Drop the parts of a model name that don't change its dimension.
+    """
+
+    if model.endswith(":latest"):
+        model = model[:-len(":latest")]
+    if model.startswith("sentence-transformers/"):
+        model = model[len("sentence-transformers/"):]
+    return model
+
+def register_dimension(
+    model: str,
+    dimension: int
+) -> None:
+    """
+    Record the dimension of a model, e.g. a custom or fine-tuned one.
+
+    Args:
+        model: Model name, as given to the embedding function
+        dimension: Number of dimensions of its embeddings
+
+    Raises:
+        ValueError: If the dimension isn't a positive integer
+    """
+
+    if isinstance(dimension, bool) or not isinstance(dimension, int) or dimension <= 0:
+        raise ValueError(f"dimension must be a positive integer, got {dimension!r}")
+    KNOWN_DIMENSIONS[_normalize_model_name(model)] = dimension
+
+def known_dimension(model: Optional[str]) -> Optional[int]:
+    """
+    Get the registered dimension of a model.
+
+    Returns:
+        The dimension, None if the model isn't registered
+    """
+
+    if not model:
+        return None
+    return KNOWN_DIMENSIONS.get(_normalize_model_name(model))
+
+def supports_shortening(model: Optional[str]) -> bool:
+    """
+    Check whether a model is known to return shortened embeddings on request.
+    """
+
+    if not model:
+        return False
+    return _normalize_model_name(model) in SHORTENABLE_MODELS
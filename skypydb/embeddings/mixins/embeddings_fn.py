@@ -2,24 +2,77 @@
 Module containing the EmbeddingsFn class, which is used to generate embeddings for a list of texts.
 """
 
+import asyncio
+import concurrent.futures
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
+    Any,
+    Awaitable,
+    Callable,
     List,
-    Optional
+    Optional,
+    Tuple
 )
+from skypydb.embeddings.mixins.dimensions import known_dimension
+from skypydb.embeddings.mixins.rate_limiter import (
+    RateLimiter,
+    estimate_tokens
+)
+
+# default base delay in seconds before the first retry, doubled on each further retry
+DEFAULT_RETRY_BACKOFF = 0.5
 
 class EmbeddingsFn:
+    # whether embed returns a (n, d) float32 NumPy array instead of lists
+    returns_array = False
+
+    # errors worth retrying: the provider was unreachable or too slow,
+    # extended by providers whose clients raise their own exception types
+    _retryable_errors: Tuple[type, ...] = (ConnectionError, TimeoutError)
+
+    # whether the client of the provider fails requests after timeout seconds;
+    # otherwise _request and _arequest abandon them
+    _enforces_timeout = False
+
     def __init__(
         self,
-        dimension: Optional[int] = None
+        dimension: Optional[int] = None,
+        concurrency: int = 1,
+        timeout: Optional[float] = None,
+        max_retries: int = 0,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        rate_limiter: Optional[RateLimiter] = None
     ) -> None:
         """
         Initialize the EmbeddingsFn with an optional dimension.
 
         Args:
             dimension: The dimension of the embeddings. If None, it will be inferred from the first embedding.
+            concurrency: Number of texts embedded at the same time by embed
+            timeout: Optional number of seconds after which a request fails
+                with TimeoutError, enforced by the client of the provider when
+                it has one, otherwise by abandoning the request
+            max_retries: Number of times a request failing with a connection
+                error or a timeout is retried
+            retry_backoff: Delay in seconds before the first retry, doubled on
+                each further retry
+            rate_limiter: Optional limiter of requests and tokens per second,
+                which can be shared by several embedding functions
         """
 
+        if concurrency <= 0:
+            raise ValueError(f"concurrency must be positive, got {concurrency}")
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be non-negative, got {max_retries}")
+
         self._dimension = dimension
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.rate_limiter = rate_limiter
 
     def _get_embedding(
         self,
@@ -33,6 +86,124 @@ class EmbeddingsFn:
             f"{self.__class__.__name__} must implement `_get_embedding`."
         )
 
+    def _request(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        tokens: int = 0
+    ) -> Any:
+        """
+        Send one request to the provider under the rate limiter, retrying
+        connection errors and timeouts with exponential backoff.
+
+        Providers whose client doesn't enforce the timeout get each attempt
+        run on a thread of its own, abandoned after timeout seconds, so a
+        retry never waits behind a request that is still stuck.
+
+        Args:
+            function: Function sending the request
+            *args: Arguments of the function
+            tokens: Estimated number of tokens of the request
+
+        Returns:
+            Result of the function
+        """
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(tokens)
+            try:
+                if self.timeout is None or self._enforces_timeout:
+                    return function(*args)
+                return self._call_with_timeout(function, *args)
+            except self._retryable_errors:
+                if attempt == self.max_retries:
+                    raise
+            # full jitter keeps concurrent retries from hitting the server in lockstep
+            time.sleep(random.uniform(0, self.retry_backoff * 2 ** attempt))
+
+    def _call_with_timeout(
+        self,
+        function: Callable[..., Any],
+        *args: Any
+    ) -> Any:
+        """
+        Run a function on a new thread, giving up on it after timeout seconds.
+
+        Raises:
+            TimeoutError: If the function doesn't return within timeout seconds
+        """
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="skypydb-embed")
+        try:
+            return executor.submit(function, *args).result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError(
+                f"Embedding request timed out after {self.timeout} seconds"
+            ) from None
+        finally:
+            # don't wait for a request that timed out, its thread finishes on its own
+            executor.shutdown(wait=False)
+
+    async def _aget_embedding(
+        self,
+        text: str
+    ) -> List[float]:
+        """
+        Get embedding for a single text without blocking the event loop.
+
+        Providers without an async client run _get_embedding on a worker thread.
+        """
+
+        return await asyncio.to_thread(self._get_embedding, text)
+
+    async def _arequest(
+        self,
+        function: Callable[..., Awaitable[Any]],
+        *args: Any,
+        tokens: int = 0
+    ) -> Any:
+        """
+        Async counterpart of _request, which cancels the attempts of providers
+        whose client doesn't enforce the timeout after timeout seconds.
+
+        Args:
+            function: Coroutine function sending the request
+            *args: Arguments of the function
+            tokens: Estimated number of tokens of the request
+
+        Returns:
+            Result of the function
+        """
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(tokens)
+            try:
+                if self.timeout is None or self._enforces_timeout:
+                    return await function(*args)
+                try:
+                    return await asyncio.wait_for(function(*args), self.timeout)
+                except asyncio.TimeoutError:
+                    # asyncio.TimeoutError only became TimeoutError in Python 3.11
+                    raise TimeoutError(
+                        f"Embedding request timed out after {self.timeout} seconds"
+                    ) from None
+            except self._retryable_errors:
+                if attempt == self.max_retries:
+                    raise
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * 2 ** attempt))
+
+    def _embed_text(
+        self,
+        text: str
+    ) -> List[float]:
+        """
+        Embed one text through _request.
+        """
+
+        return self._request(self._get_embedding, text, tokens=estimate_tokens(text))
+
     def embed(
         self,
         texts: List[str]
@@ -40,21 +211,70 @@ class EmbeddingsFn:
         """
         Generate embeddings for a list of texts.
 
+        Texts are embedded concurrency at a time, and the embeddings are
+        returned in the order of the texts.
+
         Args:
             texts: List of texts to embed
 
         Returns:
             List of embedding vectors
+
+        Raises:
+            TimeoutError: If a request doesn't complete within timeout seconds
+                after its retries
         """
 
-        embeddings: List[List[float]] = []
+        if not texts:
+            return []
 
-        for text in texts:
-            embedding = self._get_embedding(text)
-            embeddings.append(embedding)
-            # cache the dimension from the first embedding
-            if self._dimension is None:
-                self._dimension = len(embedding)
+        if self.concurrency == 1:
+            embeddings = [self._embed_text(text) for text in texts]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(texts)),
+                thread_name_prefix="skypydb-embed"
+            ) as executor:
+                embeddings = list(executor.map(self._embed_text, texts))
+
+        # cache the dimension from the first embedding
+        if self._dimension is None:
+            self._dimension = len(embeddings[0])
+        return embeddings
+
+    async def aembed(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts without blocking the event loop.
+
+        Texts are embedded concurrency at a time, and the embeddings are
+        returned in the order of the texts.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors
+
+        Raises:
+            TimeoutError: If a request doesn't complete within timeout seconds
+                after its retries
+        """
+
+        if not texts:
+            return []
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def embed_text(text: str) -> List[float]:
+            async with semaphore:
+                return await self._arequest(self._aget_embedding, text, tokens=estimate_tokens(text))
+
+        embeddings = list(await asyncio.gather(*(embed_text(text) for text in texts)))
+        if self._dimension is None:
+            self._dimension = len(embeddings[0])
         return embeddings
 
     def dimension(
@@ -63,23 +283,39 @@ class EmbeddingsFn:
         """
         Get the embedding dimension.
 
-        Returns: 
+        Returns:
             None if no embedding has been generated yet.
         """
 
         return self._dimension
 
+    def _lookup_dimension(
+        self
+    ) -> Optional[int]:
+        """
+        Get the dimension of the model without generating an embedding.
+
+        Returns:
+            The registered dimension of the model, None if it is unknown
+        """
+
+        return known_dimension(getattr(self, "model", None))
+
     def get_dimension(
         self
     ) -> int:
         """
-        Get embedding dimension, generating a test embedding if needed.
+        Get embedding dimension, generating a test embedding only if the
+        model's dimension can't be looked up.
 
         Returns:
             The dimension of embeddings produced by this model.
         """
 
         if self._dimension is None:
-            test_embedding = self._get_embedding("test")
-            self._dimension = len(test_embedding)
+            dimension = self._lookup_dimension()
+            if dimension is None:
+                # generate a test embedding to determine dimension
+                dimension = len(self.embed(["test"])[0])
+            self._dimension = dimension
         return self._dimension
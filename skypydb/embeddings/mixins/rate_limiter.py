@@ -0,0 +1,152 @@
+"""
+Module containing the RateLimiter class, which is used to cap the request and token rates sent to an embedding provider.
+"""
+
+import asyncio
+import threading
+import time
+from typing import (
+    List,
+    Optional
+)
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text, about four characters per token.
+    """
+
+    return max(1, len(text) // 4)
+
+class _Bucket:
+    """
+    Token bucket refilled at a constant rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.available = capacity
+        self.updated = time.monotonic()
+
+    def reserve(
+        self,
+        cost: float,
+        now: float
+    ) -> float:
+        """
+        Take cost out of the bucket, possibly into debt.
+
+        Returns:
+            Number of seconds to wait until the debt is paid back
+        """
+
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+        self.available -= cost
+        return max(0.0, -self.available / self.rate)
+
+class RateLimiter:
+    """
+    Thread-safe limiter of requests per second and tokens per second.
+
+    A single limiter can be shared by several embedding functions so that
+    together they stay under the limits of one server. Callers that would
+    exceed a limit sleep until the budget they used has been refilled.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+        burst_seconds: float = 1.0
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_second: Maximum sustained request rate, None for no limit
+            tokens_per_second: Maximum sustained token rate, None for no limit
+            burst_seconds: Number of seconds of budget that can be spent at once
+                after an idle period
+        """
+
+        for name, rate in (("requests_per_second", requests_per_second), ("tokens_per_second", tokens_per_second)):
+            if rate is not None and rate <= 0:
+                raise ValueError(f"{name} must be positive, got {rate}")
+        if burst_seconds <= 0:
+            raise ValueError(f"burst_seconds must be positive, got {burst_seconds}")
+
+        self.requests_per_second = requests_per_second
+        self.tokens_per_second = tokens_per_second
+        self._lock = threading.Lock()
+        self._requests = (
+            _Bucket(requests_per_second, max(1.0, requests_per_second * burst_seconds))
+            if requests_per_second is not None else None
+        )
+        self._tokens = (
+            _Bucket(tokens_per_second, max(1.0, tokens_per_second * burst_seconds))
+            if tokens_per_second is not None else None
+        )
+
+    def acquire(
+        self,
+        tokens: int = 0
+    ) -> float:
+        """
+        Wait until one request carrying the given number of tokens can be sent.
+
+        Args:
+            tokens: Number of tokens of the request
+
+        Returns:
+            Number of seconds waited
+        """
+
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(
+        self,
+        tokens: int = 0
+    ) -> float:
+        """
+        Wait without blocking the event loop until one request carrying the
+        given number of tokens can be sent.
+
+        Args:
+            tokens: Number of tokens of the request
+
+        Returns:
+            Number of seconds waited
+        """
+
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(
+        self,
+        tokens: int
+    ) -> float:
+        """
+        Take one request and its tokens out of the budget.
+
+        Returns:
+            Number of seconds to wait before sending the request
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            waits: List[float] = [0.0]
+            if self._requests is not None:
+                waits.append(self._requests.reserve(1, now))
+            if self._tokens is not None:
+                waits.append(self._tokens.reserve(tokens, now))
+        return max(waits)
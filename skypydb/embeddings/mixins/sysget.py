@@ -5,8 +5,11 @@ Embedding provider factory helpers.
 from typing import (
     Any,
     Callable,
+    Dict,
     List
 )
+from skypydb.embeddings.mixins.embeddings_fn import DEFAULT_RETRY_BACKOFF
+from skypydb.embeddings.mixins.rate_limiter import RateLimiter
 
 def _validate_remaining_config(
     provider: str,
@@ -22,6 +25,34 @@ def _validate_remaining_config(
             f"Unsupported embedding config keys for provider '{provider}': {unsupported_keys}"
         )
 
+def _pop_request_options(
+    config: dict
+) -> Dict[str, Any]:
+    """
+    Extract the retry and rate limiting options shared by remote providers.
+    """
+
+    rate_limiter = config.pop("rate_limiter", None)
+    requests_per_second = config.pop("requests_per_second", None)
+    tokens_per_second = config.pop("tokens_per_second", None)
+    if requests_per_second is not None or tokens_per_second is not None:
+        if rate_limiter is not None:
+            raise ValueError(
+                "Provide either `rate_limiter` or `requests_per_second`/`tokens_per_second`, not both."
+            )
+        rate_limiter = RateLimiter(
+            requests_per_second=requests_per_second,
+            tokens_per_second=tokens_per_second
+        )
+    options = {
+        "retry_backoff": config.pop("retry_backoff", DEFAULT_RETRY_BACKOFF),
+        "rate_limiter": rate_limiter
+    }
+    # left out when unset, so that each provider applies its own default
+    if "max_retries" in config:
+        options["max_retries"] = config.pop("max_retries")
+    return options
+
 def get_embedding_function(
     provider: str = "ollama",
     **config: Any
@@ -30,25 +61,86 @@ def get_embedding_function(
     Get an embedding function from supported providers.
 
     Args:
-        provider: Embedding provider (ollama, openai, sentence-transformers)
-        **config: Provider-specific configuration
+        provider: Embedding provider (ollama, openai, sentence-transformers, hash)
+        **config: Provider-specific configuration. The ollama and openai
+            providers also accept max_retries, retry_backoff, and either a
+            shared rate_limiter or requests_per_second / tokens_per_second.
+            Every provider accepts cache_path (and cache_max_bytes) to reuse
+            the embeddings of texts already embedded, or a shared cache
     """
 
     provider = provider.lower().strip().replace("_", "-")
+    cache = config.pop("cache", None)
+    cache_path = config.pop("cache_path", None)
+    cache_max_bytes = config.pop("cache_max_bytes", None)
+    if cache is not None and cache_path is not None:
+        raise ValueError("Provide either `cache` or `cache_path`, not both.")
+
+    embedding_function = _create_embedding_function(provider, config)
+    if cache is None and cache_path is None:
+        return embedding_function
+
+    from skypydb.embeddings.cache import (
+        DEFAULT_CACHE_MAX_BYTES,
+        CachedEmbedding,
+        EmbeddingCache
+    )
+
+    if cache is None:
+        cache = EmbeddingCache(
+            cache_path,
+            max_memory_bytes=cache_max_bytes if cache_max_bytes is not None else DEFAULT_CACHE_MAX_BYTES
+        )
+    return CachedEmbedding(
+        embedding_function,
+        cache,
+        provider=provider,
+        model=embedding_function.model
+    )
+
+def _create_embedding_function(
+    provider: str,
+    config: dict
+) -> Any:
+    """
+    Create the embedding function of a provider from its configuration.
+    """
 
     # ollama provider
     if provider == "ollama":
-        from skypydb.embeddings.ollama import OllamaEmbedding
+        from skypydb.embeddings.ollama import (
+            DEFAULT_BATCH_SIZE,
+            DEFAULT_MAX_CONNECTIONS,
+            DEFAULT_TIMEOUT,
+            OllamaEmbedding
+        )
 
         model = config.pop("model", "mxbai-embed-large")
         base_url = config.pop("base_url", "http://localhost:11434")
         dimension = config.pop("dimension", None)
+        batch_size = config.pop("batch_size", DEFAULT_BATCH_SIZE)
+        max_connections = config.pop("max_connections", DEFAULT_MAX_CONNECTIONS)
+        timeout = config.pop("timeout", DEFAULT_TIMEOUT)
+        request_options = _pop_request_options(config)
         _validate_remaining_config(provider, config)
-        return OllamaEmbedding(model=model, base_url=base_url, dimension=dimension)
+        return OllamaEmbedding(
+            model=model,
+            base_url=base_url,
+            dimension=dimension,
+            batch_size=batch_size,
+            max_connections=max_connections,
+            timeout=timeout,
+            **request_options
+        )
 
     # openai provider
     if provider == "openai":
-        from skypydb.embeddings.openai import OpenAIEmbedding
+        from skypydb.embeddings.openai import (
+            DEFAULT_BATCH_SIZE,
+            DEFAULT_CONCURRENCY,
+            DEFAULT_MAX_BATCH_TOKENS,
+            OpenAIEmbedding
+        )
 
         api_key = config.pop("api_key", None)
         model = config.pop("model", "text-embedding-3-small")
@@ -56,7 +148,21 @@ def get_embedding_function(
         organization = config.pop("organization", None)
         project = config.pop("project", None)
         timeout = config.pop("timeout", None)
+        # "dimensions" is the name of the OpenAI API parameter, accepted as an alias
         dimension = config.pop("dimension", None)
+        dimensions = config.pop("dimensions", None)
+        if dimension is not None and dimensions is not None and dimension != dimensions:
+            raise ValueError(
+                f"'dimension' ({dimension}) and 'dimensions' ({dimensions}) don't match, "
+                "set only one of them."
+            )
+        if dimension is None:
+            dimension = dimensions
+        send_dimensions = config.pop("send_dimensions", None)
+        batch_size = config.pop("batch_size", DEFAULT_BATCH_SIZE)
+        max_batch_tokens = config.pop("max_batch_tokens", DEFAULT_MAX_BATCH_TOKENS)
+        concurrency = config.pop("concurrency", DEFAULT_CONCURRENCY)
+        request_options = _pop_request_options(config)
         _validate_remaining_config(provider, config)
         return OpenAIEmbedding(
             api_key=api_key,
@@ -65,25 +171,54 @@ def get_embedding_function(
             organization=organization,
             project=project,
             timeout=timeout,
-            dimension=dimension
+            dimension=dimension,
+            send_dimensions=send_dimensions,
+            batch_size=batch_size,
+            max_batch_tokens=max_batch_tokens,
+            concurrency=concurrency,
+            **request_options
         )
 
     # sentence-transformers provider
     if provider in {"sentence-transformers", "sentence-transformer"}:
-        from skypydb.embeddings.sentence_transformers import SentenceTransformerEmbedding
+        from skypydb.embeddings.sentence_transformers import (
+            DEFAULT_BATCH_SIZE,
+            DEFAULT_POOL_MIN_TEXTS,
+            SentenceTransformerEmbedding
+        )
 
         model = config.pop("model", "all-MiniLM-L6-v2")
         device = config.pop("device", None)
         normalize_embeddings = config.pop("normalize_embeddings", False)
         dimension = config.pop("dimension", None)
+        batch_size = config.pop("batch_size", DEFAULT_BATCH_SIZE)
+        processes = config.pop("processes", 1)
+        pool_min_texts = config.pop("pool_min_texts", DEFAULT_POOL_MIN_TEXTS)
         _validate_remaining_config(provider, config)
         return SentenceTransformerEmbedding(
             model=model,
             device=device,
             normalize_embeddings=normalize_embeddings,
-            dimension=dimension
+            dimension=dimension,
+            batch_size=batch_size,
+            processes=processes,
+            pool_min_texts=pool_min_texts
+        )
+    # hash provider
+    if provider == "hash":
+        from skypydb.embeddings.hash import (
+            DEFAULT_DIMENSION,
+            HashEmbedding
+        )
+
+        dimension = config.pop("dimension", DEFAULT_DIMENSION)
+        seed = config.pop("seed", 0)
+        _validate_remaining_config(provider, config)
+        return HashEmbedding(
+            dimension=dimension,
+            seed=seed
         )
     raise ValueError(
         f"Unsupported embedding provider '{provider}'. "
-        "Supported providers: ollama, openai, sentence-transformers."
+        "Supported providers: ollama, openai, sentence-transformers, hash."
     )
\ No newline at end of file
@@ -2,7 +2,35 @@
 Module containing the Utils class, which is used to make the embed class callable.
 """
 
-from typing import List
+from typing import (
+    Dict,
+    List,
+    Tuple,
+    Union
+)
+import numpy as np
+
+def _deduplicate(texts: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    Get the distinct texts, in order, and the position of each text among them.
+    """
+
+    positions: Dict[str, int] = {}
+    inverse = [positions.setdefault(text, len(positions)) for text in texts]
+    return list(positions), inverse
+
+def _scatter(
+    embeddings: Union[List[List[float]], np.ndarray],
+    inverse: List[int]
+) -> Union[List[List[float]], np.ndarray]:
+    """
+    Copy the embeddings of distinct texts back to the positions of the texts.
+    """
+
+    if isinstance(embeddings, np.ndarray):
+        return embeddings[inverse]
+    # copies keep callers that modify one vector from modifying its duplicates
+    return [list(embeddings[i]) for i in inverse]
 
 class Utils:
     def __call__(
@@ -12,6 +40,29 @@ class Utils:
         """
         Make the class callable for compatibility with other libraries.
 
+        Identical texts are embedded once and their embedding is copied back
+        to every position they appear at.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+
+        unique, inverse = _deduplicate(texts)
+        if len(unique) == len(texts):
+            return self.embed(texts)
+
+        return _scatter(self.embed(unique), inverse)
+
+    async def acall(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Async counterpart of calling the class, embedding each distinct text once.
+
         Args:
             texts: List of texts to embed
 
@@ -19,4 +70,8 @@ class Utils:
             List of embedding vectors
         """
 
-        return self.embed(texts)
+        unique, inverse = _deduplicate(texts)
+        if len(unique) == len(texts):
+            return await self.aembed(texts)
+
+        return _scatter(await self.aembed(unique), inverse)
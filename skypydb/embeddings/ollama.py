@@ -2,27 +2,131 @@
 Ollama embedding functions for vector operations.
 """
 
+import asyncio
+import http.client
 import json
-import urllib.request
-import urllib.error
+import queue
+import socket
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
+    Any,
+    Dict,
     List,
-    Optional
+    Optional,
+    Tuple
 )
 from skypydb.embeddings.mixins import (
     Utils,
-    EmbeddingsFn
+    EmbeddingsFn,
+    RateLimiter
 )
+from skypydb.embeddings.mixins.embeddings_fn import DEFAULT_RETRY_BACKOFF
+from skypydb.embeddings.mixins.rate_limiter import estimate_tokens
+
+# default number of texts sent per /api/embed request
+DEFAULT_BATCH_SIZE = 64
+
+# default number of keep-alive connections, also the concurrency of single requests
+DEFAULT_MAX_CONNECTIONS = 4
+
+# default timeout of a request in seconds
+DEFAULT_TIMEOUT = 60.0
+
+class _ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP connections to one server.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int,
+        timeout: float
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            base_url: Server URL, e.g. http://localhost:11434
+            max_connections: Maximum number of idle connections kept open
+            timeout: Socket timeout of a request in seconds
+        """
+
+        parsed = urllib.parse.urlsplit(base_url)
+        self._connection_class = (
+            http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        )
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port
+        self._prefix = parsed.path.rstrip("/")
+        self._timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(max_connections)
+
+    def post(
+        self,
+        path: str,
+        payload: Dict[str, Any]
+    ) -> Tuple[int, bytes]:
+        """
+        Send a JSON POST request.
+
+        Idle connections closed by the server are discarded and the request
+        is sent again on a new connection. A request taking longer than the
+        timeout fails with socket.timeout and isn't sent again.
+
+        Returns:
+            Tuple of the HTTP status and the response body
+        """
+
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection = self._connection_class(self._host, self._port, timeout=self._timeout)
+                reused = False
+            try:
+                connection.request("POST", self._prefix + path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as error:
+                connection.close()
+                # the server may have dropped an idle keep-alive connection, retry on a fresh one
+                if reused and not isinstance(error, socket.timeout):
+                    continue
+                raise
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            try:
+                self._idle.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+        return response.status, data
 
 class OllamaEmbedding(
     EmbeddingsFn,
     Utils
 ):
+    # slow requests fail on the socket timeout of the pool, or of httpx
+    _enforces_timeout = True
+
     def __init__(
         self,
         model: str = "mxbai-embed-large",
         base_url: str = "http://localhost:11434",
-        dimension: Optional[int] = None
+        dimension: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = 0,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        rate_limiter: Optional[RateLimiter] = None
     ):
         """
         Initialize Ollama embedding function.
@@ -30,11 +134,81 @@ class OllamaEmbedding(
         Args:
             model: Name of the Ollama embedding model to use
             base_url: Base URL for Ollama API (default: http://localhost:11434)
+            batch_size: Number of texts sent per /api/embed request
+            max_connections: Number of keep-alive connections kept open, also the
+                number of concurrent requests on servers without /api/embed
+            timeout: Timeout of a request in seconds
+            max_retries: Number of times a request failing to connect or timing out is retried
+            retry_backoff: Delay in seconds before the first retry, doubled on each further retry
+            rate_limiter: Optional limiter of requests and tokens per second,
+                which can be shared with other embedding functions
         """
 
-        super().__init__(dimension=dimension)
+        if batch_size <= 0 or max_connections <= 0:
+            raise ValueError("batch_size and max_connections must be positive")
+
+        super().__init__(
+            dimension=dimension,
+            concurrency=max_connections,
+            timeout=timeout,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            rate_limiter=rate_limiter
+        )
         self.model = model
         self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+        self.max_connections = max_connections
+        self._pool = _ConnectionPool(self.base_url, max_connections, timeout)
+        # httpx client of the event loop aembed last ran on, created on first use
+        self._async_client: Any = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        # threads sending the async requests when httpx isn't installed
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # servers older than 0.3.4 only have the single-text /api/embeddings endpoint
+        self._batch_endpoint = True
+
+    def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any]
+    ) -> Tuple[int, Any]:
+        """
+        Send a request to the Ollama API.
+
+        Returns:
+            Tuple of the HTTP status and the decoded JSON response, None if it isn't JSON
+
+        Raises:
+            ConnectionError: If Ollama server is not reachable
+            TimeoutError: If Ollama doesn't answer within timeout seconds
+        """
+
+        try:
+            status, data = self._pool.post(path, payload)
+        except socket.timeout:
+            raise TimeoutError(
+                f"Ollama at {self.base_url} didn't answer within {self.timeout} seconds"
+            ) from None
+        except (http.client.HTTPException, OSError) as e:
+            raise self._connection_error(e)
+        try:
+            return status, json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return status, None
+
+    def _connection_error(
+        self,
+        error: Exception
+    ) -> ConnectionError:
+        """
+        Get the error raised when Ollama server is not reachable.
+        """
+
+        return ConnectionError(
+            f"Cannot connect to Ollama at {self.base_url}. "
+            f"Make sure Ollama is running. If you haven't installed it go to https://ollama.com/download and install it. Error: {error}"
+        )
 
     def _get_embedding(
         self,
@@ -54,54 +228,291 @@ class OllamaEmbedding(
             ValueError: If embedding generation fails
         """
 
-        base_url = getattr(self, "base_url", "http://localhost:11434").rstrip("/")
+        status, result = self._post(
+            "/api/embeddings",
+            {"model": self.model, "prompt": text}
+        )
+        return self._parse_embedding(status, result)
 
-        model = getattr(self, "model", "mxbai-embed-large")
+    def _parse_embedding(
+        self,
+        status: int,
+        result: Any
+    ) -> List[float]:
+        """
+        Extract the embedding from an /api/embeddings response.
+        """
 
-        url = f"{base_url}/api/embeddings"
+        if result is None:
+            raise ValueError(f"Invalid response from Ollama (HTTP {status})")
+        embedding = result.get("embedding")
+        if status != 200 or not embedding:
+            raise ValueError(
+                f"No embedding returned from Ollama: {result.get('error', f'HTTP {status}')}. "
+                f"Make sure model '{self.model}' is an embedding model."
+            )
+        return embedding
 
-        data = json.dumps({
-            "model": model,
-            "prompt": text
-        }).encode("utf-8")
+    def _embed_batch(
+        self,
+        texts: List[str]
+    ) -> Optional[List[List[float]]]:
+        """
+        Embed texts with one /api/embed request.
+
+        Returns:
+            One embedding per text, or None if the server doesn't have /api/embed
+
+        Raises:
+            ConnectionError: If Ollama server is not reachable
+            ValueError: If embedding generation fails
+        """
 
-        request = urllib.request.Request(
-            url,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST"
+        status, result = self._post(
+            "/api/embed",
+            {"model": self.model, "input": texts}
         )
+        return self._parse_batch(status, result, texts)
+
+    def _parse_batch(
+        self,
+        status: int,
+        result: Any,
+        texts: List[str]
+    ) -> Optional[List[List[float]]]:
+        """
+        Extract the embeddings from an /api/embed response, None if the route doesn't exist.
+        """
+
+        # unknown routes are answered with a plain-text 404, unknown models with a JSON error
+        if status == 404 and not (isinstance(result, dict) and "error" in result):
+            return None
+        if result is None:
+            raise ValueError(f"Invalid response from Ollama (HTTP {status})")
+        embeddings = result.get("embeddings")
+        if status != 200 or embeddings is None or len(embeddings) != len(texts):
+            raise ValueError(
+                f"No embeddings returned from Ollama: {result.get('error', f'HTTP {status}')}. "
+                f"Make sure model '{self.model}' is an embedding model."
+            )
+        return embeddings
+
+    def embed(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts using Ollama API.
+
+        Texts are sent batch_size at a time to /api/embed over keep-alive
+        connections. Servers without that endpoint get one /api/embeddings
+        request per text, max_connections of them at a time.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+
+        if not texts:
+            return []
+
+        embeddings: List[List[float]] = []
+        if self._batch_endpoint:
+            for start in range(0, len(texts), self.batch_size):
+                batch_texts = texts[start:start + self.batch_size]
+                batch = self._request(
+                    self._embed_batch,
+                    batch_texts,
+                    tokens=sum(estimate_tokens(text) for text in batch_texts)
+                )
+                if batch is None:
+                    self._batch_endpoint = False
+                    break
+                embeddings.extend(batch)
+
+        if len(embeddings) < len(texts):
+            # one request per text, max_connections at a time
+            embeddings.extend(super().embed(texts[len(embeddings):]))
+
+        if self._dimension is None:
+            self._dimension = len(embeddings[0])
+        return embeddings
+
+    def _get_async_client(self) -> Any:
+        """
+        Get the httpx client of the running event loop, whose keep-alive pool
+        holds up to max_connections connections.
+
+        Returns:
+            The client, or None if httpx isn't installed
+        """
+
+        # httpx connections belong to the event loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            try:
+                import httpx
+            except ImportError:
+                return None
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    async def _apost(
+        self,
+        path: str,
+        payload: Dict[str, Any]
+    ) -> Tuple[int, Any]:
+        """
+        Send a request to the Ollama API without blocking the event loop.
+
+        Requests go through httpx when it is installed (`pip install httpx`).
+        Otherwise they are sent by the blocking connection pool of embed on
+        max_connections dedicated threads.
+
+        Returns:
+            Tuple of the HTTP status and the decoded JSON response, None if it isn't JSON
+
+        Raises:
+            ConnectionError: If Ollama server is not reachable
+            TimeoutError: If Ollama doesn't answer within timeout seconds
+        """
+
+        client = self._get_async_client()
+        if client is None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_connections,
+                    thread_name_prefix="skypydb-ollama"
+                )
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._post, path, payload)
+
+        import httpx
 
         try:
-            with urllib.request.urlopen(request, timeout=60) as response:
-                result = json.loads(response.read().decode("utf-8"))
-                embedding = result.get("embedding")
-                if embedding is None:
-                    raise ValueError(
-                        f"No embedding returned from Ollama. "
-                        f"Make sure model '{model}' is an embedding model."
+            response = await client.post(path, json=payload)
+        except httpx.TimeoutException:
+            raise TimeoutError(
+                f"Ollama at {self.base_url} didn't answer within {self.timeout} seconds"
+            ) from None
+        except httpx.TransportError as e:
+            raise self._connection_error(e)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    async def _aget_embedding(
+        self,
+        text: str
+    ) -> List[float]:
+        """
+        Get embedding for a single text using Ollama API without blocking the event loop.
+        """
+
+        status, result = await self._apost(
+            "/api/embeddings",
+            {"model": self.model, "prompt": text}
+        )
+        return self._parse_embedding(status, result)
+
+    async def _aembed_batch(
+        self,
+        texts: List[str]
+    ) -> Optional[List[List[float]]]:
+        """
+        Embed texts with one /api/embed request without blocking the event loop.
+        """
+
+        status, result = await self._apost(
+            "/api/embed",
+            {"model": self.model, "input": texts}
+        )
+        return self._parse_batch(status, result, texts)
+
+    async def aembed(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts using Ollama API without
+        blocking the event loop.
+
+        Batches of batch_size texts are sent to /api/embed, max_connections
+        of them at a time. Servers without that endpoint get one
+        /api/embeddings request per text, max_connections of them at a time.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+
+        if not texts:
+            return []
+
+        embeddings: Optional[List[List[float]]] = None
+        if self._batch_endpoint:
+            semaphore = asyncio.Semaphore(self.max_connections)
+
+            async def embed_batch(batch_texts: List[str]) -> Optional[List[List[float]]]:
+                async with semaphore:
+                    return await self._arequest(
+                        self._aembed_batch,
+                        batch_texts,
+                        tokens=sum(estimate_tokens(text) for text in batch_texts)
                     )
-                return embedding
-        except urllib.error.URLError as e:
-            raise ConnectionError(
-                f"Cannot connect to Ollama at {base_url}. "
-                f"Make sure Ollama is running. If you haven't installed it go to https://ollama.com/download and install it. Error: {e}"
-            )
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid response from Ollama: {e}")
 
-    def get_dimension(
+            batches = await asyncio.gather(*(
+                embed_batch(texts[start:start + self.batch_size])
+                for start in range(0, len(texts), self.batch_size)
+            ))
+            if any(batch is None for batch in batches):
+                self._batch_endpoint = False
+            else:
+                embeddings = [embedding for batch in batches for embedding in batch]
+
+        if embeddings is None:
+            embeddings = await super().aembed(texts)
+
+        if self._dimension is None:
+            self._dimension = len(embeddings[0])
+        return embeddings
+
+    def _lookup_dimension(
         self
-    ) -> int:
+    ) -> Optional[int]:
         """
-        Get the embedding dimension, generating a test embedding if needed.
+        Get the dimension of the model from the registry, or else from the
+        model information of /api/show, without generating an embedding.
 
         Returns:
-            The dimension of embeddings produced by this model
+            The dimension, None if neither source has it
         """
 
-        if self._dimension is None:
-            # generate a test embedding to determine dimension
-            test_embedding = self._get_embedding("test")
-            self._dimension = len(test_embedding)
-        return self._dimension
\ No newline at end of file
+        dimension = super()._lookup_dimension()
+        if dimension is not None:
+            return dimension
+
+        status, result = self._post(
+            "/api/show",
+            {"model": self.model, "name": self.model}
+        )
+        if status != 200 or not isinstance(result, dict):
+            return None
+        # e.g. {"bert.embedding_length": 1024} for mxbai-embed-large
+        for key, value in (result.get("model_info") or {}).items():
+            if key.endswith(".embedding_length") and isinstance(value, int):
+                return value
+        return None
\ No newline at end of file
@@ -2,21 +2,67 @@
 OpenAI embedding functions for vector operations.
 """
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
+    Dict,
     List,
     Optional,
     Any
 )
 from skypydb.embeddings.mixins import (
     EmbeddingsFn,
+    RateLimiter,
     Utils
 )
+from skypydb.embeddings.mixins.dimensions import supports_shortening
+from skypydb.embeddings.mixins.embeddings_fn import DEFAULT_RETRY_BACKOFF
+from skypydb.embeddings.mixins.rate_limiter import estimate_tokens
+
+# maximum number of inputs of one embeddings request
+DEFAULT_BATCH_SIZE = 2048
+
+# maximum number of tokens of one embeddings request, kept under the API's 300k limit
+DEFAULT_MAX_BATCH_TOKENS = 250000
+
+# default number of batches sent at the same time
+DEFAULT_CONCURRENCY = 4
+
+# default number of retries of a failed request, the default of the openai client
+DEFAULT_MAX_RETRIES = 2
+
+def _split_batches(
+    texts: List[str],
+    batch_size: int,
+    max_batch_tokens: int
+) -> List[List[str]]:
+    """
+    Split texts into consecutive batches bounded by a number of texts and
+    an estimated number of tokens; a text over the token bound gets a batch of its own.
+    """
+
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (len(batch) == batch_size or batch_tokens + tokens > max_batch_tokens):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
 
 class OpenAIEmbedding(
     EmbeddingsFn,
     Utils
 ):
+    # slow requests fail on the timeout of the openai client
+    _enforces_timeout = True
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -25,7 +71,14 @@ class OpenAIEmbedding(
         organization: Optional[str] = None,
         project: Optional[str] = None,
         timeout: Optional[float] = None,
-        dimension: Optional[int] = None
+        dimension: Optional[int] = None,
+        send_dimensions: Optional[bool] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        rate_limiter: Optional[RateLimiter] = None
     ):
         """
         Initialize OpenAI embedding function.
@@ -37,9 +90,33 @@ class OpenAIEmbedding(
             organization: Optional OpenAI organization ID.
             project: Optional OpenAI project ID.
             timeout: Optional timeout in seconds.
+            dimension: Optional number of dimensions of the embeddings. Models
+                known to support it (text-embedding-3-small and -large) are
+                asked for shortened embeddings of this size.
+            send_dimensions: Whether to send dimension as the dimensions
+                parameter of the requests. None sends it only to the models
+                known to support it; True also sends it to other models, e.g.
+                served at a custom base_url.
+            batch_size: Maximum number of texts per request.
+            max_batch_tokens: Maximum estimated number of tokens per request.
+            concurrency: Number of requests sent at the same time.
+            max_retries: Number of times a request failing to connect, timing out
+                or rate limited is retried.
+            retry_backoff: Delay in seconds before the first retry, doubled on each further retry.
+            rate_limiter: Optional limiter of requests and tokens per second,
+                which can be shared with other embedding functions.
         """
 
-        super().__init__(dimension=dimension)
+        if batch_size <= 0 or max_batch_tokens <= 0:
+            raise ValueError("batch_size and max_batch_tokens must be positive")
+
+        super().__init__(
+            dimension=dimension,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            rate_limiter=rate_limiter
+        )
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError(
@@ -51,17 +128,37 @@ class OpenAIEmbedding(
         self.organization = organization
         self.project = project
         self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        # text-embedding-ada-002 and many OpenAI-compatible servers reject the dimensions parameter
+        if send_dimensions is None:
+            send_dimensions = supports_shortening(model)
+        self._request_dimensions = dimension if send_dimensions else None
 
         try:
-            from openai import OpenAI
+            from openai import (
+                APIConnectionError,
+                APITimeoutError,
+                OpenAI,
+                RateLimitError
+            )
         except ImportError as exc:
             raise ImportError(
                 "OpenAI embedding provider requires the `openai` package. "
                 "Install it with `pip install openai`."
             ) from exc
 
+        # the client raises its own exceptions, which don't derive from ConnectionError or TimeoutError
+        self._retryable_errors = EmbeddingsFn._retryable_errors + (
+            APIConnectionError,
+            APITimeoutError,
+            RateLimitError
+        )
+
         client_kwargs: dict[str, Any] = {
-            "api_key": self.api_key
+            "api_key": self.api_key,
+            # requests are retried by _request, with max_retries and the rate limiter
+            "max_retries": 0
         }
         if self.base_url is not None:
             client_kwargs["base_url"] = self.base_url
@@ -73,6 +170,47 @@ class OpenAIEmbedding(
             client_kwargs["timeout"] = self.timeout
 
         self._client = OpenAI(**client_kwargs)
+        self._client_kwargs = client_kwargs
+        # created on the first aembed call
+        self._async_client: Any = None
+
+    def _create_kwargs(
+        self,
+        texts: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Get the arguments of the embeddings request of a batch.
+        """
+
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "input": texts
+        }
+        if self._request_dimensions is not None:
+            kwargs["dimensions"] = self._request_dimensions
+        return kwargs
+
+    @staticmethod
+    def _response_embeddings(response: Any) -> List[List[float]]:
+        """
+        Extract the embeddings of a response, in the order of the inputs.
+        """
+
+        return [list(item.embedding) for item in sorted(response.data, key=lambda item: item.index)]
+
+    def _embed_batch(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Embed one batch of texts with one request.
+        """
+
+        response = self._request(
+            lambda: self._client.embeddings.create(**self._create_kwargs(texts)),
+            tokens=sum(estimate_tokens(text) for text in texts)
+        )
+        return self._response_embeddings(response)
 
     def embed(
         self,
@@ -80,16 +218,72 @@ class OpenAIEmbedding(
     ) -> List[List[float]]:
         """
         Generate embeddings for a list of texts using OpenAI API.
+
+        Texts are split into batches of at most batch_size texts and
+        max_batch_tokens estimated tokens, sent concurrency at a time, and
+        the embeddings are returned in the order of the texts.
         """
 
         if not texts:
             return []
 
-        response = self._client.embeddings.create(
-            model=self.model,
-            input=texts
+        batches = _split_batches(texts, self.batch_size, self.max_batch_tokens)
+        if len(batches) == 1 or self.concurrency == 1:
+            results = [self._embed_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(batches)),
+                thread_name_prefix="skypydb-embed"
+            ) as executor:
+                results = list(executor.map(self._embed_batch, batches))
+
+        embeddings = [embedding for result in results for embedding in result]
+        if self._dimension is None and embeddings:
+            self._dimension = len(embeddings[0])
+        return embeddings
+
+    async def _aembed_batch(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Embed one batch of texts with one request of the async client.
+        """
+
+        response = await self._arequest(
+            lambda: self._async_client.embeddings.create(**self._create_kwargs(texts)),
+            tokens=sum(estimate_tokens(text) for text in texts)
         )
-        embeddings = [list(item.embedding) for item in response.data]
+        return self._response_embeddings(response)
+
+    async def aembed(
+        self,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for a list of texts using the async OpenAI client,
+        batched and sent concurrency at a time like embed.
+        """
+
+        if not texts:
+            return []
+
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+
+            self._async_client = AsyncOpenAI(**self._client_kwargs)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self._aembed_batch(batch)
+
+        results = await asyncio.gather(*(
+            embed_batch(batch)
+            for batch in _split_batches(texts, self.batch_size, self.max_batch_tokens)
+        ))
+        embeddings = [embedding for result in results for embedding in result]
         if self._dimension is None and embeddings:
             self._dimension = len(embeddings[0])
         return embeddings
\ No newline at end of file
@@ -2,26 +2,40 @@
 Sentence Transformers embedding functions for vector operations.
 """
 
+import asyncio
 from typing import (
     Any,
+    Dict,
     List,
     Optional
 )
+import numpy as np
 from skypydb.embeddings.mixins import (
     EmbeddingsFn,
     Utils
 )
 
+# default number of texts encoded per forward pass
+DEFAULT_BATCH_SIZE = 32
+
+# default minimum number of texts sent to the worker processes
+DEFAULT_POOL_MIN_TEXTS = 1024
+
 class SentenceTransformerEmbedding(
     EmbeddingsFn,
     Utils
 ):
+    returns_array = True
+
     def __init__(
         self,
         model: str = "all-MiniLM-L6-v2",
         device: Optional[str] = None,
         normalize_embeddings: bool = False,
-        dimension: Optional[int] = None
+        dimension: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        processes: int = 1,
+        pool_min_texts: int = DEFAULT_POOL_MIN_TEXTS
     ):
         """
         Initialize Sentence Transformers embedding function.
@@ -30,12 +44,25 @@ class SentenceTransformerEmbedding(
             model: Sentence Transformers model name.
             device: Optional device override (e.g. cpu, cuda).
             normalize_embeddings: Whether to return normalized embeddings.
+            batch_size: Number of texts encoded per forward pass.
+            processes: Number of CPU worker processes encoding large inputs,
+                1 to encode in the calling process.
+            pool_min_texts: Minimum number of texts for which the worker
+                processes are used, smaller inputs don't pay for the IPC.
         """
 
+        if batch_size <= 0 or processes <= 0:
+            raise ValueError("batch_size and processes must be positive")
+
         super().__init__(dimension=dimension)
         self.model = model
         self.device = device
         self.normalize_embeddings = normalize_embeddings
+        self.batch_size = batch_size
+        self.processes = processes
+        self.pool_min_texts = pool_min_texts
+        # started on the first large enough input
+        self._pool: Optional[Dict[str, Any]] = None
 
         try:
             from sentence_transformers import SentenceTransformer
@@ -50,33 +77,73 @@ class SentenceTransformerEmbedding(
             model_kwargs["device"] = self.device
         self._model = SentenceTransformer(model_name_or_path=self.model, **model_kwargs)
 
-    @staticmethod
-    def _to_list(vector: Any) -> List[float]:
-        """
-        Convert a vector to a list of floats.
-        """
-
-        if hasattr(vector, "tolist"):
-            return list(vector.tolist())
-        return list(vector)
-
     def embed(
         self,
         texts: List[str]
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Generate embeddings for a list of texts using Sentence Transformers.
+
+        Returns:
+            (n, d) float32 array, which the database stores without converting it
         """
 
         if not texts:
-            return []
+            return np.empty((0, self._dimension or 0), dtype=np.float32)
+
+        pool = None
+        if self.processes > 1 and len(texts) >= self.pool_min_texts:
+            if self._pool is None:
+                self._pool = self._model.start_multi_process_pool(
+                    target_devices=[self.device or "cpu"] * self.processes
+                )
+            pool = self._pool
 
         vectors = self._model.encode(
             texts,
-            convert_to_numpy=False,
-            normalize_embeddings=self.normalize_embeddings
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize_embeddings,
+            show_progress_bar=False,
+            pool=pool
         )
-        embeddings = [self._to_list(vector) for vector in vectors]
-        if self._dimension is None and embeddings:
-            self._dimension = len(embeddings[0])
-        return embeddings
\ No newline at end of file
+        embeddings = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self._dimension is None:
+            self._dimension = embeddings.shape[1]
+        return embeddings
+
+    async def aembed(
+        self,
+        texts: List[str]
+    ) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts on a worker thread, so that
+        encoding doesn't block the event loop.
+        """
+
+        return await asyncio.to_thread(self.embed, texts)
+
+    def get_dimension(
+        self
+    ) -> int:
+        """
+        Get the embedding dimension, read from the model when it declares it.
+        """
+
+        if self._dimension is None:
+            self._dimension = (
+                self._model.get_sentence_embedding_dimension()
+                or self.embed(["test"]).shape[1]
+            )
+        return self._dimension
+
+    def close(
+        self
+    ) -> None:
+        """
+        Stop the worker processes, if they were started.
+        """
+
+        if self._pool is not None:
+            self._model.stop_multi_process_pool(self._pool)
+            self._pool = None
\ No newline at end of file
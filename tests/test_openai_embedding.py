@@ -0,0 +1,58 @@
+"""
+Tests of the dimensions parameter sent by OpenAIEmbedding.
+"""
+
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("openai")
+
+from skypydb.embeddings.openai import OpenAIEmbedding
+
+def _capture_requests(embedding):
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[0.0] * 8) for i, _ in enumerate(kwargs["input"])
+        ])
+
+    embedding._client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+    return requests
+
+def test_dimensions_sent_to_text_embedding_3():
+    embedding = OpenAIEmbedding(api_key="test", model="text-embedding-3-small", dimension=8)
+    requests = _capture_requests(embedding)
+
+    embedding.embed(["hello"])
+
+    assert requests[0]["dimensions"] == 8
+
+@pytest.mark.parametrize("model", ["text-embedding-ada-002", "nomic-embed-text", "my-org/custom-embedder"])
+def test_dimensions_not_sent_to_other_models(model):
+    embedding = OpenAIEmbedding(
+        api_key="test",
+        model=model,
+        base_url="http://localhost:8000/v1",
+        dimension=8
+    )
+    requests = _capture_requests(embedding)
+
+    embedding.embed(["hello"])
+
+    assert "dimensions" not in requests[0]
+
+def test_dimensions_sent_on_opt_in():
+    embedding = OpenAIEmbedding(
+        api_key="test",
+        model="my-org/custom-embedder",
+        base_url="http://localhost:8000/v1",
+        dimension=8,
+        send_dimensions=True
+    )
+    requests = _capture_requests(embedding)
+
+    embedding.embed(["hello"])
+
+    assert requests[0]["dimensions"] == 8
@@ -0,0 +1,38 @@
+"""
+Tests of VectorDatabase.add inside deferred transactions.
+"""
+
+import pytest
+from skypydb.database.vector_db import VectorDatabase
+
+@pytest.fixture
+def db(tmp_path):
+    database = VectorDatabase(str(tmp_path / "vector.db"))
+    database.create_collection("docs")
+    yield database
+    database.close()
+
+def test_failed_deferred_add_keeps_earlier_writes(db):
+    db.add("docs", ids=["a"], embeddings=[[1.0, 0.0]], defer_commit=True)
+
+    # metadata that can't be serialized fails once the batch has started writing
+    with pytest.raises(TypeError):
+        db.add(
+            "docs",
+            ids=["b", "c"],
+            embeddings=[[0.0, 1.0], [1.0, 1.0]],
+            metadatas=[{"ok": 1}, {"bad": object()}],
+            defer_commit=True
+        )
+
+    assert db.conn.in_transaction
+    db.commit()
+    assert db.count("docs") == 1
+    assert db.get("docs", ids=["a"])["ids"] == ["a"]
+
+def test_failed_add_rolls_back_its_own_transaction(db):
+    with pytest.raises(TypeError):
+        db.add("docs", ids=["a"], embeddings=[[1.0, 0.0]], metadatas=[{"bad": object()}])
+
+    assert not db.conn.in_transaction
+    assert db.count("docs") == 0